@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""Navigation session benchmark. Replays a key recording (see the ``recorder`` and ``replay`` input drivers) into an application running on the ``terminal`` output driver, and reports how long it took to process the keys, how long keys waited to be processed and how much was sent to the display.
+
+Launch it from pyLCI directory as ``python -m benchmarks.input_replay``.
+
+If no recording is given, a built-in session is used: open the systemctl app with 250 fake units, scroll 200 units down as fast as possible, then back out of the app. "Time per callback" is the time callbacks took to process (and render) a key, or several repeated keys that were passed to the callback at once - use it to spot regressions. Callbacks that activate another UI element (and so, block until it exits) aren't counted.
+
+Keys are replayed at the speed they were recorded at, use ``--speed`` to change that. With ``--speed 0``, keys are sent as fast as possible, except that after a pause in the recording, the replay waits until a UI element sets its keymap (or until the pause is over, if that doesn't happen) - so that keys following UI element changes (entering a menu or exiting it) don't go to the previous UI element and get lost. The built-in session has pauses after such keys."""
+
+import os
+import argparse
+import tempfile
+import importlib
+from time import time, sleep
+from threading import Thread, current_thread
+
+import mocks
+mocks.install()
+
+from input.input import InputListener
+from input.drivers import replay
+from output.drivers.terminal import Screen
+
+def systemctl_session(units=200, pause=300):
+    """Returns the built-in session, as ``(delta_ms, key)`` tuples: going to "All units", scrolling ``units`` down, exiting the unit list and the app. There's a ``pause`` before keys that go to a different UI element than the previous key."""
+    return [(pause, "KEY_DOWN"), (0, "KEY_DOWN"), (0, "KEY_ENTER")] + [(pause, "KEY_DOWN")] + [(0, "KEY_DOWN")]*(units-1) + [(0, "KEY_LEFT"), (pause, "KEY_LEFT")]
+
+def write_session(session):
+    """Writes a session to a temporary file in the ``recorder`` format, returns its path."""
+    fd, path = tempfile.mkstemp(prefix="pylci_session_")
+    with os.fdopen(fd, "w") as f:
+        for delta, key in session:
+            f.write("{} {}\n".format(delta, key))
+    return path
+
+def fake_units(count):
+    return [{"name":"unit-{:03d}.service".format(n), "basename":"unit-{:03d}".format(n), "type":"service",
+             "load":"loaded", "active":"active", "sub":"running", "description":"Fake unit {}".format(n)} for n in range(count)]
+
+class KeyTimer():
+    """Wraps ``InputListener.process_key``, measuring the time each key takes to be processed. Keys whose callbacks handed dispatching over to another thread (that is, activated another UI element) aren't counted, since they block until that UI element exits."""
+
+    def __init__(self, listener):
+        self.listener = listener
+        self.process_key = listener.process_key
+        listener.process_key = self
+        self.keys = 0
+        self.times = []
+        self.first = None
+        self.last = None
+
+    def __call__(self, key):
+        start = time()
+        if self.first is None:
+            self.first = start
+        try:
+            self.process_key(key)
+        finally:
+            self.keys += 1
+            self.last = time()
+            if self.listener.dispatcher is current_thread():
+                self.times.append(self.last - start)
+
+def check_finished(driver, timeout=5):
+    """Exits if the app is still running ``timeout`` seconds after the replay has finished - which means keys got lost."""
+    driver.finished.wait()
+    sleep(timeout)
+    print("Session didn't finish {} seconds after the last key, some keys must have gone to the wrong UI element".format(timeout))
+    os._exit(1)
+
+def run(recording, speed=1, units=250, cols=16, rows=2):
+    """Runs the systemctl app with keys from the recording, returns a dictionary with results."""
+    app = importlib.import_module("apps.system_apps.systemctl.main")
+    app.systemctl.list_units = lambda: fake_units(units)
+    driver = replay.InputDevice(recording, speed=speed)
+    listener = InputListener([[driver, "replay"]])
+    timer = KeyTimer(listener)
+    screen = Screen(path=os.devnull, cols=cols, rows=rows)
+    screen.reset_stats()
+    app.init_app(listener, screen)
+    watchdog = Thread(target=check_finished, args=(driver,))
+    watchdog.daemon = True
+    watchdog.start()
+    try:
+        app.launch() #Replay starts once the app's menu sets its keymap
+    finally:
+        listener.atexit()
+    times = sorted(timer.times)
+    results = {"callbacks":timer.keys,
+               "session_ms":(timer.last - timer.first)*1000,
+               "ms_per_callback":sum(times)*1000/max(len(times), 1),
+               "max_ms_per_callback":times[-1]*1000 if times else 0,
+               "frames":screen.frames,
+               "controller_bytes":screen.bytes}
+    results["latency"] = listener.get_latency_stats()
+    results["keys"] = results["latency"]["count"]
+    return results
+
+def print_results(results):
+    print("Keys processed:    {}".format(results["keys"]))
+    print("Callbacks called:  {} (repeated keys are passed to some callbacks at once)".format(results["callbacks"]))
+    print("Session time:      {:.1f} ms".format(results["session_ms"]))
+    print("Time per callback: {:.3f} ms (max {:.3f} ms)".format(results["ms_per_callback"], results["max_ms_per_callback"]))
+    print("Frames displayed:  {}".format(results["frames"]))
+    print("Controller bytes:  {}".format(results["controller_bytes"]))
+    latency = results["latency"]
+    if latency["count"]:
+        print("Key latency (ms):  mean {mean:.2f}, median {median:.2f}, p99 {p99:.2f}, max {max:.2f}".format(**latency))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="pyLCI navigation session benchmark")
+    parser.add_argument('recording', nargs="?", help="Recording to replay (the built-in systemctl session if not specified)", default=None)
+    parser.add_argument('-s', '--speed', type=float, default=1, help="Replay speed, 0 is as fast as possible (waiting for UI elements to change after pauses)")
+    parser.add_argument('-u', '--units', type=int, default=250, help="Number of fake systemctl units")
+    parser.add_argument('-c', '--cols', type=int, default=16)
+    parser.add_argument('-r', '--rows', type=int, default=2)
+    args = parser.parse_args()
+    path = args.recording or write_session(systemctl_session())
+    try:
+        print_results(run(path, args.speed, args.units, args.cols, args.rows))
+    finally:
+        if not args.recording:
+            os.remove(path)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""Output driver benchmark. Runs ``Screen`` drivers against fake hardware libraries from ``mocks``, replays standard workloads and reports bus usage and modelled time per frame.
+
+Launch it from pyLCI directory as ``python -m benchmarks.output_drivers``.
+
+Modelled time is an estimate of the time the frame would take on real hardware. It's calculated from bus usage and the delays drivers ask for, using the constants below - they're approximations for a Raspberry Pi, adjust them for your hardware if necessary.
+
+The ``terminal`` driver is the hardware-independent reference: its "transactions" are bytes sent to the emulated HD44780 controller, and its "bytes" are bytes written to the terminal."""
+
+import sys
+import argparse
+import importlib
+from time import time
+
+import mocks
+mocks.install()
+
+I2C_SPEED = 100000 #Bits per second
+I2C_TRANSACTION_OVERHEAD = 0.00005 #Time it takes to go through smbus library and kernel for every transaction
+GPIO_CALL_COST = 0.000005 #Time a single RPi.GPIO output() call takes
+SERIAL_WRITE_OVERHEAD = 0.00005
+PIFACECAD_CALL_COST = 0.0002 #Every command or character is several SPI transactions
+SLEEP_OVERHEAD = 0.00007 #time.sleep() takes at least that much longer than asked to
+
+drivers = [
+    ["pcf8574", "pcf8574", {}],
+    ["pcf8574 (block)", "pcf8574", {"block_writes":True}],
+    ["mcp23008", "mcp23008", {}],
+    ["adafruit_plate", "adafruit_plate", {}],
+    ["rw1062", "rw1062", {}],
+    ["pi_gpio", "pi_gpio", {"pins":[25, 24, 23, 18], "rs_pin":22, "en_pin":27}],
+    ["pfcad", "pfcad", {}],
+    ["serial_lcd_0", "serial_lcd_0", {"ser_port":"/dev/null"}],
+    ["terminal", "terminal", {"path":"/dev/null"}]]
+
+
+class ModelClock():
+    """Replaces ``sleep()`` and ``busy_wait()`` in driver modules, adding the requested time (and, for ``sleep()``, its overhead) to the modelled time instead of waiting. ``get_time`` can be used as the fake ``RPi.GPIO`` trace clock, so that pin traces show modelled timing."""
+
+    def __init__(self):
+        self.time = 0
+
+    def sleep(self, seconds):
+        self.time += seconds + SLEEP_OVERHEAD
+
+    def busy_wait(self, microseconds):
+        self.time += microseconds / 1000000.0
+
+    def get_time(self):
+        return self.time
+
+
+class BusMeter():
+    """Reads transaction counters from the fake hardware a ``Screen`` object uses and models the time they'd take."""
+
+    def __init__(self, screen):
+        if hasattr(screen, "output_bytes"):
+            self.kind, self.device = "terminal", screen #Counts controller bytes it emulates by itself
+        elif hasattr(screen, "bus"):
+            self.kind, self.device = "i2c", screen.bus
+        elif hasattr(screen, "serial"):
+            self.kind, self.device = "serial", screen.serial
+        elif hasattr(screen, "lcd"):
+            self.kind, self.device = "pifacecad", screen.lcd
+        else:
+            self.kind, self.device = "gpio", sys.modules["RPi.GPIO"]
+        self.reset()
+
+    def reset(self):
+        self.device.reset_stats()
+
+    def transactions(self):
+        if self.kind == "gpio":
+            return self.device.calls
+        elif self.kind == "terminal":
+            return self.device.bytes
+        return self.device.transactions
+
+    def bytes(self):
+        if self.kind == "gpio":
+            return self.device.writes
+        elif self.kind == "terminal":
+            return self.device.output_bytes
+        return self.device.bytes
+
+    def modelled_time(self):
+        if self.kind == "i2c":
+            bits = self.bytes()*9 + self.transactions()*2 #Start and stop conditions
+            return self.transactions()*I2C_TRANSACTION_OVERHEAD + float(bits)/I2C_SPEED
+        elif self.kind == "serial":
+            baudrate = getattr(self.device, "baudrate", 9600)
+            return self.transactions()*SERIAL_WRITE_OVERHEAD + float(self.bytes()*10)/baudrate
+        elif self.kind == "pifacecad":
+            return (self.transactions()+self.bytes())*PIFACECAD_CALL_COST
+        elif self.kind == "terminal":
+            return 0
+        return self.transactions()*GPIO_CALL_COST
+
+
+def full_screen(cols, rows, frames):
+    """Every frame changes every character on the screen."""
+    first = ["".join([chr(ord('A')+(row+col)%26) for col in range(cols)]) for row in range(rows)]
+    second = [row.lower() for row in first]
+    return [first if i%2 == 0 else second for i in range(frames)]
+
+def clock(cols, rows, frames):
+    """A clock, changing one or two digits every frame."""
+    result = []
+    for i in range(frames):
+        seconds = 12*3600 + i
+        time_str = "{:02d}:{:02d}:{:02d}".format(seconds/3600%24, seconds/60%60, seconds%60)
+        result.append(["Time:", time_str.center(cols)] + [""]*(rows-2))
+    return result
+
+def menu_scrolling(cols, rows, frames):
+    """A menu with 50 entries, with the pointer moving down one entry every frame."""
+    entries = ["Menu entry {}".format(i) for i in range(50)]
+    result = []
+    first_displayed = 0
+    for i in range(frames):
+        pointer = i % len(entries)
+        if pointer == 0:
+            first_displayed = 0
+        elif pointer >= first_displayed + rows:
+            first_displayed = pointer - rows + 1
+        result.append([("*" if num == pointer else " ")+entries[num] for num in range(first_displayed, min(first_displayed+rows, len(entries)))])
+    return result
+
+def marquee(cols, rows, frames):
+    """A line of text scrolling right to left, one character every frame."""
+    text = "pyLCI - Python-based Linux Control Interface ... "
+    result = []
+    for i in range(frames):
+        offset = i % len(text)
+        line = (text[offset:]+text)[:cols]
+        result.append(["Now playing:", line] + [""]*(rows-2))
+    return result
+
+workloads = [full_screen, clock, menu_scrolling, marquee]
+
+
+def load_driver(module_name, kwargs, cols, rows):
+    """Imports the driver module, replaces ``sleep()`` (and ``busy_wait()``, if the driver has it) in it with a model clock and creates a ``Screen`` object."""
+    model_clock = ModelClock()
+    module = importlib.import_module("output.drivers."+module_name)
+    for name in ["output.drivers.hd44780", "output.drivers.backlight", "output.drivers."+module_name]:
+        if name in sys.modules:
+            sys.modules[name].sleep = model_clock.sleep
+    if hasattr(module, "busy_wait"):
+        module.busy_wait = model_clock.busy_wait
+    sys.modules["RPi.GPIO"].cleanup()
+    screen = module.Screen(cols=cols, rows=rows, **kwargs)
+    return screen, model_clock
+
+def run_workload(screen, model_clock, workload, cols, rows, frames):
+    """Displays all frames of a workload, returns a dictionary with per-frame results."""
+    screen.display_data(*([""]*rows)) #Starting from an empty screen
+    meter = BusMeter(screen)
+    model_clock.time = 0
+    frame_list = workload(cols, rows, frames)
+    start = time()
+    for frame in frame_list:
+        screen.display_data(*frame)
+    cpu_time = time() - start
+    count = float(len(frame_list))
+    return {"transactions":meter.transactions()/count,
+            "bytes":meter.bytes()/count,
+            "modelled_ms":(meter.modelled_time()+model_clock.time)*1000/count,
+            "cpu_ms":cpu_time*1000/count}
+
+def run(driver_names=None, workload_names=None, cols=16, rows=2, frames=100):
+    """Runs the benchmark, returns a list of ``[driver, workload, results]`` entries."""
+    results = []
+    for name, module_name, kwargs in drivers:
+        if driver_names and name not in driver_names and module_name not in driver_names:
+            continue
+        screen, model_clock = load_driver(module_name, kwargs, cols, rows)
+        for workload in workloads:
+            if workload_names and workload.__name__ not in workload_names:
+                continue
+            results.append([name, workload.__name__, run_workload(screen, model_clock, workload, cols, rows, frames)])
+    return results
+
+def print_results(results):
+    print("{:<18}{:<16}{:>14}{:>10}{:>14}{:>10}".format("Driver", "Workload", "Transactions", "Bytes", "Modelled ms", "CPU ms"))
+    for name, workload, result in results:
+        print("{:<18}{:<16}{:>14.1f}{:>10.1f}{:>14.2f}{:>10.3f}".format(name, workload, result["transactions"], result["bytes"], result["modelled_ms"], result["cpu_ms"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="pyLCI output driver benchmark")
+    parser.add_argument('-d', '--drivers', nargs="*", help="Drivers to benchmark (all if not specified)", default=None)
+    parser.add_argument('-w', '--workloads', nargs="*", help="Workloads to run: {}".format(", ".join([w.__name__ for w in workloads])), default=None)
+    parser.add_argument('-c', '--cols', type=int, default=16)
+    parser.add_argument('-r', '--rows', type=int, default=2)
+    parser.add_argument('-f', '--frames', type=int, default=100, help="Frames per workload")
+    args = parser.parse_args()
+    print_results(run(args.drivers, args.workloads, args.cols, args.rows, args.frames))
@@ -0,0 +1,191 @@
+"""Sharing an I2C bus between drivers. Typically, the button expander and the LCD backpack are on the same bus - without coordination, every driver opens its own ``smbus.SMBus`` and their transactions get interleaved in random order, so a button read can end up waiting behind a whole frame of writes.
+
+Drivers get a ``BusClient`` by bus number with ``get_client`` and use it the same way as an ``smbus.SMBus`` object. All clients of a bus share one ``SMBus`` object, and only one transaction happens at a time:
+
+* A client can hold the bus for a group of transactions (for example, a whole frame) with ``batch``, so that other clients' transactions don't get in between.
+* Clients created with ``priority=True`` (input drivers) go before the others, even in the middle of another client's ``batch``, so button reads aren't delayed by screen updates.
+* Every client counts its transactions, bytes, time spent on the bus and time spent waiting for it."""
+
+import smbus
+from threading import Condition, Lock, current_thread
+from contextlib import contextmanager
+from time import time
+
+buses = {} #{bus_num:SharedBus}
+buses_lock = Lock()
+
+def get_bus(bus_num):
+    """Returns the ``SharedBus`` object for the bus number, creating it if it doesn't exist yet."""
+    with buses_lock:
+        if bus_num not in buses:
+            buses[bus_num] = SharedBus(bus_num)
+        return buses[bus_num]
+
+def get_client(bus_num, name, priority=False):
+    """Returns a new ``BusClient`` for the bus number. ``name`` is used in statistics, ``priority`` should be set for clients whose transactions need low latency, such as input drivers reading buttons."""
+    return get_bus(bus_num).add_client(name, priority)
+
+
+class SharedBus():
+    """An I2C bus shared by several clients. Lets one thread at a time use it - threads of priority clients first."""
+
+    def __init__(self, bus_num):
+        self.bus_num = bus_num
+        self.bus = smbus.SMBus(bus_num)
+        self.condition = Condition()
+        self.owner = None #Thread currently using the bus
+        self.depth = 0 #How many times the owner has acquired the bus
+        self.priority_waiting = 0
+        self.yielded = None #Thread that gave the bus to priority clients in the middle of a batch, and is waiting to get it back
+        self.clients = []
+        self.stats_start = time()
+
+    def add_client(self, name, priority=False):
+        client = BusClient(self, name, priority)
+        self.clients.append(client)
+        return client
+
+    def acquire(self, client):
+        """Waits until the bus is free (and, unless ``client`` is a priority one, until there are no priority clients waiting), then makes the current thread its owner. Can be called several times by the owner."""
+        thread = current_thread()
+        with self.condition:
+            if self.owner is thread:
+                self.depth += 1
+                return
+            start = time()
+            if client.priority:
+                self.priority_waiting += 1
+            while self.owner is not None or (not client.priority and (self.priority_waiting or self.yielded)):
+                self.condition.wait()
+            if client.priority:
+                self.priority_waiting -= 1
+            self.owner = thread
+            self.depth = 1
+            client.wait_time += time() - start
+
+    def release(self):
+        with self.condition:
+            self.depth -= 1
+            if not self.depth:
+                self.owner = None
+                self.condition.notify_all()
+
+    def yield_to_priority(self, client):
+        """Is called by the owner between transactions. If priority clients are waiting for the bus, gives it to them and waits until they're done."""
+        with self.condition:
+            if client.priority or not self.priority_waiting:
+                return
+            depth = self.depth
+            self.owner = None
+            self.yielded = current_thread()
+            self.condition.notify_all()
+            start = time()
+            while self.owner is not None or self.priority_waiting:
+                self.condition.wait()
+            self.yielded = None
+            self.owner = current_thread()
+            self.depth = depth
+            client.wait_time += time() - start
+
+    def reset_stats(self):
+        """Resets statistics of all the clients."""
+        self.stats_start = time()
+        for client in self.clients:
+            client.reset_stats()
+
+    def get_stats(self):
+        """Returns a dictionary of ``{client_name:stats}``, where ``stats`` is a dictionary with transaction and byte counts, time spent using the bus and waiting for it (in seconds), and utilisation - part of the time since statistics were reset that the client was using the bus."""
+        elapsed = max(time() - self.stats_start, 0.000001)
+        stats = {}
+        for client in self.clients:
+            stats[client.name] = {"transactions":client.transactions,
+                                  "bytes":client.bytes,
+                                  "busy_time":client.busy_time,
+                                  "wait_time":client.wait_time,
+                                  "utilisation":client.busy_time/elapsed}
+        return stats
+
+
+class BusClient():
+    """A driver's handle for a ``SharedBus``. Has the same transaction methods as ``smbus.SMBus``.
+
+    Attributes:
+
+    * ``transactions``: number of transactions sent by the client
+    * ``bytes``: number of bytes sent and received by the client, counting address bytes
+    * ``busy_time``: time (in seconds) the client's transactions took
+    * ``wait_time``: time (in seconds) the client waited for the bus
+    """
+
+    def __init__(self, shared_bus, name, priority=False):
+        self.shared_bus = shared_bus
+        self.name = name
+        self.priority = priority
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.transactions = 0
+        self.bytes = 0
+        self.busy_time = 0
+        self.wait_time = 0
+
+    @contextmanager
+    def batch(self):
+        """Holds the bus while the ``with`` block is executed, so that other clients' transactions don't get in between the ones in the block - apart from the priority clients' ones."""
+        self.shared_bus.acquire(self)
+        try:
+            yield self
+        finally:
+            self.shared_bus.release()
+
+    def transaction(self, method, args, data_length):
+        """Calls an ``SMBus`` method once the bus is available, counting ``data_length`` bytes (plus the address byte and the bytes read) for the transaction."""
+        bus = self.shared_bus
+        if bus.owner is current_thread(): #In a batch, no need to acquire the bus again
+            if bus.priority_waiting:
+                bus.yield_to_priority(self)
+            start = time()
+            result = getattr(bus.bus, method)(*args)
+            self.busy_time += time() - start
+        else:
+            bus.acquire(self)
+            try:
+                start = time()
+                result = getattr(bus.bus, method)(*args)
+                self.busy_time += time() - start
+            finally:
+                bus.release()
+        self.transactions += 1
+        if isinstance(result, list):
+            data_length += len(result)
+        elif result is not None:
+            data_length += 1
+        self.bytes += 1 + data_length
+        return result
+
+    def write_quick(self, addr):
+        return self.transaction("write_quick", (addr,), 0)
+
+    def read_byte(self, addr):
+        return self.transaction("read_byte", (addr,), 0)
+
+    def write_byte(self, addr, value):
+        return self.transaction("write_byte", (addr, value), 1)
+
+    def read_byte_data(self, addr, reg):
+        return self.transaction("read_byte_data", (addr, reg), 1)
+
+    def write_byte_data(self, addr, reg, value):
+        return self.transaction("write_byte_data", (addr, reg, value), 2)
+
+    def read_word_data(self, addr, reg):
+        return self.transaction("read_word_data", (addr, reg), 2) #Result counts as one byte
+
+    def write_word_data(self, addr, reg, value):
+        return self.transaction("write_word_data", (addr, reg, value), 3)
+
+    def read_i2c_block_data(self, addr, reg, length=32):
+        return self.transaction("read_i2c_block_data", (addr, reg, length), 1)
+
+    def write_i2c_block_data(self, addr, reg, data):
+        return self.transaction("write_i2c_block_data", (addr, reg, data), 1+len(data))
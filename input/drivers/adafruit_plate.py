@@ -1,7 +1,8 @@
-import smbus
+from helpers.i2c_bus import get_client
 from time import sleep
 
 from skeleton import InputSkeleton
+from button_states import ButtonStates
 
 class InputDevice(InputSkeleton):
     """A driver for Adafruit-developed Raspberry Pi character LCD&button shields based on MCP23017, either Adafruit-made or Chinese-made.
@@ -17,21 +18,24 @@ class InputDevice(InputSkeleton):
 
     previous_data = 0
 
-    def __init__(self, addr = 0x20, bus = 1, **kwargs):
+    def __init__(self, addr = 0x20, bus = 1, debounce_time = 0.01, debounce_samples = 1, **kwargs):
         """Initialises the ``InputDevice`` object.  
                                                                                
         Kwargs:                                                                  
                                                                                  
             * ``bus``: I2C bus number.
             * ``addr``: I2C address of the expander.
+            * ``debounce_time``: time (in seconds) during which a button's state changes are ignored after it has changed state, so that contact bounce doesn't result in extra keypresses.
+            * ``debounce_samples``: how many reads in a row a button has to be in a new state for the change to be accepted. Filters out noise, at a cost of latency.
 
         """
         self.bus_num = bus
-        self.bus = smbus.SMBus(self.bus_num)
+        self.bus = get_client(self.bus_num, "adafruit_plate input", priority=True)
         if type(addr) in [str, unicode]:
             addr = int(addr, 16)
         self.addr = addr
         self.init_expander()
+        self.button_states = ButtonStates(5, debounce_time, debounce_samples, self.previous_data)
         InputSkeleton.__init__(self, **kwargs)
 
     def init_expander(self):
@@ -41,25 +45,18 @@ class InputDevice(InputSkeleton):
 
     def runner(self):
         """Polling loop (only one there can be on this shield, since interrupt pin is not connected)."""
-        button_states = []
         while not self.stop_flag:
             if self.enabled:
                 data = (~self.readMCPreg(0x12)&0x1F)
-                if data != self.previous_data:
-                    self.process_data(data)
-                    self.previous_data = data
+                self.process_data(data)
+                self.previous_data = data
             sleep(0.01)
 
     def process_data(self, data):
-        """Checks data received from IO expander and classifies changes as either "button up" or "button down" events. On "button up", calls send_key with the corresponding button name from ``self.mapping``. """
-        data_difference = data ^ self.previous_data
-        changed_buttons = []
-        for i in range(8):
-            if data_difference & 1<<i:
-                changed_buttons.append(i)
-        for button_number in changed_buttons:
-            if not data & 1<<button_number:
-                self.send_key(self.mapping[button_number])
+        """Passes data received from IO expander to ``self.button_states``, which debounces it and returns "button up" and "button down" events. Passes them to ``key_state_changed`` with the corresponding button name from ``self.mapping``. """
+        for button_number, pressed in self.button_states.update(data):
+            if button_number < len(self.mapping):
+                self.key_state_changed(self.mapping[button_number], pressed)
 
     def setMCPreg(self, reg, val):
         """Sets the MCP23017 register."""
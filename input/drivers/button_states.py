@@ -0,0 +1,104 @@
+"""Button state tracking and debouncing for IO expander drivers, which read the states of all their buttons at once, as a byte or a word.
+
+Changed buttons are found with a lookup table of set bits for every byte value, so only the buttons that changed are looked at, and a read with no changes costs a single comparison."""
+
+from time import time
+
+#For every byte value, a tuple of numbers of the bits that are set in it
+set_bits = [tuple([bit for bit in range(8) if value & 1<<bit]) for value in range(256)]
+
+def get_set_bits(value):
+    """Returns a list of numbers of the bits set in ``value``, using ``set_bits`` table for every byte of it."""
+    if value < 256:
+        return list(set_bits[value])
+    bits = []
+    offset = 0
+    while value:
+        bits += [bit+offset for bit in set_bits[value & 0xFF]]
+        value >>= 8
+        offset += 8
+    return bits
+
+class ButtonStates():
+    """Keeps debounced states of up to ``width`` buttons, given raw reads of all of them as an integer, one bit per button (set if the button is pressed).
+
+    Two kinds of debouncing are available, and can be combined:
+
+    * Lockout - once a button changes state, its changes are ignored for ``debounce_time``. The first edge gets through immediately, so it doesn't add latency, and the bounces after it are ignored. If the button ends up in a different state than was accepted, that state is accepted once the lockout ends - see ``get_deadline``.
+    * Integration - a button has to be read in its new state ``debounce_samples`` times in a row for the change to be accepted. Adds latency of ``debounce_samples-1`` reads, but also filters out noise, so it's useful for polling with long wires or worn-out buttons.
+    """
+
+    def __init__(self, width=8, debounce_time=0.01, debounce_samples=1, state=0):
+        """Initialises the ``ButtonStates`` object.
+
+        Kwargs:
+
+            * ``width``: number of buttons
+            * ``debounce_time``: time (in seconds) during which a button's changes are ignored after it has changed state
+            * ``debounce_samples``: how many reads in a row a button has to be in a new state for the change to be accepted
+            * ``state``: initial states of the buttons
+
+        """
+        self.mask = (1<<width) - 1
+        self.debounce_time = debounce_time
+        self.debounce_samples = debounce_samples
+        self.state = state & self.mask #Debounced states
+        self.data = self.state #Last raw read
+        self.lockouts = {} #{bit:time until which the changes are ignored}
+        self.counters = {} #{bit:reads in a row with the button not in its debounced state}
+
+    def update(self, data, timestamp=None):
+        """Takes a raw read of the buttons, returns a list of ``(button_number, pressed)`` tuples for the buttons whose debounced states changed."""
+        data &= self.mask
+        self.data = data
+        difference = data ^ self.state
+        if not difference:
+            if self.counters:
+                self.counters = {}
+            return []
+        if timestamp is None:
+            timestamp = time()
+        changed = get_set_bits(difference)
+        if self.debounce_samples > 1:
+            counters = {}
+            for bit in changed: #Buttons that went back to their state in the meantime get their counters dropped
+                counters[bit] = self.counters.get(bit, 0) + 1
+            self.counters = counters
+        events = []
+        for bit in changed:
+            if self.lockouts.get(bit, 0) > timestamp:
+                continue
+            if self.debounce_samples > 1:
+                if self.counters[bit] < self.debounce_samples:
+                    continue
+                del self.counters[bit]
+            self.state ^= 1<<bit
+            if self.debounce_time:
+                self.lockouts[bit] = timestamp + self.debounce_time
+            events.append((bit, bool(data & 1<<bit)))
+        return events
+
+    def get_deadline(self):
+        """Returns the time at which a change that's been ignored because of a lockout can be accepted, or None if there's no such change. Interrupt-driven drivers have to call ``update`` again at that time, since there might be no more interrupts."""
+        pending = get_set_bits(self.data ^ self.state)
+        deadlines = [self.lockouts[bit] for bit in pending if bit in self.lockouts]
+        return min(deadlines) if deadlines else None
+
+
+if __name__ == "__main__":
+    #Synthetic waveforms of a single button, as lists of (time, level) edges, read every millisecond
+    waveforms = {
+    "clean press":[(0.01, 1), (0.2, 0)],
+    "bouncy press":[(0.01, 1), (0.0115, 0), (0.0125, 1), (0.0135, 0), (0.0145, 1), (0.2, 0)],
+    "bouncy release":[(0.01, 1), (0.2, 0), (0.2015, 1), (0.2025, 0), (0.2035, 1), (0.2045, 0)],
+    "noise spike":[(0.1, 1), (0.1005, 0)]}
+    for debounce_time, debounce_samples in [(0, 1), (0.01, 1), (0, 3)]:
+        print("debounce_time={}, debounce_samples={}".format(debounce_time, debounce_samples))
+        for name, edges in sorted(waveforms.items()):
+            states = ButtonStates(width=1, debounce_time=debounce_time, debounce_samples=debounce_samples)
+            events = []
+            for ms in range(300):
+                timestamp = ms/1000.0
+                level = ([0] + [level for edge_time, level in edges if edge_time <= timestamp])[-1]
+                events += ["{} at {}ms".format("press" if pressed else "release", ms) for _, pressed in states.update(level, timestamp)]
+            print("  {}: {}".format(name, ", ".join(events)))
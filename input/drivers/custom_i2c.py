@@ -1,7 +1,8 @@
-import smbus
+from helpers.i2c_bus import get_client
 from time import sleep
 
 from skeleton import InputSkeleton
+from gpio_events import GPIOEdgeEvents, FALLING_EDGE
 
 class InputDevice(InputSkeleton):
     default_mapping = [
@@ -37,7 +38,7 @@ class InputDevice(InputSkeleton):
     "KEY_LEFT"
     ]
 
-    def __init__(self, addr = 0x12, bus = 1, int_pin = 21, **kwargs):
+    def __init__(self, addr = 0x12, bus = 1, int_pin = 21, gpio_chip = None, **kwargs):
         """Initialises the ``InputDevice`` object.  
                                                                                
         Kwargs:                                                                  
@@ -45,14 +46,18 @@ class InputDevice(InputSkeleton):
             * ``bus``: I2C bus number.
             * ``addr``: I2C address of the device.
             * ``int_pin``: GPIO pin for interrupt mode. 
+            * ``gpio_chip``: GPIO chip device, such as ``"/dev/gpiochip0"``. If set, interrupt-driven mode sleeps until the kernel reports INT pin going low, instead of checking it periodically with ``RPi.GPIO``.
 
         """
         self.bus_num = bus
-        self.bus = smbus.SMBus(self.bus_num)
+        self.bus = get_client(self.bus_num, "custom_i2c input", priority=True)
         if type(addr) in [str, unicode]:
             addr = int(addr, 16)
         self.addr = addr
         self.int_pin = int_pin
+        self.gpio_chip = gpio_chip
+        if self.gpio_chip and self.int_pin is not None:
+            self.edge_events = GPIOEdgeEvents([self.int_pin], chip=self.gpio_chip, edges=FALLING_EDGE)
         self.init_expander()
         InputSkeleton.__init__(self, **kwargs)
 
@@ -73,7 +78,9 @@ class InputDevice(InputSkeleton):
             self.loop_interrupts()
 
     def loop_interrupts(self):
-        """Interrupt-driven loop. Currently can only use ``RPi.GPIO`` library. Stops when ``stop_flag`` is set to True."""
+        """Interrupt-driven loop. Uses GPIO chip device if ``gpio_chip`` is set, otherwise, ``RPi.GPIO`` library. Stops when ``stop_flag`` is set to True."""
+        if self.edge_events:
+            return self.loop_edge_events()
         import RPi.GPIO as GPIO
         GPIO.setmode(GPIO.BCM) # Broadcom pin-numbering scheme
         GPIO.setup(self.int_pin, GPIO.IN)
@@ -83,6 +90,15 @@ class InputDevice(InputSkeleton):
                 self.send_key(self.mapping[data-1])
             sleep(0.1)
 
+    def loop_edge_events(self):
+        """Interrupt-driven loop which sleeps until INT pin goes low. Stops when ``stop_flag`` is set to True."""
+        while not self.stop_flag:
+            while self.edge_events.get_value(self.int_pin) == 0 and not self.stop_flag:
+                data = self.bus.read_byte(self.addr) #Also clears the interrupt
+                if self.enabled:
+                    self.send_key(self.mapping[data-1])
+            self.edge_events.wait()
+
 if __name__ == "__main__":
     id = InputDevice(addr = 0x12, threaded=False)
     id.runner()
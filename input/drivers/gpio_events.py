@@ -0,0 +1,130 @@
+"""Waiting for GPIO edges using the Linux GPIO character device (``/dev/gpiochipN``).
+
+The kernel timestamps edges as they happen and queues them, so a thread can sleep in ``poll()`` until a button changes state, instead of checking the GPIO periodically. Uses the v1 GPIO character device ABI (Linux 4.8 and newer)."""
+
+import os
+import errno
+import fcntl
+import select
+import struct
+
+GPIO_GET_LINEEVENT_IOCTL = 0xC030B404 #_IOWR(0xB4, 0x04, struct gpioevent_request)
+GPIOHANDLE_GET_LINE_VALUES_IOCTL = 0xC040B408 #_IOWR(0xB4, 0x08, struct gpiohandle_data)
+
+GPIOHANDLE_REQUEST_INPUT = 1<<0
+GPIOHANDLE_REQUEST_BIAS_PULL_UP = 1<<5 #Linux 5.5 and newer
+
+RISING_EDGE = 1<<0
+FALLING_EDGE = 1<<1
+BOTH_EDGES = RISING_EDGE | FALLING_EDGE
+
+gpioevent_request = "III32si" #lineoffset, handleflags, eventflags, consumer_label, fd
+gpioevent_data = "QI4x" #timestamp (ns), id (RISING_EDGE or FALLING_EDGE), padding
+gpioevent_data_size = struct.calcsize(gpioevent_data)
+
+class LineEvents():
+    """Edge events of a single GPIO line, requested with ``GPIOChip.request_events``."""
+
+    def __init__(self, fd, line):
+        self.fd = fd
+        self.line = line
+
+    def fileno(self):
+        return self.fd
+
+    def read_events(self):
+        """Reads the queued events and returns a list of ``(timestamp, edge)`` tuples, where timestamp is in nanoseconds and ``edge`` is ``RISING_EDGE`` or ``FALLING_EDGE``. Blocks if there are no events."""
+        data = os.read(self.fd, gpioevent_data_size*16) #Kernel returns as many whole events as fit
+        events = []
+        for offset in range(0, len(data) - gpioevent_data_size + 1, gpioevent_data_size):
+            events.append(struct.unpack_from(gpioevent_data, data, offset))
+        return events
+
+    def get_value(self):
+        """Returns the current level of the line."""
+        values = fcntl.ioctl(self.fd, GPIOHANDLE_GET_LINE_VALUES_IOCTL, "\0"*64)
+        return ord(values[0])
+
+    def close(self):
+        os.close(self.fd)
+
+class GPIOChip():
+    """A GPIO chip character device, such as ``/dev/gpiochip0`` (the Raspberry Pi GPIO header)."""
+
+    def __init__(self, path="/dev/gpiochip0"):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def request_events(self, line, eventflags=BOTH_EDGES, handleflags=GPIOHANDLE_REQUEST_INPUT, label="pyLCI"):
+        """Configures ``line`` as input and returns a ``LineEvents`` object for it."""
+        request = struct.pack(gpioevent_request, line, handleflags, eventflags, label, 0)
+        response = fcntl.ioctl(self.fd, GPIO_GET_LINEEVENT_IOCTL, request)
+        fd = struct.unpack(gpioevent_request, response)[-1]
+        return LineEvents(fd, line)
+
+    def close(self):
+        os.close(self.fd)
+
+class GPIOEdgeEvents():
+    """Waits for edges on several GPIO lines at once. ``stop`` wakes up the waiting thread, so that it can exit."""
+
+    def __init__(self, lines, chip="/dev/gpiochip0", edges=BOTH_EDGES, pull_up=False):
+        """Requests edge events for the lines.
+
+        Args:
+
+            * ``lines``: list of GPIO line numbers (same as BCM GPIO numbers on Raspberry Pi)
+
+        Kwargs:
+
+            * ``chip``: GPIO chip device path, or a ``GPIOChip``-like object
+            * ``edges``: ``RISING_EDGE``, ``FALLING_EDGE`` or ``BOTH_EDGES``
+            * ``pull_up``: enable the internal pull-up resistors (needs Linux 5.5 or newer)
+        """
+        self.chip = GPIOChip(chip) if isinstance(chip, basestring) else chip
+        handleflags = GPIOHANDLE_REQUEST_INPUT
+        if pull_up:
+            handleflags |= GPIOHANDLE_REQUEST_BIAS_PULL_UP
+        self.lines = {} #{fd:LineEvents}
+        self.poll = select.poll()
+        for line in lines:
+            line_events = self.chip.request_events(line, edges, handleflags)
+            self.lines[line_events.fileno()] = line_events
+            self.poll.register(line_events.fileno(), select.POLLIN | select.POLLPRI)
+        self.stop_fd, self.stop_write_fd = os.pipe()
+        self.poll.register(self.stop_fd, select.POLLIN)
+        self.stopped = False
+        self.values = dict([(line_events.line, line_events) for line_events in self.lines.values()])
+
+    def wait(self, timeout=None):
+        """Blocks until there are edges on any of the lines, then returns a list of ``(line, edge, timestamp)`` tuples.
+        Returns an empty list if ``timeout`` (in seconds) has passed, or if ``stop`` was called."""
+        while not self.stopped:
+            try:
+                ready = self.poll.poll(None if timeout is None else timeout*1000)
+            except select.error as e:
+                if e.args[0] == errno.EINTR:
+                    continue
+                raise
+            events = []
+            for fd, _ in ready:
+                if fd in self.lines:
+                    line = self.lines[fd].line
+                    events += [(line, edge, timestamp) for timestamp, edge in self.lines[fd].read_events()]
+            return events
+        return []
+
+    def get_value(self, line):
+        """Returns the current level of the line."""
+        return self.values[line].get_value()
+
+    def stop(self):
+        """Makes ``wait`` return immediately, now and in the future."""
+        self.stopped = True
+        os.write(self.stop_write_fd, "\0")
+
+    def close(self):
+        for line_events in self.lines.values():
+            line_events.close()
+        os.close(self.stop_fd)
+        os.close(self.stop_write_fd)
@@ -67,8 +67,8 @@ class InputDevice(InputSkeleton):
                 if event is not None and event.type == ecodes.EV_KEY:
                     key = ecodes.keys[event.code]
                     value = event.value
-                    if value == 0 and self.enabled:
-                        self.send_key(key)
+                    if value in (0, 1): #2 is autorepeat
+                        self.key_state_changed(key, value == 1)
                 sleep(0.01)
         except IOError as e: 
             if e.errno == 11:
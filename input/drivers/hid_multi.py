@@ -0,0 +1,143 @@
+import os
+import errno
+import select
+from time import time
+
+from evdev import InputDevice as HID, list_devices, ecodes
+
+from skeleton import InputSkeleton
+
+class InputDevice(InputSkeleton):
+    """ A driver for HID devices, such as keyboards and numpads, which listens to any number of them from a single thread.
+
+    Unlike the ``hid`` driver, it doesn't poll the devices - it waits for events from all of them at once with ``epoll``, so it only wakes up when there's something to read. Devices connected after the driver has started are picked up by re-scanning ``/dev/input`` every ``rescan_interval`` seconds, and disconnected devices are dropped. Devices that don't match are remembered, so they're only opened once - until they're disconnected."""
+
+    def __init__(self, names=None, paths=None, forward_values=[0], hotplug=True, rescan_interval=2, grab=None, **kwargs):
+        """Initialises the ``InputDevice`` object.
+
+        Kwargs:
+
+            * ``names``: list of names of input devices to use. If neither ``names`` nor ``paths`` are specified, all input devices that have keys are used.
+            * ``paths``: list of paths of input devices to use
+            * ``forward_values``: event values for which keys are sent - ``0`` is release, ``1`` is press and ``2`` is autorepeat. Default is ``[0]``, same as ``hid`` driver.
+            * ``hotplug``: pick up devices connected after the driver has started
+            * ``rescan_interval``: how often (in seconds) to check for new devices if ``hotplug`` is enabled
+            * ``grab``: grab the devices, so that their keypresses don't go anywhere else (like the system console). By default, devices are only grabbed if ``names`` or ``paths`` are specified - otherwise, the driver would take every keyboard (and the power button) away from the system.
+
+        """
+        self.names = names
+        self.paths = paths
+        self.forward_values = forward_values
+        self.hotplug = hotplug
+        self.rescan_interval = rescan_interval
+        self.grab = grab if grab is not None else bool(names or paths)
+        self.devices = {} #{fd:device}
+        self.rejected_paths = set() #Paths of devices that didn't match, not opened again until they disappear
+        self.epoll = select.epoll()
+        self.wakeup_fd, self.wakeup_write_fd = os.pipe() #Used to wake up the runner when it needs to exit
+        self.epoll.register(self.wakeup_fd, select.EPOLLIN)
+        self.scan_devices()
+        InputSkeleton.__init__(self, mapping = [], **kwargs)
+
+    def matches(self, device):
+        """Checks whether a device should be used, according to ``names`` and ``paths``. Devices without keys (like mice) aren't used."""
+        if self.paths and device.fn not in self.paths:
+            return False
+        if self.names and device.name not in self.names:
+            return False
+        return ecodes.EV_KEY in device.capabilities()
+
+    def scan_devices(self):
+        """Opens the input devices that match ``names`` and ``paths`` and aren't yet open or rejected."""
+        open_paths = [device.fn for device in self.devices.values()]
+        paths = list_devices()
+        self.rejected_paths.intersection_update(paths) #A device that's plugged in later might get the same path
+        for path in paths:
+            if path in open_paths or path in self.rejected_paths:
+                continue
+            try:
+                device = HID(path)
+            except (OSError, IOError):
+                continue #Device is gone already, or we can't access it
+            if not self.matches(device):
+                device.close()
+                self.rejected_paths.add(path)
+                continue
+            if self.grab:
+                try:
+                    device.grab()
+                except IOError:
+                    print("Failed to grab HID device {}, is it grabbed by something else?".format(path))
+            self.devices[device.fileno()] = device
+            self.epoll.register(device.fileno(), select.EPOLLIN)
+
+    def remove_device(self, fd):
+        """Stops listening to a device, typically, after it's been disconnected."""
+        device = self.devices.pop(fd)
+        try:
+            self.epoll.unregister(fd)
+        except (IOError, OSError, ValueError):
+            pass
+        try:
+            device.close()
+        except (IOError, OSError):
+            pass
+
+    def read_device(self, fd):
+        """Reads all the available events from a device and processes key events."""
+        try:
+            for event in self.devices[fd].read():
+                if event.type == ecodes.EV_KEY:
+                    self.process_event(ecodes.keys[event.code], event.value)
+        except IOError as e:
+            if e.errno != errno.EAGAIN: #EAGAIN just means there's nothing more to read, otherwise, the device is gone
+                self.remove_device(fd)
+
+    def process_event(self, key, value):
+        """Sends the key if the event value is one of ``forward_values``. If a key event engine is used, passes presses and releases to it instead."""
+        if self.key_engine:
+            if value in (0, 1):
+                self.key_state_changed(key, value == 1)
+        elif self.enabled and value in self.forward_values:
+            self.send_key(key)
+
+    def runner(self):
+        """Blocking event loop which waits for events from all the devices at once and sends the keys."""
+        next_scan = time() + self.rescan_interval
+        while not self.stop_flag:
+            timeout = max(0, next_scan - time()) if self.hotplug else -1
+            try:
+                events = self.epoll.poll(timeout)
+            except IOError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            for fd, event_mask in events:
+                if fd == self.wakeup_fd:
+                    os.read(fd, 64)
+                elif fd in self.devices:
+                    if event_mask & select.EPOLLIN:
+                        self.read_device(fd)
+                    if fd in self.devices and event_mask & (select.EPOLLERR | select.EPOLLHUP):
+                        self.remove_device(fd)
+            if self.hotplug and time() >= next_scan:
+                self.scan_devices()
+                next_scan = time() + self.rescan_interval
+        for fd in self.devices.keys():
+            if self.grab:
+                try:
+                    self.devices[fd].ungrab()
+                except (IOError, OSError):
+                    pass
+            self.remove_device(fd)
+
+    def atexit(self):
+        InputSkeleton.atexit(self)
+        os.write(self.wakeup_write_fd, "\0")
+
+
+
+if __name__ == "__main__":
+    id = InputDevice(threaded=False, forward_values=[0, 1, 2])
+    print("Listening to: {}".format([dev.name for dev in id.devices.values()]))
+    id.runner()
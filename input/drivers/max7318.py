@@ -1,7 +1,9 @@
-import smbus
-from time import sleep
+from helpers.i2c_bus import get_client
+from time import sleep, time
 
 from skeleton import InputSkeleton
+from gpio_events import GPIOEdgeEvents, FALLING_EDGE
+from button_states import ButtonStates
 
 class InputDevice(InputSkeleton):
     """ A driver for MAX7318-based I2C IO expanders. They have 16 IO pins available as well as an interrupt pin. 
@@ -29,7 +31,7 @@ class InputDevice(InputSkeleton):
 
     previous_data = 0x00
 
-    def __init__(self, addr = 0x20, bus = 1, int_pin = None, **kwargs):
+    def __init__(self, addr = 0x20, bus = 1, int_pin = None, gpio_chip = None, debounce_time = 0.01, debounce_samples = 1, **kwargs):
         """Initialises the ``InputDevice`` object.  
                                                                                
         Kwargs:                                                                  
@@ -37,15 +39,22 @@ class InputDevice(InputSkeleton):
             * ``bus``: I2C bus number.
             * ``addr``: I2C address of the expander.
             * ``int_pin``: GPIO pin to which INT pin of the expander is connected. If supplied, interrupt-driven mode is used, otherwise, library reverts to polling mode.
+            * ``gpio_chip``: GPIO chip device, such as ``"/dev/gpiochip0"``. If set, interrupt-driven mode sleeps until the kernel reports INT pin going low, instead of checking it periodically with ``RPi.GPIO``.
+            * ``debounce_time``: time (in seconds) during which a button's state changes are ignored after it has changed state, so that contact bounce doesn't result in extra keypresses.
+            * ``debounce_samples``: how many reads in a row a button has to be in a new state for the change to be accepted. Filters out noise, at a cost of latency.
 
         """
         self.bus_num = bus
-        self.bus = smbus.SMBus(self.bus_num)
+        self.bus = get_client(self.bus_num, "max7318 input", priority=True)
         if type(addr) in [str, unicode]:
             addr = int(addr, 16)
         self.addr = addr
         self.int_pin = int_pin
+        self.gpio_chip = gpio_chip
+        if self.gpio_chip and self.int_pin is not None:
+            self.edge_events = GPIOEdgeEvents([self.int_pin], chip=self.gpio_chip, edges=FALLING_EDGE)
         self.init_expander()
+        self.button_states = ButtonStates(16, debounce_time, debounce_samples, self.previous_data)
         InputSkeleton.__init__(self, **kwargs)
 
     def init_expander(self):
@@ -67,11 +76,12 @@ class InputDevice(InputSkeleton):
             self.loop_interrupts()
 
     def loop_interrupts(self):
-        """Interrupt-driven loop. Currently can only use ``RPi.GPIO`` library. Stops when ``stop_flag`` is set to True."""
+        """Interrupt-driven loop. Uses GPIO chip device if ``gpio_chip`` is set, otherwise, ``RPi.GPIO`` library. Stops when ``stop_flag`` is set to True."""
+        if self.edge_events:
+            return self.loop_edge_events()
         import RPi.GPIO as GPIO
         GPIO.setmode(GPIO.BCM) # Broadcom pin-numbering scheme
         GPIO.setup(self.int_pin, GPIO.IN)
-        button_states = []
         while not self.stop_flag:
             while GPIO.input(self.int_pin) == False and self.enabled:
                 data0 = (~self.bus.read_byte_data(self.addr, 0x00)&0xFF)
@@ -79,32 +89,44 @@ class InputDevice(InputSkeleton):
                 data = data0 | (data1 << 8) 
                 self.process_data(data)
                 self.previous_data = data
+            if self.enabled:
+                self.process_data(self.previous_data) #Changes ignored while debouncing might be due
             sleep(0.01)
 
+    def loop_edge_events(self):
+        """Interrupt-driven loop which sleeps until INT pin goes low. Stops when ``stop_flag`` is set to True."""
+        while not self.stop_flag:
+            while self.edge_events.get_value(self.int_pin) == 0 and not self.stop_flag:
+                data0 = (~self.bus.read_byte_data(self.addr, 0x00)&0xFF)
+                data1 = (~self.bus.read_byte_data(self.addr, 0x01)&0xFF)
+                data = data0 | (data1 << 8) 
+                if self.enabled: #Expander still needs to be read to clear the interrupt
+                    self.process_data(data)
+                self.previous_data = data
+            deadline = self.button_states.get_deadline()
+            if deadline is None:
+                self.edge_events.wait()
+            else: #A change was ignored while debouncing, and there might be no interrupt once it can be accepted
+                self.edge_events.wait(max(deadline-time(), 0))
+                if self.enabled:
+                    self.process_data(self.previous_data)
+
     def loop_polling(self):
         """Polling loop. Stops when ``stop_flag`` is set to True."""
-        button_states = []
         while not self.stop_flag:
             if self.enabled:
                 data0 = (~self.bus.read_byte_data(self.addr, 0x00)&0xFF)
                 data1 = (~self.bus.read_byte_data(self.addr, 0x01)&0xFF)
                 data = data0 | (data1 << 8) 
-                if data != self.previous_data:
-                    self.process_data(data)
-                    self.previous_data = data
+                self.process_data(data)
+                self.previous_data = data
             sleep(0.01)
 
     def process_data(self, data):
-        """Checks data received from IO expander and classifies changes as either "button up" or "button down" events. On "button up", calls send_key with the corresponding button name from ``self.mapping``. """
-        data_difference = data ^ self.previous_data
-        changed_buttons = []
-        for i in range(len(self.mapping)):
-            if data_difference & 1<<i:
-                changed_buttons.append(i)
-        for button_number in changed_buttons:
-            if not data & 1<<button_number:
-                self.send_key(self.mapping[button_number])
-
+        """Passes data received from IO expander to ``self.button_states``, which debounces it and returns "button up" and "button down" events. Passes them to ``key_state_changed`` with the corresponding button name from ``self.mapping``. """
+        for button_number, pressed in self.button_states.update(data):
+            if button_number < len(self.mapping):
+                self.key_state_changed(self.mapping[button_number], pressed)
 
 if __name__ == "__main__":
     id = InputDevice(int_pin = 4, threaded=False)
@@ -1,6 +1,8 @@
-from time import sleep
+from time import sleep, time
 
 from skeleton import InputSkeleton
+from gpio_events import GPIOEdgeEvents, RISING_EDGE
+from button_states import ButtonStates
 
 class InputDevice(InputSkeleton):
     """ A driver for pushbuttons attached to Raspberry Pi GPIO. It uses RPi.GPIO library. Button's first pin has to be attached to ground, second pin has to be attached to the GPIO pin and pulled up to 3.3V with a 1-10K resistor."""
@@ -15,19 +17,29 @@ class InputDevice(InputSkeleton):
     "KEY_HOME",
     "KEY_END"]
 
-    def __init__(self, button_pins=[], **kwargs):
+    send_on_release = False
+
+    def __init__(self, button_pins=[], gpio_chip=None, debounce_time=0.01, **kwargs):
         """Initialises the ``InputDevice`` object. 
 
         Kwargs:
         
         * ``button_pins``: GPIO mubers which to treat as buttons (GPIO.BCM numbering)
         * ``debug``: enables printing button press and release events when set to True
+        * ``gpio_chip``: GPIO chip device, such as ``"/dev/gpiochip0"``. If set, instead of polling the buttons, the driver sleeps until the kernel reports a GPIO edge, so it uses no CPU while buttons aren't pressed and reacts to presses immediately.
+        * ``debounce_time``: when ``gpio_chip`` is used, edges coming sooner than that (in seconds) after the previous button state change are treated as contact bounce and ignored - the button is read again once that time passes.
         """
         self.button_pins = button_pins
+        self.gpio_chip = gpio_chip
+        self.debounce_time = debounce_time
         self.init_hw()
         InputSkeleton.__init__(self, **kwargs)
 
     def init_hw(self):
+        if self.gpio_chip:
+            self.edge_events = GPIOEdgeEvents(self.button_pins, chip=self.gpio_chip)
+            self.button_states = ButtonStates(width=len(self.button_pins), debounce_time=self.debounce_time, state=self.read_pressed())
+            return
         import RPi.GPIO as GPIO #Doing that because I couldn't mock it for ReadTheDocs
         self.GPIO = GPIO
         GPIO.setmode(GPIO.BCM) 
@@ -38,14 +50,46 @@ class InputDevice(InputSkeleton):
             self.button_states.append(GPIO.input(pin_num))
 
     def runner(self):
+        """Runs either edge-triggered or polling loop."""
+        if self.edge_events:
+            self.loop_edge_events()
+        else:
+            self.loop_polling()
+
+    def read_pressed(self):
+        """Reads the buttons through the GPIO chip, returns an integer with bits set for the buttons that are pressed."""
+        pressed = 0
+        for i, pin_num in enumerate(self.button_pins):
+            if not self.edge_events.get_value(pin_num):
+                pressed |= 1<<i
+        return pressed
+
+    def loop_edge_events(self):
+        """Edge-triggered loop, sleeps until a button changes state. Stops when ``stop_flag`` is set to True.
+
+        Debouncing is done by ``ButtonStates`` - the first edge is accepted immediately, and edges coming within ``debounce_time`` after it are ignored. If edges were ignored, the buttons are read again once ``debounce_time`` passes, since a button might have been released during that time and there won't be any more edges to wake the loop up."""
+        states = self.button_states #ButtonStates object, set up in init_hw()
+        while not self.stop_flag:
+            deadline = states.get_deadline()
+            events = self.edge_events.wait(None if deadline is None else max(deadline - time(), 0))
+            now = time()
+            changes = []
+            for pin_num, edge, _ in events:
+                bit = 1<<self.button_pins.index(pin_num)
+                data = states.data & ~bit if edge == RISING_EDGE else states.data | bit
+                changes += states.update(data, now)
+            if deadline is not None and now >= deadline:
+                changes += states.update(self.read_pressed(), now)
+            for i, pressed in changes:
+                self.key_state_changed(self.mapping[i], pressed)
+
+    def loop_polling(self):
         """Polling loop. Stops when ``stop_flag`` is set to True."""
         while not self.stop_flag:
             for i, pin_num in enumerate(self.button_pins):
                 button_state = self.GPIO.input(pin_num)
                 if button_state != self.button_states[i]:
-                    if button_state == False and self.enabled:
-                        key = self.mapping[i]
-                        self.send_key(key)
+                    self.key_state_changed(self.mapping[i], button_state == False)
                     self.button_states[i] = button_state
             sleep(0.01)
 
@@ -0,0 +1,72 @@
+import importlib
+from threading import Lock
+from time import time
+
+from skeleton import InputSkeleton
+
+class InputDevice(InputSkeleton):
+    """A driver that wraps another input driver, passing its keys on as usual and recording them to a file, to be replayed later by the ``replay`` driver.
+
+    Key presses and releases are recorded for drivers that report them, so a recording goes through the key event engine (if one is used) when it's replayed, just like the original keys did."""
+
+    default_mapping = []
+
+    def __init__(self, path, driver, args=[], kwargs={}, **skeleton_kwargs):
+        """Initialises the ``InputDevice`` object.
+
+        Args:
+
+            * ``path``: path to the file to record keys to. It's overwritten if it exists.
+            * ``driver``: name of the input driver to record keys from, such as ``"hid"``
+
+        Kwargs:
+
+            * ``args``, ``kwargs``: arguments for the recorded driver, same as its ``"args"`` and ``"kwargs"`` in ``config.json``
+
+        """
+        self.path = path
+        self.lock = Lock() #Some drivers send keys from more than one thread
+        self.file = open(path, "w")
+        self.last_event = None
+        driver_module = importlib.import_module("input.drivers."+driver)
+        self.driver = driver_module.InputDevice(*args, **kwargs)
+        self.send_on_release = getattr(self.driver, "send_on_release", True)
+        self.file.write("#pyLCI key recording of {} driver, send_on_release={}\n".format(driver, self.send_on_release))
+        self.driver.send_key = self.record_key
+        self.driver.key_state_changed = self.record_key_state
+        InputSkeleton.__init__(self, threaded=False, **skeleton_kwargs)
+
+    def start(self):
+        """Enables the driver. Also lets the recorded driver know whether a key event engine is used, since some drivers only report presses and releases if it is."""
+        InputSkeleton.start(self)
+        self.driver.key_engine = self.key_engine
+
+    def record(self, event):
+        """Writes an event to the recording, along with the number of milliseconds since the previous one."""
+        now = time()
+        with self.lock:
+            delta = 0 if self.last_event is None else int(round((now - self.last_event)*1000))
+            self.last_event = now
+            self.file.write("{} {}\n".format(delta, event))
+            self.file.flush()
+
+    def record_key(self, key):
+        """Receives keys the recorded driver sends, records and sends them."""
+        if not self.enabled:
+            return
+        self.record(key)
+        self.send_key(key)
+
+    def record_key_state(self, key, pressed):
+        """Receives key presses and releases from the recorded driver, records them and passes them on, to ``key_state_changed``."""
+        if not self.enabled:
+            return
+        self.record(("+" if pressed else "-")+key)
+        self.key_state_changed(key, pressed)
+
+    def atexit(self):
+        InputSkeleton.atexit(self)
+        if hasattr(self.driver, "atexit"):
+            self.driver.atexit()
+        with self.lock:
+            self.file.close()
@@ -0,0 +1,106 @@
+from threading import Event
+from time import time, sleep
+
+from skeleton import InputSkeleton
+
+def read_recording(path):
+    """Reads a key recording made by the ``recorder`` driver. Returns a ``(events, send_on_release)`` tuple, where ``events`` is a list of ``(time, event)`` tuples, ``time`` being in seconds since the recording start.
+
+    The recording is a text file, with one ``delta event`` line per event, where ``delta`` is the number of milliseconds since the previous event and ``event`` is either a key name (a key the driver sent), ``+KEY_NAME`` (key pressed) or ``-KEY_NAME`` (key released). Lines starting with ``#`` are comments."""
+    events = []
+    send_on_release = True
+    timestamp = 0
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("#"):
+                if "send_on_release=False" in line:
+                    send_on_release = False
+                continue
+            if not line:
+                continue
+            delta, event = line.split()
+            timestamp += int(delta)/1000.0
+            events.append((timestamp, event))
+    return events, send_on_release
+
+class InputDevice(InputSkeleton):
+    """A driver that replays keys recorded by the ``recorder`` driver - at the original speed, faster, or as fast as possible. Useful for benchmarking whole navigation sessions and for reproducing bugs."""
+
+    default_mapping = []
+
+    def __init__(self, path, speed=1, loop=False, send_on_release=None, **kwargs):
+        """Initialises the ``InputDevice`` object.
+
+        Args:
+
+            * ``path``: path to the recording
+
+        Kwargs:
+
+            * ``speed``: replay speed - ``1`` is the original speed, ``2`` is twice as fast and so on. ``0`` replays keys as fast as possible, only waiting for UI elements to change after pauses - see ``replay``.
+            * ``loop``: start over once the recording ends
+            * ``send_on_release``: whether to send keys on release or on press if there's no key event engine. By default, it's the same as for the driver the keys were recorded from.
+
+        """
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.events, recorded_send_on_release = read_recording(path)
+        self.send_on_release = recorded_send_on_release if send_on_release is None else send_on_release
+        self.started = Event()
+        self.finished = Event()
+        self.keymap_set = Event()
+        InputSkeleton.__init__(self, **kwargs)
+
+    def start(self):
+        """Enables the driver. Replay starts once the driver is enabled for the first time (by ``InputListener.listen``). ``InputListener`` also enables the drivers every time a UI element sets its keymap, which is what replaying with ``speed=0`` waits for after pauses."""
+        InputSkeleton.start(self)
+        self.keymap_set.set()
+        self.started.set()
+
+    def replay(self, speed=None):
+        """Sends all the recorded events, keeping the intervals between them (divided by ``speed``). Blocks until done, or until the driver exits. Returns the time it took, in seconds.
+
+        With ``speed`` of 0, events are sent without delays, except for the pauses in the recording - a pause usually means that the previous key opened or closed a UI element, and the next key has to go to the new one, not to the one that's about to be replaced. So, after the previous event, the replay waits until a UI element sets its keymap (see ``start``), but not longer than the pause was, in case nothing was going to change."""
+        if speed is None:
+            speed = self.speed
+        self.finished.clear()
+        start = time()
+        previous_timestamp = 0
+        for timestamp, event in self.events:
+            if self.stop_flag:
+                break
+            if speed:
+                delay = start + timestamp/speed - time() #Relative to the start, so that delays don't add up
+                if delay > 0:
+                    sleep(delay)
+            elif timestamp > previous_timestamp:
+                self.keymap_set.wait(timestamp - previous_timestamp)
+            previous_timestamp = timestamp
+            self.keymap_set.clear()
+            if event[0] in "+-":
+                self.key_state_changed(event[1:], event[0] == "+")
+            elif self.enabled:
+                self.send_key(event)
+        self.finished.set()
+        return time() - start
+
+    def runner(self):
+        """Waits until the driver is enabled, then replays the recording (over and over again if ``loop`` is set)."""
+        while not self.stop_flag:
+            self.started.wait() #Also set by ``atexit``, so that the thread can exit
+            self.replay()
+            if not self.loop:
+                break
+
+    def atexit(self):
+        InputSkeleton.atexit(self)
+        self.started.set()
+        self.keymap_set.set()
+
+
+if __name__ == "__main__":
+    import sys
+    id = InputDevice(sys.argv[1], threaded=False)
+    id.replay()
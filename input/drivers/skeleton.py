@@ -1,15 +1,20 @@
 import threading
+from time import time
 
 class InputSkeleton():
     """Base class for input devices. Expectations from children:
     
     * ``self.default_mapping`` variable to be set unless you're always going to pass mapping as argument in config
-    * ``self.runner`` to be set to a function that'll run in backround, scanning for button presses and sending events to send_key
+    * ``self.runner`` to be set to a function that'll run in backround, scanning for button presses and sending events to send_key - or, if the driver can tell presses from releases, to key_state_changed
     * main thread to stop sending keys if self.enabled is False
-    * main thread to exit immediately if self.stop_flag is True"""
+    * main thread to exit immediately if self.stop_flag is True
+    * ``self.edge_events`` to be set to a ``GPIOEdgeEvents`` object if main thread waits for GPIO edges, so that it can be woken up on exit"""
 
     enabled = True
     stop_flag = False
+    edge_events = None
+    key_engine = None #Set by ``InputListener`` if a key event engine is used
+    send_on_release = True #Without a key event engine, ``key_state_changed`` sends keys on release if set, otherwise, on press
 
     def __init__(self, mapping=None, threaded=True):
         if mapping is not None:
@@ -28,9 +33,18 @@ class InputSkeleton():
         self.enabled = False
 
     def send_key(self, key):
-        """A hook to be overridden by ``InputListener``. Otherwise, prints out key names as soon as they're pressed so is useful for debugging (to test things, just launch the driver as ``python driver.py``)"""
+        """A hook to be overridden by ``InputListener``. Otherwise, prints out key names as soon as they're pressed so is useful for debugging (to test things, launch the driver from the pyLCI directory as ``python -m input.drivers.driver_name``)"""
         print(key)
 
+    def key_state_changed(self, key, pressed):
+        """Is called by drivers when a key is pressed or released. Passes the event to the key event engine if there is one, otherwise, sends the key on release or press, depending on ``send_on_release``."""
+        if not self.enabled:
+            return
+        if self.key_engine:
+            self.key_engine.key_state_changed(key, pressed, time())
+        elif pressed != self.send_on_release:
+            self.send_key(key)
+
     def start_thread(self):
         """Starts a thread with ``start`` function as target."""
         self.thread = threading.Thread(target=self.runner)
@@ -39,3 +53,5 @@ class InputSkeleton():
 
     def atexit(self):
         self.stop_flag = True
+        if self.edge_events:
+            self.edge_events.stop()
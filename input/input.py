@@ -1,43 +1,96 @@
-from threading import Thread, Event
+from threading import Thread, Condition, Lock, current_thread
+from collections import deque
 import importlib
 import atexit
-from time import sleep
+from time import time
 import Queue
 from helpers import read_config
+from key_engine import KeyEventEngine
 
 listener = None
 
+wake_key = object() #Put in the queue to wake up the dispatcher thread waiting for keys
+
 class CallbackException(Exception):
     def __init__(self, code=0, message=""):
         self.code = code
         self.message = message
 
 class InputListener():
-    """A class which listens for input device events and calls corresponding callbacks if set"""
-    stop_flag = None
+    """A class which listens for input device events and calls corresponding callbacks if set.
+
+    Keys are dispatched by a long-lived thread. When a callback activates a UI element (which then blocks the thread until it exits), dispatching is handed over to another thread - see ``handoff``. Threads that are done with their callbacks wait in a pool to be reused, so the number of threads only grows with the depth of nested UI elements.
+
+    Callbacks that take long without activating UI elements (such as ones running external commands) can be run on a separate, bounded pool of callback workers instead, so that they don't hold up the keys that follow - see ``set_key_policy``. Nonmaskable callbacks are dispatched by a separate thread as soon as their keys are received, so they work even if the dispatcher thread is busy, and are always run by callback workers, so that a slow one doesn't hold up the ones that follow."""
     thread_index = 0
     keymap = {}
     maskable_keymap = {}
     nonmaskable_keymap = {}
     streaming = None
+    latency_samples = 1000 #How many last key latencies and callback durations are kept
+    key_policies = ["inline", "serialise", "drop", "latest"]
     reserved_keys = ["KEY_LEFT", "KEY_RIGHT", "KEY_UP", "KEY_DOWN", "KEY_ENTER", "KEY_KPENTER"]
 
-    def __init__(self, drivers, keymap=None):
-        """Init function for creating KeyListener object. Checks all the arguments and sets keymap if supplied."""
+    def __init__(self, drivers, keymap=None, drop_stale_keys=False, key_engine=None, callback_workers=4, coalesce_keys=True):
+        """Init function for creating KeyListener object. Checks all the arguments and sets keymap if supplied.
+
+        If ``drop_stale_keys`` is set, keys received before the last ``set_keymap`` call, but not yet processed, are dropped instead of being passed to the new keymap's callbacks.
+
+        If ``key_engine`` (a ``KeyEventEngine`` object) is passed, drivers send key presses and releases to it, and it sends key events (taps, holds and chords) to the listener.
+
+        ``callback_workers`` is the maximum number of threads that run callbacks of keys with a policy other than ``"inline"``.
+
+        If ``coalesce_keys`` is set, keys that are waiting to be processed right after the same key are passed to its callback at once, as a count - if the callback accepts it (see ``ui.funcs.accepts_count``). That way, a burst of ``KEY_DOWN`` presses moves a menu pointer in one go, and the menu is only redrawn once."""
         self.drivers = drivers
         self.queue = Queue.Queue()
+        self.lookahead = None #Key taken from the queue by ``take_repeats`` which wasn't a repeat, it goes before the keys in the queue
+        self.drop_stale_keys = drop_stale_keys
+        self.keymap_version = 0
+        self.dispatcher = None #Thread currently dispatching keys
+        self.workers = []
+        self.idle_workers = 0
+        self.dispatcher_condition = Condition()
+        self.shutdown_flag = False
+        self.latencies = deque(maxlen=self.latency_samples)
+        self.callback_durations = deque(maxlen=self.latency_samples)
+        self.priority_queue = Queue.Queue()
+        self.priority_thread = None
+        self.policies = {} #{key_name:policy}
+        self.callback_workers = callback_workers
+        self.callback_queue = Queue.Queue()
+        self.callback_threads = []
+        self.idle_callback_threads = 0
+        self.callback_lock = Lock()
+        self.key_states = {} #{key_name:{"running":bool, "pending":deque of callbacks}} for keys with a policy
+        self.dropped_callbacks = 0
+        self.coalesce_keys = coalesce_keys
+        self.coalesced_keys = 0
+        self.activity_callbacks = []
         if keymap is None: keymap = {} 
         for driver, _ in self.drivers:
             driver.send_key = self.receive_key #Overriding the send_key method so that keycodes get sent to InputListener
-        self.set_keymap(keymap)
+            driver.key_engine = key_engine
+        if key_engine:
+            key_engine.send_key = self.receive_key
+        self.keymap = keymap
 
     def receive_key(self, key):
-        """ This is the method that receives keypresses from drivers and puts them into ``self.queue`` for ``self.event_loop`` to receive """
+        """ This is the method that receives keypresses from drivers and puts them into ``self.queue`` for the dispatcher thread to receive. The time the key was received at is stored along with it, to measure latency, as well as the keymap version.
+        Keys that have nonmaskable callbacks go to the priority thread instead. Activity callbacks are called for every key, before it's queued."""
+        for callback in self.activity_callbacks:
+            callback()
         try:
-            self.queue.put(key)
+            if key in self.nonmaskable_keymap and self.priority_thread:
+                self.priority_queue.put((key, time(), None))
+                return
+            self.queue.put((key, time(), self.keymap_version))
         except:
             raise #Just collecting possible exceptions for now
 
+    def add_activity_callback(self, callback):
+        """Adds a callback that's called (without arguments) from the driver thread whenever a key is received - for example, to turn the display backlight on, since a keypress might not change what's displayed. Should return quickly, since the key isn't queued until it returns."""
+        self.activity_callbacks.append(callback)
+
     def set_streaming(self, callback):
         """Sets a callback for streaming key events. The callback will be called 
         with key_name as first argument but should support arbitrary number 
@@ -78,17 +131,39 @@ class InputListener():
         Raises CallbackException if the callback is one of the reserved keys or already is in maskable/nonmaskable keymap.
 
         A nonmaskable callback is global (never cleared) and will be called upon a keypress 
-        even if a callback for the same keyname is already set in ``keymap`` (callback from the ``keymap`` won't be called)."""
+        even if a callback for the same keyname is already set in ``keymap`` (callback from the ``keymap`` won't be called).
+        It's run by a callback worker thread, with the ``"serialise"`` policy unless another one is set with ``set_key_policy``."""
         self.check_special_callback(key_name)
         self.nonmaskable_keymap[key_name] = callback
+        self.start_priority_thread()
+
+    def set_key_policy(self, key_name, policy):
+        """Sets how callbacks for a key are run. Policies are:
+
+        * ``"inline"`` - by the dispatcher thread, before the next key is processed. This is the default, and what UI elements need.
+        * ``"serialise"`` - by a callback worker thread, one at a time - keys received while the callback is running are processed after it finishes.
+        * ``"drop"`` - by a callback worker thread, keys received while the callback is running are ignored.
+        * ``"latest"`` - by a callback worker thread, once the callback finishes, it's called once more if the key was received while it was running, however many times that was.
+
+        Callbacks for different keys run in parallel, up to ``callback_workers`` at once."""
+        if policy not in self.key_policies:
+            raise ValueError("Unknown key policy: {}".format(policy))
+        if policy == "inline":
+            self.policies.pop(key_name, None)
+        else:
+            self.policies[key_name] = policy
 
     def remove_callback(self, key_name):
         """Removes a single callback of the listener"""
         self.keymap.remove(key_name)
 
     def set_keymap(self, keymap):
-        """Sets all the callbacks supplied, removing the previously set keymap completely"""
+        """Sets all the callbacks supplied, removing the previously set keymap completely. The keymap is replaced at once, so no keys get lost or go to an empty keymap in the meantime - this is what UI elements should use when they're activated.
+
+        Also makes sure keys are being received and dispatched, the same way ``listen`` does."""
         self.keymap = keymap
+        self.keymap_version += 1
+        self.listen()
 
     def replace_keymap_entries(self, keymap):
         """Sets all the callbacks supplied, not removing previously set but overwriting those with same keycodes"""
@@ -99,67 +174,206 @@ class InputListener():
         """Removes all the callbacks set"""
         self.keymap = {}
 
-    def event_loop(self, index):
-        """Blocking event loop which just calls callbacks in the keymap once corresponding keys are received in the ``self.queue``."""
-        #print("Starting event loop "+str(index))
-        self.stop_flag = Event()
-        stop_flag = self.stop_flag #Saving a reference. 
-        #stop_flag is an object that will signal the current input thread to exit or not exit once it's done processing a callback.
-        #It'll be called just before self.stop_flag will be overwritten. However, we've got a reference to it and now can check the exact object this thread itself constructed.
-        #Praise the holy garbage collector. 
-        stop_flag.clear()
-        while not stop_flag.isSet():
+    def worker(self):
+        """Dispatcher thread pool worker. Waits until no other thread is dispatching keys, then dispatches them until dispatching is handed over to another thread or the listener is shut down."""
+        thread = current_thread()
+        while True:
+            with self.dispatcher_condition:
+                self.idle_workers += 1
+                while self.dispatcher is not None and not self.shutdown_flag:
+                    self.dispatcher_condition.wait()
+                self.idle_workers -= 1
+                if self.shutdown_flag:
+                    return
+                self.dispatcher = thread
+            self.dispatch(thread)
+
+    def dispatch(self, thread):
+        """Blocking loop which calls callbacks in the keymap once corresponding keys are received in the ``self.queue``, for as long as ``thread`` is the dispatcher thread."""
+        while self.dispatcher is thread:
             try:
-                key = self.queue.get(False, 0.1)
-            except Queue.Empty:
-                sleep(0.1)
+                key, timestamp, version = self.get_key() #Blocks until a key arrives or something wakes us up
             except AttributeError:
-                pass #Typically gets printed if InputListener exits abnormally upon program termination
-            else:
-                self.process_key(key)
-        #print("Stopping event loop "+str(index))
+                return #Typically happens if InputListener exits abnormally upon program termination
+            if key is wake_key:
+                continue
+            if self.drop_stale_keys and version != self.keymap_version:
+                continue
+            self.latencies.append(time()-timestamp)
+            self.process_key(key)
+
+    def get_key(self):
+        """Returns the next ``(key, timestamp, keymap_version)`` tuple to be dispatched - the one ``take_repeats`` looked ahead at, if any, otherwise, the first one in the queue, waiting for it if the queue is empty."""
+        item = self.lookahead
+        if item is not None:
+            self.lookahead = None
+            return item
+        return self.queue.get()
+
+    def start_worker(self):
+        worker = Thread(target = self.worker, name="InputThread-"+str(self.thread_index))
+        self.thread_index += 1
+        worker.daemon = False
+        self.workers.append(worker)
+        worker.start()
+
+    def handoff(self):
+        """If called from a callback, hands dispatching over to a pool thread (starting one if none are available), and this thread joins the pool once the callback returns.
+        UI elements block the thread they're activated from until they exit, so dispatching has to continue elsewhere. Called by ``listen`` and ``set_keymap``, which is what UI elements call when they're activated."""
+        with self.dispatcher_condition:
+            if self.dispatcher is not current_thread():
+                return
+            self.dispatcher = None
+            if not self.idle_workers:
+                self.start_worker()
+            self.dispatcher_condition.notify()
 
     def process_key(self, key):
+        keymap = self.keymap #Can be replaced by another thread in the meantime
         if key in self.nonmaskable_keymap:
             callback = self.nonmaskable_keymap[key]
-            self.handle_callback(callback, key)
-        elif key in self.keymap:
-            callback = self.keymap[key]
-            self.handle_callback(callback, key)
+        elif key in keymap:
+            callback = keymap[key]
         elif key in self.maskable_keymap:
             callback = self.maskable_keymap[key]
+        else:
+            if callable(self.streaming):
+                self.streaming(key)
+            return
+        if key in self.policies or key in self.nonmaskable_keymap:
+            self.run_callback(key, callback)
+        elif self.coalesce_keys and getattr(callback, "accepts_count", False) and current_thread() is self.dispatcher:
+            self.handle_callback(callback, key, 1+self.take_repeats(key))
+        else:
             self.handle_callback(callback, key)
-        elif callable(self.streaming):
-            self.streaming(key)
+
+    def take_repeats(self, key):
+        """Removes the copies of ``key`` waiting at the front of the queue, returns how many were removed. The first key that isn't a copy has to be taken out of the queue to be looked at, so it's kept in ``lookahead`` for the dispatcher to process next."""
+        count = 0
+        now = time()
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except Queue.Empty:
+                break
+            if item[0] != key or (self.drop_stale_keys and item[2] != self.keymap_version): #Stale keys will be dropped by the dispatcher
+                self.lookahead = item
+                break
+            self.latencies.append(now-item[1])
+            count += 1
+        self.coalesced_keys += count
+        return count
         
-    def handle_callback(self, callback, key):
+    def handle_callback(self, callback, key, count=1):
+        start = time()
         try:
-            callback()
+            if count == 1:
+                callback()
+            else:
+                callback(count)
         except Exception as e:
             self.handle_callback_exception(key, callback, e)
         finally: #this finally allows to get a pdb prompt while still being able to operate the interface
+            self.callback_durations.append(time()-start)
             return
 
+    def run_callback(self, key, callback):
+        """Runs a callback on a callback worker thread, according to the key's policy (see ``set_key_policy``)."""
+        with self.callback_lock:
+            state = self.key_states.setdefault(key, {"running":False, "pending":deque()})
+            if not state["running"]:
+                state["running"] = True
+                self.submit_callback(key, callback)
+                return
+            policy = self.policies.get(key, "serialise")
+            if policy == "drop":
+                self.dropped_callbacks += 1
+                return
+            if policy == "latest":
+                self.dropped_callbacks += len(state["pending"])
+                state["pending"].clear()
+            state["pending"].append(callback)
+
+    def submit_callback(self, key, callback):
+        """Queues a callback for the callback workers, starting a worker if none are idle and there are less than ``callback_workers``. Has to be called with ``callback_lock`` held."""
+        self.callback_queue.put((key, callback))
+        if not self.idle_callback_threads and len(self.callback_threads) < self.callback_workers:
+            thread = Thread(target = self.callback_worker, name="CallbackThread-"+str(len(self.callback_threads)))
+            thread.daemon = False
+            self.callback_threads.append(thread)
+            thread.start()
+
+    def callback_worker(self):
+        """Callback worker thread. Calls callbacks from ``callback_queue`` - once a callback finishes, queues the next one pending for the same key, if there's one."""
+        while True:
+            with self.callback_lock:
+                self.idle_callback_threads += 1
+            key, callback = self.callback_queue.get()
+            with self.callback_lock:
+                self.idle_callback_threads -= 1
+            if key is wake_key:
+                return
+            self.handle_callback(callback, key)
+            with self.callback_lock:
+                state = self.key_states[key]
+                if state["pending"]:
+                    self.submit_callback(key, state["pending"].popleft())
+                else:
+                    state["running"] = False
+
+    def start_priority_thread(self):
+        """Starts the thread calling nonmaskable callbacks, unless it's already running."""
+        if self.priority_thread is not None or self.shutdown_flag:
+            return
+        self.priority_thread = Thread(target = self.priority_worker, name="InputPriorityThread")
+        self.priority_thread.daemon = False
+        self.priority_thread.start()
+
+    def priority_worker(self):
+        """Dispatches nonmaskable callbacks to the callback workers as soon as their keys are received, so that they don't wait for the dispatcher thread. Callbacks aren't called from this thread, so a blocking one doesn't hold up the others."""
+        while True:
+            key, timestamp, _ = self.priority_queue.get()
+            if key is wake_key:
+                return
+            self.latencies.append(time()-timestamp)
+            self.process_key(key)
+
     def handle_callback_exception(self, key, callback, e):
         print("Exception caused by callback {} when key {} was received".format(callback, key))
         print("Exception: {}".format(e))
         #raise e
         import pdb;pdb.set_trace()
 
+    def get_latency_stats(self):
+        """Returns a dictionary with statistics (in milliseconds) of the time between a key being received from a driver and its callback being called, for the last ``latency_samples`` keys."""
+        return get_stats(self.latencies)
+
+    def get_callback_stats(self):
+        """Returns a dictionary with statistics (in milliseconds) of how long the last ``latency_samples`` callbacks took, as well as the number of keys waiting for the dispatcher thread (``queue_depth``), callbacks waiting for a callback worker (``callback_queue_depth``), callback worker threads busy, callbacks dropped because of key policies and keys merged with the keys before them (see ``coalesce_keys``)."""
+        stats = get_stats(self.callback_durations)
+        with self.callback_lock:
+            busy_threads = len(self.callback_threads) - self.idle_callback_threads
+        stats.update({"queue_depth":self.queue.qsize() + (self.lookahead is not None),
+                      "priority_queue_depth":self.priority_queue.qsize(),
+                      "callback_queue_depth":self.callback_queue.qsize(),
+                      "busy_callback_workers":busy_threads,
+                      "dropped_callbacks":self.dropped_callbacks,
+                      "coalesced_keys":self.coalesced_keys})
+        return stats
+
     def listen(self):
-        """Start event_loop in a thread. Nonblocking."""
+        """Enables the drivers and makes sure there's a thread dispatching keys, starting it if necessary. Nonblocking. If called from a callback, hands dispatching over to another thread (see ``handoff``)."""
         for driver, _ in self.drivers:
             driver.start()
-        self.listener_thread = Thread(target = self.event_loop, name="InputThread-"+str(self.thread_index), args=(self.thread_index, )) 
-        self.thread_index += 1
-        self.listener_thread.daemon = False
-        self.listener_thread.start()
+        with self.dispatcher_condition:
+            if self.dispatcher is current_thread():
+                self.handoff()
+            elif self.dispatcher is None and not self.idle_workers:
+                self.start_worker()
         return True
 
     def stop_listen(self):
-        """This sets a flag for ``event_loop`` to stop. It also calls a ``stop`` method of the input driver ``InputListener`` is using."""
-        if self.stop_flag is not None:
-            self.stop_flag.set()
+        """Calls a ``stop`` method of the input drivers ``InputListener`` is using, so that they stop sending keys. The dispatcher thread keeps running, and ``listen`` re-enables the drivers."""
         for driver, _ in self.drivers:
             driver.stop()
         return True
@@ -170,16 +384,42 @@ class InputListener():
         for driver, _ in self.drivers:
             if hasattr(driver, "atexit"):
                 driver.atexit()
-        try:
-            self.listener_thread.join()
-        except AttributeError:
-            pass
+        with self.dispatcher_condition:
+            self.shutdown_flag = True
+            self.dispatcher = None
+            self.dispatcher_condition.notify_all()
+        self.queue.put((wake_key, None, None))
+        if self.priority_thread:
+            self.priority_queue.put((wake_key, None, None))
+        with self.callback_lock:
+            callback_threads = list(self.callback_threads)
+            self.callback_workers = 0 #No new threads from now on
+        for thread in callback_threads:
+            self.callback_queue.put((wake_key, None))
+        for worker in self.workers + callback_threads + [self.priority_thread]:
+            if worker is not None and worker is not current_thread():
+                worker.join()
         
 
 
+def get_stats(samples):
+    """Returns a dictionary with count, mean, median, 99th percentile and maximum of a list of durations, in milliseconds."""
+    samples = sorted(samples)
+    if not samples:
+        return {"count":0}
+    percentile = lambda p: samples[min(len(samples)-1, int(len(samples)*p))]*1000
+    return {"count":len(samples),
+            "mean":sum(samples)*1000/len(samples),
+            "median":percentile(0.5),
+            "p99":percentile(0.99),
+            "max":samples[-1]*1000}
+
+
 def init():
     """ This function is called by main.py to read the input configuration, pick the corresponding drivers and initialize InputListener.
  
+    If there's a ``"key_engine"`` section in the configuration, a ``KeyEventEngine`` is created with arguments from it. Key coalescing can be disabled with ``"coalesce_keys":false``.
+
     It also sets ``listener`` globals of ``input`` module with driver and listener respectively, as well as registers ``listener.stop()`` function to be called when script exits since it's in a blocking non-daemon thread."""
     global listener
     config = read_config("config.json")
@@ -192,5 +432,6 @@ def init():
         kwargs = input_config["kwargs"] if "kwargs" in input_config else {}
         driver = driver_module.InputDevice(*args, **kwargs)
         drivers.append([driver, driver_name])
-    listener = InputListener(drivers)
+    key_engine = KeyEventEngine(**config["key_engine"]) if "key_engine" in config else None
+    listener = InputListener(drivers, key_engine=key_engine, coalesce_keys=config.get("coalesce_keys", True))
     atexit.register(listener.atexit)
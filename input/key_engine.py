@@ -0,0 +1,113 @@
+from threading import Thread, Condition
+from time import time
+
+class KeyEventEngine():
+    """Sits between input drivers and ``InputListener``, turning key presses and releases into key events that depend on timing:
+
+    * Tap - ``"KEY_X"``, sent on press, or on release if ``defer_tap`` is set for the key (so that it's not sent if the key is held).
+    * Hold - ``"KEY_X_HOLD"`` (or the key's ``hold_key``), sent once the key is held for ``hold_time``, then repeated while the key is held, each time a bit sooner, until ``min_repeat_interval``.
+    * Chord - ``"KEY_X+KEY_Y"``, sent when all the keys of a chord are pressed at once. Keys that are part of chords are sent on release, and only if they weren't part of a chord.
+    * Press and release - ``"KEY_X_PRESS"`` and ``"KEY_X_RELEASE"``, only sent for keys that have ``press_release`` set.
+
+    Holds are timed by a separate thread, which sleeps until the next hold event is due.
+
+    Per-key settings are passed as ``keys`` - a dictionary of ``{"KEY_X":{setting:value}}``. Available settings are ``hold`` (enables hold events), ``hold_key``, ``defer_tap``, ``press_release`` and all the timing arguments of the constructor, which are used as defaults for all the keys."""
+
+    default_keys = {"KEY_UP":{"hold":True}, "KEY_DOWN":{"hold":True}}
+
+    def __init__(self, keys=None, chords=[], hold_time=0.5, repeat_interval=0.2, min_repeat_interval=0.05, acceleration=0.8, threaded=True):
+        """Initialises the ``KeyEventEngine`` object and starts its thread.
+
+        Kwargs:
+
+            * ``keys``: per-key settings, see above. By default, hold events are enabled for ``KEY_UP`` and ``KEY_DOWN``.
+            * ``chords``: list of chords, each chord is a list of key names
+            * ``hold_time``: time (in seconds) a key needs to be held for the first hold event to be sent
+            * ``repeat_interval``: time between the first and the second hold event
+            * ``min_repeat_interval``: the shortest time between hold events
+            * ``acceleration``: after each hold event, time until the next one is multiplied by this
+            * ``threaded``: start the hold timer thread. If it's not started, hold events are only sent when ``send_holds`` is called.
+
+        """
+        self.defaults = {"hold":False, "hold_key":None, "defer_tap":False, "press_release":False,
+                         "hold_time":hold_time, "repeat_interval":repeat_interval,
+                         "min_repeat_interval":min_repeat_interval, "acceleration":acceleration}
+        self.keys = self.default_keys if keys is None else keys
+        self.chords = [list(chord) for chord in chords]
+        self.chord_keys = set([key for chord in self.chords for key in chord])
+        self.pressed = {} #{key:state of the keypress}
+        self.condition = Condition()
+        if threaded:
+            self.thread = Thread(target=self.hold_timer, name="Key event engine")
+            self.thread.daemon = True
+            self.thread.start()
+
+    def send_key(self, key):
+        """A hook to be overridden by ``InputListener``, same as ``InputSkeleton.send_key``."""
+        print(key)
+
+    def get_setting(self, key, name):
+        return self.keys.get(key, {}).get(name, self.defaults[name])
+
+    def key_state_changed(self, key, pressed, timestamp=None):
+        """Processes a key press (if ``pressed`` is True) or release. Called by input drivers."""
+        if timestamp is None:
+            timestamp = time()
+        with self.condition:
+            if pressed:
+                self.key_pressed(key, timestamp)
+            else:
+                self.key_released(key)
+
+    def key_pressed(self, key, timestamp):
+        if key in self.pressed:
+            return #Already pressed, driver must've missed the release
+        state = {"consumed":False, "deadline":None}
+        self.pressed[key] = state
+        if self.get_setting(key, "press_release"):
+            self.send_key(key+"_PRESS")
+        for chord in self.chords:
+            if key in chord and all([chord_key in self.pressed for chord_key in chord]):
+                for chord_key in chord:
+                    self.pressed[chord_key]["consumed"] = True
+                    self.pressed[chord_key]["deadline"] = None
+                self.send_key("+".join(chord))
+                return
+        if not self.get_setting(key, "defer_tap") and key not in self.chord_keys:
+            self.send_key(key)
+            state["consumed"] = True
+        if self.get_setting(key, "hold"):
+            state["deadline"] = timestamp + self.get_setting(key, "hold_time")
+            state["interval"] = self.get_setting(key, "repeat_interval")
+            self.condition.notify()
+
+    def key_released(self, key):
+        state = self.pressed.pop(key, None)
+        if state is None:
+            return
+        if not state["consumed"]:
+            self.send_key(key)
+        if self.get_setting(key, "press_release"):
+            self.send_key(key+"_RELEASE")
+
+    def hold_timer(self):
+        """Thread which sends hold events when they're due."""
+        with self.condition:
+            while True:
+                now = time()
+                deadline = self.send_holds(now)
+                if deadline is None:
+                    self.condition.wait()
+                else:
+                    self.condition.wait(deadline - now)
+
+    def send_holds(self, now):
+        """Sends the hold events that are due at ``now`` and returns the time the next one is due, or None if no keys are held. Has to be called with ``condition`` acquired."""
+        for key, state in self.pressed.items():
+            if state["deadline"] is not None and state["deadline"] <= now:
+                self.send_key(self.get_setting(key, "hold_key") or key+"_HOLD")
+                state["consumed"] = True
+                state["deadline"] = now + state["interval"]
+                state["interval"] = max(self.get_setting(key, "min_repeat_interval"), state["interval"]*self.get_setting(key, "acceleration"))
+        deadlines = [state["deadline"] for state in self.pressed.values() if state["deadline"] is not None]
+        return min(deadlines) if deadlines else None
@@ -22,6 +22,8 @@ try: #If there's an internal error, we show it on display and exit
     from input import input
     input.init()
     i = input.listener
+    if hasattr(o, "activate_backlight"): #Keypresses keep the backlight on, even if they don't change the displayed frame
+        i.add_activity_callback(o.activate_backlight)
 except:
     Printer(["Oops. :(", "y u make mistake"], None, o, 0) #Yeah, that's about all the debug data. 
     raise
@@ -0,0 +1,18 @@
+"""Fake hardware modules for running drivers without the hardware they expect.
+
+Every module here mirrors the interface of the library it replaces. ``install()`` puts them in ``sys.modules`` so that drivers importing the real libraries get the fakes instead - call it before importing the drivers."""
+
+import sys
+import types
+
+def install():
+    """Registers fake modules in ``sys.modules`` under the names of the libraries they replace."""
+    import i2c, gpio, serial_port, pifacecad, evdev
+    sys.modules["smbus"] = i2c
+    rpi = types.ModuleType("RPi")
+    rpi.GPIO = gpio
+    sys.modules["RPi"] = rpi
+    sys.modules["RPi.GPIO"] = gpio
+    sys.modules["serial"] = serial_port
+    sys.modules["pifacecad"] = pifacecad
+    sys.modules["evdev"] = evdev
@@ -0,0 +1,159 @@
+"""A fake ``evdev`` module. Every device is backed by a pipe, so drivers can wait for its events with ``select``/``epoll`` just like with real devices.
+
+Devices are created with ``add_device`` and unplugged with ``remove_device``. A device's fd is closed once it's unplugged and all the ``InputDevice`` objects opened for it are closed. Key events are generated by ``press``, ``release``, ``repeat`` and ``tap`` methods of the returned ``FakeDevice`` objects."""
+
+import os
+import errno
+import fcntl
+from time import time
+
+class ecodes():
+    """Event type and key codes, a subset of what ``evdev.ecodes`` has."""
+    EV_SYN = 0
+    EV_KEY = 1
+    EV_REL = 2
+    ecodes = {"KEY_ESC":1, "KEY_BACKSPACE":14, "KEY_TAB":15, "KEY_ENTER":28, "KEY_SPACE":57,
+              "KEY_HOME":102, "KEY_UP":103, "KEY_PAGEUP":104, "KEY_LEFT":105, "KEY_RIGHT":106,
+              "KEY_END":107, "KEY_DOWN":108, "KEY_PAGEDOWN":109, "KEY_DELETE":111,
+              "KEY_KPMINUS":74, "KEY_KPPLUS":78, "KEY_KPDOT":83, "KEY_KPENTER":96}
+    for i, name in enumerate("1234567890"):
+        ecodes["KEY_"+name] = 2+i
+    for row, first_code in (("QWERTYUIOP", 16), ("ASDFGHJKL", 30), ("ZXCVBNM", 44)):
+        for i, name in enumerate(row):
+            ecodes["KEY_"+name] = first_code+i
+    for i in range(10):
+        ecodes["KEY_F{}".format(i+1)] = 59+i
+    for name, code in (("7", 71), ("8", 72), ("9", 73), ("4", 75), ("5", 76), ("6", 77), ("1", 79), ("2", 80), ("3", 81), ("0", 82)):
+        ecodes["KEY_KP"+name] = code
+    keys = dict([(code, name) for name, code in ecodes.items()])
+    del i, name, row, first_code, code
+
+class InputEvent():
+    def __init__(self, type, code, value):
+        timestamp = time()
+        self.sec = int(timestamp)
+        self.usec = int((timestamp-self.sec)*1000000)
+        self.type = type
+        self.code = code
+        self.value = value
+
+class FakeDevice():
+    """State of a fake device, shared by all ``InputDevice`` objects opened for it."""
+
+    def __init__(self, name, path, capabilities):
+        self.name = name
+        self.path = path
+        self.capabilities = capabilities
+        self.read_fd, self.write_fd = os.pipe()
+        flags = fcntl.fcntl(self.read_fd, fcntl.F_GETFL)
+        fcntl.fcntl(self.read_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        self.events = []
+        self.removed = False
+        self.grabbed = False
+        self.open_count = 0 #Number of ``InputDevice`` objects opened for the device and not yet closed
+        self.times_opened = 0
+
+    def close_fds(self):
+        """Closes the read end of the pipe once the device is removed and nothing has it open anymore - like a real device node, it stays readable (and reports the removal) until then."""
+        if self.removed and self.open_count == 0 and self.read_fd is not None:
+            os.close(self.read_fd)
+            self.read_fd = None
+
+    def send_event(self, key, value):
+        """Queues a key event (followed by a sync event, as real devices do) and makes the device fd readable."""
+        self.events.append(InputEvent(ecodes.EV_KEY, ecodes.ecodes[key], value))
+        self.events.append(InputEvent(ecodes.EV_SYN, 0, 0))
+        os.write(self.write_fd, "\0")
+
+    def press(self, key):
+        self.send_event(key, 1)
+
+    def release(self, key):
+        self.send_event(key, 0)
+
+    def repeat(self, key):
+        self.send_event(key, 2)
+
+    def tap(self, key):
+        self.press(key)
+        self.release(key)
+
+devices = {} #{path:FakeDevice}
+
+def add_device(name, path=None, capabilities=None):
+    """Plugs in a fake device and returns its ``FakeDevice`` object. If ``path`` isn't given, picks the next free ``/dev/input/eventN`` path. ``capabilities`` is a ``{type:[codes]}`` dictionary, same as ``InputDevice.capabilities`` returns - by default, the device has all the keys ``ecodes`` knows about."""
+    if capabilities is None:
+        capabilities = {ecodes.EV_KEY:sorted(ecodes.keys.keys())}
+    if path is None:
+        number = 0
+        while "/dev/input/event{}".format(number) in devices:
+            number += 1
+        path = "/dev/input/event{}".format(number)
+    devices[path] = FakeDevice(name, path, capabilities)
+    return devices[path]
+
+def remove_device(path):
+    """Unplugs a fake device. Drivers reading from it get an ``ENODEV`` error, like with real devices."""
+    device = devices.pop(path)
+    device.removed = True
+    os.close(device.write_fd) #Makes the read end report a hangup
+    device.close_fds()
+
+def list_devices():
+    return sorted(devices.keys())
+
+class InputDevice():
+    """In-memory replacement for ``evdev.InputDevice``."""
+
+    def __init__(self, fn):
+        if fn not in devices:
+            raise OSError(errno.ENOENT, "No such device: {}".format(fn))
+        self.device = devices[fn]
+        self.fn = fn
+        self.name = self.device.name
+        self.closed = False
+        self.device.open_count += 1
+        self.device.times_opened += 1
+
+    def capabilities(self):
+        return self.device.capabilities
+
+    def fileno(self):
+        return self.device.read_fd
+
+    def read(self):
+        """Returns all the events queued. Raises ``IOError`` with ``EAGAIN`` if there are none, or with ``ENODEV`` if the device was removed."""
+        if self.device.removed:
+            raise IOError(errno.ENODEV, "No such device")
+        try:
+            os.read(self.device.read_fd, 4096)
+        except OSError as e:
+            if e.errno != errno.EAGAIN:
+                raise
+        if not self.device.events:
+            raise IOError(errno.EAGAIN, "Resource temporarily unavailable")
+        events = self.device.events
+        self.device.events = []
+        return iter(events)
+
+    def read_one(self):
+        if self.device.removed:
+            raise IOError(errno.ENODEV, "No such device")
+        if not self.device.events:
+            return None
+        return self.device.events.pop(0)
+
+    def grab(self):
+        if self.device.grabbed:
+            raise IOError(errno.EBUSY, "Device or resource busy")
+        self.device.grabbed = True
+
+    def ungrab(self):
+        self.device.grabbed = False
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.device.open_count -= 1
+        self.device.close_fds()
@@ -0,0 +1,111 @@
+"""A fake ``RPi.GPIO`` module. Keeps pin states in memory, counts ``output()`` calls and, if ``tracing`` is set, records a timestamped trace of all the pin changes."""
+
+from time import time
+
+BCM = 11
+BOARD = 10
+OUT = 0
+IN = 1
+HIGH = 1
+LOW = 0
+PUD_OFF = 20
+PUD_DOWN = 21
+PUD_UP = 22
+
+pins = {} #{pin:level}
+directions = {} #{pin:direction}
+calls = 0 #Number of output() calls so far
+writes = 0 #Number of pin levels written so far
+tracing = False
+trace = [] #List of (timestamp, pin, level) tuples, filled if ``tracing`` is set
+clock = time #Function used to get timestamps for the trace
+
+def reset_stats():
+    """Resets the call counters and the pin trace."""
+    global calls, writes, trace
+    calls = 0
+    writes = 0
+    trace = []
+
+def setmode(mode):
+    pass
+
+def setwarnings(flag):
+    pass
+
+def cleanup(*args):
+    pins.clear()
+    directions.clear()
+
+def setup(channel, direction, pull_up_down=PUD_OFF, initial=None):
+    for pin in _to_list(channel):
+        directions[pin] = direction
+        if direction == IN:
+            pins.setdefault(pin, HIGH if pull_up_down == PUD_UP else LOW)
+        else:
+            pins[pin] = initial if initial is not None else LOW
+
+def output(channel, value):
+    """Sets pin levels. Like the real library, accepts either a single pin or a list/tuple of pins, with either a single value or a list/tuple of values."""
+    global calls, writes
+    calls += 1
+    channels = _to_list(channel)
+    values = _to_list(value) if isinstance(value, (list, tuple)) else [value]*len(channels)
+    if len(values) != len(channels):
+        raise RuntimeError("Number of channels != number of values")
+    timestamp = clock() if tracing else None
+    for pin, level in zip(channels, values):
+        if directions.get(pin, None) != OUT:
+            raise RuntimeError("The GPIO channel has not been set up as an OUTPUT")
+        level = HIGH if level else LOW
+        writes += 1
+        if tracing and pins.get(pin, None) != level:
+            trace.append((timestamp, pin, level))
+        pins[pin] = level
+
+def input(channel):
+    return pins.get(channel, LOW)
+
+def set_input(channel, level):
+    """Sets the level that ``input()`` returns for the pin."""
+    pins[channel] = HIGH if level else LOW
+
+def pulses(pin):
+    """Returns a list of ``(rise_time, fall_time)`` tuples for all the high pulses of a pin recorded in the trace."""
+    result = []
+    rise_time = None
+    for timestamp, trace_pin, level in trace:
+        if trace_pin != pin:
+            continue
+        if level == HIGH:
+            rise_time = timestamp
+        elif rise_time is not None:
+            result.append((rise_time, timestamp))
+            rise_time = None
+    return result
+
+def _to_list(channel):
+    if isinstance(channel, (list, tuple)):
+        return list(channel)
+    return [channel]
+
+
+class PWM():
+    """Records duty cycle changes instead of generating PWM."""
+
+    def __init__(self, channel, frequency):
+        self.channel = channel
+        self.frequency = frequency
+        self.duty_cycle = None
+
+    def start(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+
+    def ChangeDutyCycle(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+
+    def ChangeFrequency(self, frequency):
+        self.frequency = frequency
+
+    def stop(self):
+        self.duty_cycle = None
@@ -0,0 +1,67 @@
+"""A fake GPIO chip character device, which can be passed to ``input/drivers/gpio_events.py`` as ``chip`` (and to drivers as ``gpio_chip``). Line event fds are pipes, so they work with ``poll()`` like real ones. Change line levels with ``set_value``."""
+
+import os
+from time import time
+
+RISING_EDGE = 1<<0
+FALLING_EDGE = 1<<1
+
+class FakeLineEvents():
+    def __init__(self, line, eventflags, value):
+        self.line = line
+        self.eventflags = eventflags
+        self.value = value
+        self.events = []
+        self.read_fd, self.write_fd = os.pipe()
+
+    def fileno(self):
+        return self.read_fd
+
+    def read_events(self):
+        os.read(self.read_fd, 4096)
+        events = self.events
+        self.events = []
+        return events
+
+    def get_value(self):
+        return self.value
+
+    def close(self):
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+class FakeGPIOChip():
+    """Simulates a GPIO chip. Lines are high (pulled up) unless set otherwise with ``set_value``.
+
+    Attributes:
+
+    * ``requests``: number of ``request_events`` calls
+    """
+
+    def __init__(self, path="/dev/gpiochip0"):
+        self.path = path
+        self.levels = {}
+        self.lines = {}
+        self.requests = 0
+
+    def request_events(self, line, eventflags=RISING_EDGE|FALLING_EDGE, handleflags=1, label="pyLCI"):
+        self.requests += 1
+        self.lines[line] = FakeLineEvents(line, eventflags, self.levels.get(line, 1))
+        return self.lines[line]
+
+    def set_value(self, line, value):
+        """Sets the line level, queueing an edge event if the level changes and the edge was requested."""
+        value = 1 if value else 0
+        previous = self.levels.get(line, 1)
+        self.levels[line] = value
+        if line not in self.lines or value == previous:
+            return
+        line_events = self.lines[line]
+        line_events.value = value
+        edge = RISING_EDGE if value else FALLING_EDGE
+        if line_events.eventflags & edge:
+            line_events.events.append((int(time()*1000000000), edge))
+            os.write(line_events.write_fd, "\0")
+
+    def close(self):
+        pass
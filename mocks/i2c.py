@@ -0,0 +1,70 @@
+"""A fake ``smbus`` module. ``SMBus`` objects keep the last written value of every register and count the transactions sent, so that bus usage of drivers can be measured."""
+
+class SMBus():
+    """In-memory replacement for ``smbus.SMBus``.
+
+    Attributes:
+
+    * ``transactions``: number of I2C transactions sent so far
+    * ``bytes``: number of bytes sent over the bus so far, counting address bytes
+    * ``log``: list of ``(method_name, addr, data)`` tuples for every transaction, only filled if ``logging`` is set
+    * ``registers``: dictionary of ``{addr:{reg:value}}`` with the last value written to each register. Values set here are returned by reads.
+    """
+
+    def __init__(self, bus=None, logging=False):
+        self.bus = bus
+        self.logging = logging
+        self.registers = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Resets transaction and byte counters, as well as the transaction log."""
+        self.transactions = 0
+        self.bytes = 0
+        self.log = []
+
+    def _count(self, method_name, addr, data):
+        self.transactions += 1
+        self.bytes += 1 + len(data) #Address byte is also sent
+        if self.logging:
+            self.log.append((method_name, addr, data))
+
+    def _set(self, addr, reg, value):
+        self.registers.setdefault(addr, {})[reg] = value
+
+    def _get(self, addr, reg):
+        return self.registers.get(addr, {}).get(reg, 0xff)
+
+    def set_input(self, addr, value, reg=None):
+        """Sets a value which will be returned when reading from the device (or its register, if ``reg`` is given)."""
+        self._set(addr, reg, value)
+
+    def write_quick(self, addr):
+        self._count("write_quick", addr, [])
+
+    def write_byte(self, addr, value):
+        self._count("write_byte", addr, [value])
+        self._set(addr, None, value)
+
+    def read_byte(self, addr):
+        self._count("read_byte", addr, [0])
+        return self._get(addr, None)
+
+    def write_byte_data(self, addr, reg, value):
+        self._count("write_byte_data", addr, [reg, value])
+        self._set(addr, reg, value)
+
+    def read_byte_data(self, addr, reg):
+        self._count("read_byte_data", addr, [reg, 0])
+        return self._get(addr, reg)
+
+    def write_i2c_block_data(self, addr, reg, data):
+        if len(data) > 32:
+            raise ValueError("SMBus block transfers are limited to 32 bytes")
+        self._count("write_i2c_block_data", addr, [reg]+list(data))
+        if data:
+            self._set(addr, reg, data[-1])
+
+    def read_i2c_block_data(self, addr, reg, length=32):
+        self._count("read_i2c_block_data", addr, [reg]+[0]*length)
+        return [self._get(addr, reg+i) for i in range(length)]
@@ -0,0 +1,49 @@
+"""A fake ``pifacecad`` module, implementing the parts of it that pyLCI drivers use."""
+
+class LCD():
+    """Stores the text written and counts the calls made. ``bytes`` counts characters written, ``transactions`` counts all the calls that send data to the display."""
+
+    def __init__(self):
+        self.text = ""
+        self.backlight = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.transactions = 0
+        self.bytes = 0
+        self.clears = 0
+
+    def write(self, text):
+        self.transactions += 1
+        self.bytes += len(text)
+        self.text += text
+
+    def clear(self):
+        self.transactions += 1
+        self.clears += 1
+        self.text = ""
+
+    def backlight_on(self):
+        self.transactions += 1
+        self.backlight = True
+
+    def backlight_off(self):
+        self.transactions += 1
+        self.backlight = False
+
+    def blink_off(self):
+        self.transactions += 1
+
+    def cursor_off(self):
+        self.transactions += 1
+
+
+class SwitchPort():
+    value = 0
+
+
+class PiFaceCAD():
+
+    def __init__(self):
+        self.lcd = LCD()
+        self.switch_port = SwitchPort()
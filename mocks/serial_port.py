@@ -0,0 +1,36 @@
+"""A fake ``serial`` module. ``Serial`` objects store the data written and count the writes."""
+
+class Serial():
+    """In-memory replacement for ``serial.Serial``.
+
+    Attributes:
+
+    * ``transactions``: number of ``write()`` calls so far
+    * ``bytes``: number of bytes written so far
+    * ``data``: all the data written so far, only filled if ``logging`` is set
+    """
+
+    def __init__(self, port=None, baudrate=9600, logging=False, **kwargs):
+        self.port = port
+        self.baudrate = baudrate
+        self.logging = logging
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Resets write counters and the data log."""
+        self.transactions = 0
+        self.bytes = 0
+        self.data = ""
+
+    def write(self, data):
+        self.transactions += 1
+        self.bytes += len(data)
+        if self.logging:
+            self.data += data
+        return len(data)
+
+    def read(self, size=1):
+        return ""
+
+    def close(self):
+        pass
@@ -0,0 +1,113 @@
+from threading import Thread, Condition, RLock
+from time import time, sleep
+import logging
+
+class AsyncScreen():
+    """Wraps a ``Screen`` object so that ``display_data`` calls don't block the caller (typically, the input thread) while the display is being updated.
+
+    Frames passed to ``display_data`` are written to the display by a separate thread. Only the newest frame is kept - if a new frame arrives before the previous one was written, the previous one is dropped. All the other ``Screen`` methods and attributes are available, and methods are called synchronously - after the pending frame is written, so that, for example, ``setCursor`` called after ``display_data`` still works as expected.
+
+    Every ``display_data`` call counts as display activity, even if the frame is dropped or coalesced - if the wrapped screen controls its backlight, ``activate_backlight`` is called right away, so that a UI element re-sending the same frame keeps the backlight on.
+
+    Attributes:
+
+    * ``screen``: the wrapped ``Screen`` object
+    * ``frames_received``: number of frames passed to ``display_data``
+    * ``frames_written``: number of frames actually written to the display
+    * ``frames_dropped``: number of frames replaced by a newer frame before they could be written
+    * ``frames_coalesced``: number of frames that were skipped because they were the same as the frame already pending or written
+    """
+
+    def __init__(self, screen, max_fps=None):
+        """Initialises the ``AsyncScreen`` object and starts the writer thread.
+
+        Args:
+
+            * ``screen``: ``Screen`` object to wrap
+
+        Kwargs:
+
+            * ``max_fps``: if set, frames won't be written to the display more often than that.
+
+        """
+        self.screen = screen
+        self.min_interval = 1.0/max_fps if max_fps else 0
+        self.condition = Condition()
+        self.write_lock = RLock()
+        self.pending = None
+        self.last_frame = None
+        self.last_write = 0
+        self.frames_received = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_coalesced = 0
+        self.activity_callback = getattr(screen, "activate_backlight", None)
+        self.thread = Thread(target=self.writer, name="Screen writer")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def display_data(self, *args):
+        """Queues a frame to be displayed and returns immediately. Takes the same arguments as ``Screen.display_data``."""
+        self.activate_backlight()
+        with self.condition:
+            self.frames_received += 1
+            previous = self.pending if self.pending is not None else self.last_frame
+            if args == previous:
+                self.frames_coalesced += 1
+                return
+            if self.pending is not None:
+                self.frames_dropped += 1
+            self.pending = args
+            self.condition.notify()
+
+    def activate_backlight(self):
+        """Marks the wrapped screen as active (turning its backlight on) without waiting for the pending frame to be written. Does nothing if the screen doesn't control its backlight."""
+        if self.activity_callback is not None:
+            self.activity_callback()
+
+    def writer(self):
+        """Writer thread loop. Waits for new frames and writes them to the display, keeping the FPS limit if it's set."""
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+            if self.min_interval:
+                time_left = self.last_write + self.min_interval - time()
+                if time_left > 0:
+                    sleep(time_left) #Frames received in the meantime will replace the pending one
+            try:
+                self.flush()
+            except Exception as e:
+                logging.exception("Screen writer: exception while writing a frame: {}".format(e))
+
+    def flush(self):
+        """Writes the pending frame to the display, if there is one."""
+        with self.write_lock:
+            with self.condition:
+                frame = self.pending
+                self.pending = None
+            if frame is None:
+                return
+            self.screen.display_data(*frame)
+            self.last_frame = frame
+            self.last_write = time()
+            self.frames_written += 1
+
+    def get_stats(self):
+        """Returns a dictionary with frame counters, useful for tuning ``max_fps``."""
+        return {"received":self.frames_received,
+                "written":self.frames_written,
+                "dropped":self.frames_dropped,
+                "coalesced":self.frames_coalesced}
+
+    def __getattr__(self, name):
+        attr = getattr(self.screen, name)
+        if not callable(attr):
+            return attr
+        def wrapper(*args, **kwargs):
+            with self.write_lock:
+                self.flush()
+                result = attr(*args, **kwargs)
+                self.last_frame = None #Display contents might have changed, so next frame can't be skipped
+                return result
+        return wrapper
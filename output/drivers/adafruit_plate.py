@@ -1,4 +1,4 @@
-import smbus
+from helpers.i2c_bus import get_client
 from time import sleep
 
 def delay(time):
@@ -19,6 +19,10 @@ class Screen(HD44780, BacklightManager):
 
     type = ["char", "rgb_led"]
 
+    #Each byte takes 6 I2C transactions of 3 bytes each at 100KHz
+    command_cost = 1750
+    char_cost = 1750
+
     def __init__(self, bus=1, addr=0x20, debug=False, chinese=True, **kwargs):
         """Initialises the ``Screen`` object.  
                                                                                
@@ -31,7 +35,7 @@ class Screen(HD44780, BacklightManager):
 
         """
         self.bus_num = bus
-        self.bus = smbus.SMBus(self.bus_num)
+        self.bus = get_client(self.bus_num, "adafruit_plate output")
         if type(addr) in [str, unicode]:
             addr = int(addr, 16)
         self.addr = addr
@@ -40,13 +44,31 @@ class Screen(HD44780, BacklightManager):
         self.i2c_init()
         BacklightManager.init_backlight(self, **kwargs)
         HD44780.__init__(self, debug=self.debug, **kwargs)
+
+    @activate_backlight_wrapper
+    def display_data(self, *args):
+        """Displays data on display, turning the backlight on. Holds the I2C bus while the frame is sent. Takes the same arguments as ``HD44780.display_data``."""
+        with self.bus.batch():
+            HD44780.display_data(self, *args)
+
+    @activate_backlight_wrapper
+    def setCursor(self, row, col):
+        """Moves the cursor, turning the backlight on - moving the cursor is display activity, too, even if no new frame is sent."""
+        HD44780.setCursor(self, row, col)
+
+    @activate_backlight_wrapper
+    def cursor(self):
+        HD44780.cursor(self)
+
+    @activate_backlight_wrapper
+    def noCursor(self):
+        HD44780.noCursor(self)
         
     def i2c_init(self):
         """Inits the MCP23017 expander."""
         self.setMCPreg(0x00, 0x00)
         self.setMCPreg(0x01, 0x00)
 
-    @activate_backlight_wrapper
     def write_byte(self, byte, char_mode=False):
         """Takes a byte and sends the high nibble, then the low nibble (as per HD44780 doc). Passes ``char_mode`` to ``self.write4bits``."""
         if self.debug and not char_mode:        
@@ -1,15 +1,17 @@
-from threading import Thread, Event
-from time import sleep
-from datetime import datetime
+from threading import Timer, Lock
+from time import time
+from functools import wraps
 
 def activate_backlight_wrapper(func):
+    """A wrapper for ``display_data`` and cursor methods. Turns the backlight on and marks the display as active once per call."""
+    @wraps(func)
     def wrapper(self, *args, **kwargs):
-        self.enable_backlight()
-        self._backlight_active.set()
+        self.activate_backlight()
         return func(self, *args, **kwargs)
     return wrapper
 
 def enable_backlight_wrapper(func):
+    @wraps(func)
     def wrapper(self, *args, **kwargs):
         if self._backlight_enabled == False:
             self._backlight_enabled = True
@@ -18,6 +20,7 @@ def enable_backlight_wrapper(func):
     return wrapper
 
 def disable_backlight_wrapper(func):
+    @wraps(func)
     def wrapper(self, *args, **kwargs):
         if self._backlight_enabled == True:
             self._backlight_enabled = False
@@ -26,43 +29,97 @@ def disable_backlight_wrapper(func):
     return wrapper
 
 class BacklightManager():
-    _last_active = datetime.now()
+    """A mixin for drivers that can control the display backlight. Turns the backlight off after ``backlight_interval`` seconds without new frames being displayed - optionally, dimming it in stages beforehand. Cursor updates count as activity, too, and so do keypresses - ``main.py`` passes ``activate_backlight`` to the ``InputListener`` as an activity callback.
+
+    There's no polling - a timer is armed when the display becomes active, and when it fires, it checks whether there was activity in the meantime and re-arms itself if there was. So, it fires about once per ``backlight_interval`` while the display is in use, and not at all when the backlight is off."""
     _backlight_enabled = False
-    _backlight_active = Event()
 
-    def init_backlight(self, backlight_active_level=True, backlight_pin = None, backlight_interval = None, **kwargs):
+    def init_backlight(self, backlight_active_level=True, backlight_pin = None, backlight_interval = None, backlight_dim_stages = None, backlight_pwm_frequency = 200, **kwargs):
+        """Sets up backlight control.
+
+        Kwargs:
+
+            * ``backlight_active_level``: GPIO level that turns the backlight on.
+            * ``backlight_pin``: GPIO pin (BCM numbering) controlling the backlight. If not set, it's up to the driver to control the backlight.
+            * ``backlight_interval``: time (in seconds) after the last frame after which backlight is turned off. If not set, backlight stays on.
+            * ``backlight_dim_stages``: list of ``[time, brightness]`` pairs - after ``time`` seconds of inactivity, backlight is dimmed to ``brightness`` percent, for example, ``[[10, 50], [20, 10]]``. Needs ``backlight_pin``, since dimming is done with PWM.
+            * ``backlight_pwm_frequency``: PWM frequency used for dimming.
+        """
         self._backlight_active_level = backlight_active_level
         self._backlight_pin = backlight_pin
+        self._backlight_interval = backlight_interval
+        self._backlight_lock = Lock()
+        self._backlight_timer = None
+        self._backlight_pwm = None
+        self._last_active = 0
         if self._backlight_pin:
             import RPi.GPIO as GPIO
             self._bl_gpio = GPIO
             self._bl_gpio.setmode(self._bl_gpio.BCM)
             self._bl_gpio.setwarnings(False)
             self._bl_gpio.setup(self._backlight_pin, self._bl_gpio.OUT)
-        self._backlight_interval = backlight_interval
+            if backlight_dim_stages:
+                self._backlight_pwm = self._bl_gpio.PWM(self._backlight_pin, backlight_pwm_frequency)
+                self._backlight_pwm.start(self.get_duty_cycle(0))
+        #Stages the backlight goes through while the display is inactive - [time, brightness], brightness of None means "off"
+        self._backlight_stages = []
         if self._backlight_interval:
-            self.start_backlight_thread()
+            if self._backlight_pwm:
+                self._backlight_stages = sorted([list(stage) for stage in backlight_dim_stages if stage[0] < self._backlight_interval])
+            self._backlight_stages.append([self._backlight_interval, None])
+        self._backlight_stage = 0 #Number of stages already applied
+        self.activate_backlight()
+
+    def activate_backlight(self):
+        """Marks the display as active, turning the backlight on (or back to full brightness) and starting the inactivity timer if it's not running."""
+        with self._backlight_lock:
+            self._last_active = time()
+            if self._backlight_stage and self._backlight_enabled: #Dimmed
+                self.dim_backlight(100)
+            self._backlight_stage = 0
+            self.enable_backlight()
+            if self._backlight_stages and self._backlight_timer is None:
+                self.arm_backlight_timer(self._backlight_stages[0][0])
+
+    def arm_backlight_timer(self, timeout):
+        self._backlight_timer = Timer(timeout, self.backlight_timeout)
+        self._backlight_timer.daemon = True
+        self._backlight_timer.start()
+
+    def backlight_timeout(self):
+        """Called by the inactivity timer. Applies the stages whose time has come, then re-arms the timer for the next stage, if there's one left."""
+        with self._backlight_lock:
+            self._backlight_timer = None
+            idle_time = time() - self._last_active
+            while self._backlight_stage < len(self._backlight_stages):
+                stage_time, brightness = self._backlight_stages[self._backlight_stage]
+                if idle_time < stage_time: #There was activity since the timer was armed
+                    self.arm_backlight_timer(stage_time - idle_time)
+                    return
+                self._backlight_stage += 1
+                if brightness is None:
+                    self.disable_backlight()
+                else:
+                    self.dim_backlight(brightness)
+
+    def get_duty_cycle(self, brightness):
+        return brightness if self._backlight_active_level else 100 - brightness
+
+    def dim_backlight(self, brightness):
+        """Sets backlight brightness (in percent). Only works if dimming is set up, otherwise does nothing."""
+        if self._backlight_pwm:
+            self._backlight_pwm.ChangeDutyCycle(self.get_duty_cycle(brightness))
 
     @enable_backlight_wrapper
     def enable_backlight(self):
-        if self._backlight_pin:
+        if self._backlight_pwm:
+            self.dim_backlight(100)
+        elif self._backlight_pin:
             self._bl_gpio.output(self._backlight_pin, self._backlight_active_level)
 
     @disable_backlight_wrapper
     def disable_backlight(self):
-        if self._backlight_pin:
+        if self._backlight_pwm:
+            self.dim_backlight(0)
+        elif self._backlight_pin:
             self._bl_gpio.output(self._backlight_pin, not self._backlight_active_level)
-
-    def start_backlight_thread(self):
-        self.bl_thread = Thread(target=self.backlight_manager, name="Screen backlight manager")
-        self.bl_thread.daemon = True
-        self.bl_thread.start()
-
-    def backlight_manager(self):
-        while True:
-            if self._backlight_active.isSet():
-                self._backlight_active.clear()
-                self._last_active = datetime.now()
-            elif (datetime.now() - self._last_active).total_seconds() >self._backlight_interval and self._backlight_enabled:
-                self.disable_backlight()
-            sleep(float(self._backlight_interval)/2) #Doesn't need to be done much often unless you need your backlight to be super precise. /2 is minimum though. 1 cycle to clear the flag and 1 cycle to disable backlight
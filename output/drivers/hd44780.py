@@ -8,6 +8,9 @@
 #
 
 from time import sleep
+from threading import RLock
+from functools import wraps
+from collections import OrderedDict
 
 def delayMicroseconds(microseconds):
     seconds = microseconds / float(1000000)  # divide microseconds by 1 million for seconds
@@ -17,6 +20,14 @@ def delay(milliseconds):
     seconds = milliseconds / float(1000)  # divide microseconds by 1 million for seconds
     sleep(seconds)
 
+def locked(func):
+    """A wrapper for methods sending data to the display. Holds the display lock while the method is executing, so that data sent from different threads doesn't get mixed up."""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self.display_lock:
+            return func(self, *args, **kwargs)
+    return wrapper
+
 
 class HD44780():
     """An object that provides high-level functions for interaction with display. It contains all the high-level logic and exposes an interface for system and applications to use."""
@@ -69,13 +80,20 @@ class HD44780():
     displaycontrol = 0x0c
     displaymode = 0x07
 
-    busy_flag = False
     buffer = " "
+    clear_on_redraw = False
+
+    cgram_slots = 8 #Number of custom characters the display can store
+
+    #Cost model used by display_data to choose between partial updates and full redraws.
+    #Costs are estimated times (in microseconds) it takes to send things to the display, drivers are expected to override them.
+    command_cost = 100 #Sending a command byte, such as "set cursor"
+    char_cost = 100 #Sending a character byte
+    clear_cost = 3000 #Clearing the display, including the delay after the command
 
-    redraw_coefficient = 0.5
     type = ["char"] #Variable for future compatibility with graphical displays
 
-    def __init__(self, cols = 16, rows=2, do_init = True, debug = False, buffering = True, **kwargs):
+    def __init__(self, cols = 16, rows=2, do_init = True, debug = False, buffering = True, clear_on_redraw = False, **kwargs):
         """ Sets variables for high-level functions.
         
         Kwargs:
@@ -83,11 +101,15 @@ class HD44780():
            * ``rows`` (default=2): rows of the connected display
            * ``cols`` (default=16): columns of the connected display
            * ``debug`` (default=False): debug mode which prints out the commands sent to display
+           * ``clear_on_redraw`` (default=False): clear the display before redrawing it completely. Otherwise, rows are overwritten in place, which avoids flicker and a 3ms delay.
            * ``**kwargs``: all the other arguments, get passed further to HD44780.init_display() function"""
+        self.display_lock = RLock()
         self.cols = cols
         self.rows = rows
         self.debug = debug
+        self.clear_on_redraw = clear_on_redraw
         self.buffering = buffering
+        self.glyphs = OrderedDict() #Custom characters loaded by load_glyph() - {bitmap:slot}, least recently used first
         if self.buffering: #Init the buffer
             self.buffer = [" "*self.cols for i in range(self.rows)]
         if do_init:
@@ -116,8 +138,9 @@ class HD44780():
         self.clear()
         self.display()
 
+    @locked
     def display_data(self, *args):
-        """Displays data on display. This function checks if the display contents can be redrawn faster by buffering them and checking the output, then either changes characters one-by-one or redraws the screen completely.
+        """Displays data on display. This function checks if the display contents can be redrawn faster by buffering them and checking the output, then either sends the changed parts of the screen or redraws the screen completely, whichever is estimated to be faster.
         
         ``*args`` is a list of strings, where each string corresponds to a row of the display, starting with 0."""
         #Formatting the args list to simplify the processing
@@ -127,60 +150,89 @@ class HD44780():
         if len(args) < self.rows: #Pad with empty strings if it's not yet padded
             for i in range(self.rows-len(args)): 
                 args.append(" "*self.cols)
-        diffs = [[] for i in range(self.rows)]
-        for i, string in enumerate(args):
-            for j, char in enumerate(string):
-                if self.buffer[i][j] != char:
-                    diffs[i].append(j)
-        if float(sum([len(diff) for diff in diffs]))/(self.rows*self.cols) > self.redraw_coefficient:
+        runs = self.get_changed_runs(args)
+        if runs and self.get_runs_cost(runs) >= self.get_redraw_cost():
             self._display_data(*args) #Redrawing the display
-            self.buffer = args
         else:
-            for row_num, row_diffs in enumerate(diffs):
-                for i, char_cpos in enumerate(row_diffs):
-                    self.setCursor(row_num, char_cpos)
-                    self.write_byte(ord(args[row_num][char_cpos]), char_mode=True)
-            self.buffer = args
-
+            for row_num, start, end in runs:
+                #Display's address counter increments after each character, so one "set cursor" command is enough for the whole run
+                HD44780.setCursor(self, row_num, start) #Drivers can wrap setCursor to count it as display activity, while this is a part of the frame that already counted
+                self.println(args[row_num][start:end])
+        self.buffer = args
+
+    def get_changed_runs(self, rows):
+        """Compares ``rows`` with the contents of display buffer and returns a list of ``[row, start, end]`` runs of characters that need to be sent to the display.
+        Runs separated by unchanged characters are merged if re-sending those characters is estimated to be faster than sending another "set cursor" command."""
+        max_gap = self.command_cost/self.char_cost if self.char_cost else self.cols
+        runs = []
+        for row_num, row in enumerate(rows):
+            buffer_row = self.buffer[row_num]
+            run = None
+            for col, char in enumerate(row):
+                if buffer_row[col] != char:
+                    if run is not None and col - run[2] <= max_gap:
+                        run[2] = col+1 #Extending the current run, unchanged characters in between will be re-sent
+                    else:
+                        run = [row_num, col, col+1]
+                        runs.append(run)
+        return runs
+
+    def get_runs_cost(self, runs):
+        """Estimates the time it takes to send the runs returned by ``get_changed_runs``."""
+        return sum([self.command_cost + (end-start)*self.char_cost for _, start, end in runs])
+
+    def get_redraw_cost(self):
+        """Estimates the time it takes to redraw the whole display."""
+        cost = self.rows*(self.command_cost + self.cols*self.char_cost)
+        if self.clear_on_redraw:
+            cost += self.command_cost + self.clear_cost
+        return cost
+
+    @locked
     def _display_data(self, *args):
-        """Displays data on display. This function does the actual work of printing things to display.
+        """Displays data on display. This function does the actual work of printing things to display. Rows are overwritten in place, unless ``clear_on_redraw`` is set, in which case the display is cleared beforehand.
         
         ``*args`` is a list of strings, where each string corresponds to a row of the display, starting with 0."""
-        while self.busy_flag:
-            sleep(0.01)
-        self.busy_flag = True
-        self.clear()
-        args = args[:self.rows]
-        for line, arg in enumerate(args):
-            self.setCursor(line, 0)
+        if self.clear_on_redraw:
+            self.clear()
+        for line in range(self.rows):
+            arg = args[line] if line < len(args) else ""
+            HD44780.setCursor(self, line, 0) #Bypassing driver wrappers, same as in display_data
             self.println(arg[:self.cols].ljust(self.cols))
-        self.busy_flag = False
 
+    @locked
     def println(self, line):
         """Prints a line on the screen (assumes position is set as intended)"""
         for char in line:
             self.write_byte(ord(char), char_mode=True)     
 
+    @locked
     def home(self):
         """Returns cursor to home position. If the display is being scrolled, reverts scrolled data to initial position.."""
         self.write_byte(self.LCD_RETURNHOME)  # set cursor position to zero
         delayMicroseconds(3000)  # this command takes a long time!
 
+    @locked
     def clear(self):
         """Clears the display."""
         self.write_byte(self.LCD_CLEARDISPLAY)  # command to clear display
         delayMicroseconds(3000)  # 3000 microsecond sleep, clearing the display takes a long time
 
+    @locked
     def setCursor(self, row, col):
         """ Set current input cursor to ``row`` and ``column`` specified """
         self.write_byte(self.LCD_SETDDRAMADDR | (col + self.row_offsets[row]))
 
+    @locked
     def createChar(self, char_num, char_contents):
         """Stores a character in the LCD memory so that it can be used later.
         char_num has to be between 0 and 7 (including)
         char_contents is a list of 8 bytes (only 5 LSBs are used)"""
-        if type(char_num) != int or not char_num in range(8):
+        if type(char_num) != int or not char_num in range(self.cgram_slots):
             raise ValueError("Invalid char_num!")
+        for bitmap, slot in self.glyphs.items():
+            if slot == char_num: #Slot is overwritten, glyph manager needs to forget about the glyph that was there
+                del self.glyphs[bitmap]
         self.write_byte(self.LCD_SETCGRAMADDR | (char_num << 3))
         try:
             for i in range(8):
@@ -188,61 +240,107 @@ class HD44780():
         except IndexError:
             raise ValueError("Invalid char_contents!")
         finally:
-            self.setCursor(0, 0)
-
+            HD44780.setCursor(self, 0, 0)
+
+    @locked
+    def load_glyph(self, bitmap):
+        """Makes sure a custom character is stored in the LCD memory and returns a character that can be used in strings passed to ``display_data`` to display it.
+        ``bitmap`` is a list of 8 bytes (only 5 LSBs are used), same as for ``createChar``.
+
+        Glyphs that are already stored aren't sent to the display again, so it's fine to call this function every time a frame is rendered. If all the slots are taken, the least recently used glyph is replaced, preferring glyphs that aren't currently on the screen (see ``evict_glyph``). Therefore, a single frame can't use more than 8 different glyphs."""
+        bitmap = tuple(bitmap)
+        if bitmap in self.glyphs:
+            slot = self.glyphs.pop(bitmap)
+            self.glyphs[bitmap] = slot #Moving it to the end, marking it as the most recently used
+            return chr(slot)
+        used_slots = self.glyphs.values()
+        free_slots = [slot for slot in range(self.cgram_slots) if slot not in used_slots]
+        if free_slots:
+            slot = free_slots[0]
+        else:
+            slot = self.evict_glyph()
+        self.createChar(slot, bitmap)
+        self.glyphs[bitmap] = slot
+        return chr(slot)
+
+    def evict_glyph(self):
+        """Removes the least recently used glyph from the glyph manager, preferring glyphs that aren't currently on the screen, and returns the freed slot.
+        Changes to CGRAM are immediately visible on the screen, so, if all the glyphs are on the screen, the cells showing the evicted glyph will show the new one once it's loaded - there's nothing to restore them with."""
+        on_screen = set()
+        for row in self.buffer:
+            on_screen.update(row)
+        candidates = [(bitmap, slot) for bitmap, slot in self.glyphs.items() if chr(slot) not in on_screen]
+        if not candidates:
+            candidates = self.glyphs.items()
+        bitmap, slot = candidates[0]
+        del self.glyphs[bitmap]
+        return slot
+
+    @locked
     def noDisplay(self):
         """ Turn the display off (quickly) """
         self.displaycontrol &= ~self.LCD_DISPLAYON
         self.write_byte(self.LCD_DISPLAYCONTROL | self.displaycontrol)
 
+    @locked
     def display(self):
         """ Turn the display on (quickly) """
         self.displaycontrol |= self.LCD_DISPLAYON
         self.write_byte(self.LCD_DISPLAYCONTROL | self.displaycontrol)
 
+    @locked
     def noCursor(self):
         """ Turns the underline cursor off """
         self.displaycontrol &= ~self.LCD_CURSORON
         self.write_byte(self.LCD_DISPLAYCONTROL | self.displaycontrol)
 
+    @locked
     def cursor(self):
         """ Turns the underline cursor on """
         self.displaycontrol |= self.LCD_CURSORON
         self.write_byte(self.LCD_DISPLAYCONTROL | self.displaycontrol)
 
+    @locked
     def noBlink(self):
         """ Turn the blinking cursor off """
         self.displaycontrol &= ~self.LCD_BLINKON
         self.write_byte(self.LCD_DISPLAYCONTROL | self.displaycontrol)
 
+    @locked
     def blink(self):
         """ Turn the blinking cursor on """
         self.displaycontrol |= self.LCD_BLINKON
         self.write_byte(self.LCD_DISPLAYCONTROL | self.displaycontrol)
 
+    @locked
     def scrollDisplayLeft(self):
         """ These commands scroll the display without changing the RAM """
         self.write_byte(self.LCD_CURSORSHIFT | self.LCD_DISPLAYMOVE | self.LCD_MOVELEFT)
 
+    @locked
     def scrollDisplayRight(self):
         """ These commands scroll the display without changing the RAM """
         self.write_byte(self.LCD_CURSORSHIFT | self.LCD_DISPLAYMOVE | self.LCD_MOVERIGHT)
 
+    @locked
     def leftToRight(self):
         """ This is for text that flows Left to Right """
         self.displaymode |= self.LCD_ENTRYLEFT
         self.write_byte(self.LCD_ENTRYMODESET | self.displaymode)
 
+    @locked
     def rightToLeft(self):
         """ This is for text that flows Right to Left """
         self.displaymode &= ~self.LCD_ENTRYLEFT
         self.write_byte(self.LCD_ENTRYMODESET | self.displaymode)
 
+    @locked
     def autoscroll(self):
         """ This will 'right justify' text from the cursor """
         self.displaymode |= self.LCD_ENTRYSHIFTINCREMENT
         self.write_byte(self.LCD_ENTRYMODESET | self.displaymode)
 
+    @locked
     def noAutoscroll(self):
         """ This will 'left justify' text from the cursor """
         self.displaymode &= ~self.LCD_ENTRYSHIFTINCREMENT
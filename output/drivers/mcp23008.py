@@ -1,4 +1,4 @@
-import smbus
+from helpers.i2c_bus import get_client
 from time import sleep
 
 def delay(time):
@@ -7,11 +7,15 @@ def delay(time):
 def delayMicroseconds(time):
     sleep(time/1000000.0)
 
-from hd44780 import HD44780
+from hd44780 import HD44780, locked
 
 class Screen(HD44780):
     """A driver for MCP23008-based I2C LCD backpacks. The one tested had "WIDE.HK" written on it."""
 
+    #Each byte takes 6 I2C transactions and a 1ms delay after each nibble
+    command_cost = 4000
+    char_cost = 4000
+
     def __init__(self, bus=1, addr=0x27, debug=False, **kwargs):
         """Initialises the ``Screen`` object.  
                                                                                
@@ -24,7 +28,7 @@ class Screen(HD44780):
 
         """
         self.bus_num = bus
-        self.bus = smbus.SMBus(self.bus_num)
+        self.bus = get_client(self.bus_num, "mcp23008 output")
         if type(addr) in [str, unicode]:
             addr = int(addr, 16)
         self.addr = addr
@@ -32,6 +36,12 @@ class Screen(HD44780):
         self.i2c_init()
         HD44780.__init__(self, debug=self.debug, **kwargs)
         
+    @locked
+    def display_data(self, *args):
+        """Displays data on display, holding the I2C bus while the frame is sent. Takes the same arguments as ``HD44780.display_data``."""
+        with self.bus.batch():
+            HD44780.display_data(self, *args)
+
     def i2c_init(self):
         """Inits the MCP23017 IC for desired operation."""
         self.setMCPreg(0x05, 0x0c)
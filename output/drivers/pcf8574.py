@@ -1,7 +1,7 @@
-import smbus
+from helpers.i2c_bus import get_client
 from time import sleep
 
-from hd44780 import HD44780
+from hd44780 import HD44780, locked
 
 def delay(time):
     sleep(time/1000.0)
@@ -20,7 +20,14 @@ class Screen(HD44780):
 
     data_mask = 0x00
 
-    def __init__(self, bus=1, addr=0x27, debug=False, **kwargs):
+    #Each byte takes 6 I2C transactions of 3 bytes each at 100KHz
+    command_cost = 1750
+    char_cost = 1750
+
+    block_size = 32 #SMBus block transfers can't be longer than that
+    write_buffer = None
+
+    def __init__(self, bus=1, addr=0x27, debug=False, block_writes=False, **kwargs):
         """Initialises the ``Screen`` object.  
                                                                                
         Kwargs:                                                                  
@@ -28,11 +35,16 @@ class Screen(HD44780):
             * ``bus``: I2C bus number.
             * ``addr``: I2C address of the board.
             * ``debug``: enables printing out LCD commands.
+            * ``block_writes``: if set, the expander states for a whole ``display_data`` call are collected and sent using I2C block transfers, taking one transaction per 32 expander writes instead of one transaction per each.
             * ``**kwargs``: all the other arguments, get passed further to HD44780 constructor
 
         """
+        self.block_writes = block_writes
+        if self.block_writes:
+            #Each byte takes 6 bytes of a block transfer
+            self.command_cost = self.char_cost = 550
         self.bus_num = bus
-        self.bus = smbus.SMBus(self.bus_num)
+        self.bus = get_client(self.bus_num, "pcf8574 output")
         if type(addr) in [str, unicode]:
             addr = int(addr, 16)
         self.addr = addr
@@ -45,6 +57,39 @@ class Screen(HD44780):
         
     def disable_backlight(self):
         self.data_mask = self.data_mask& ~self.backlight_mask
+
+    @locked
+    def display_data(self, *args):
+        """Displays data on display, holding the I2C bus while the frame is sent. If ``block_writes`` is set, all the expander writes are buffered and sent after the new screen contents are processed. Otherwise, works the same way as ``HD44780.display_data``."""
+        with self.bus.batch():
+            if not self.block_writes:
+                return HD44780.display_data(self, *args)
+            self.write_buffer = []
+            try:
+                HD44780.display_data(self, *args)
+            finally:
+                self.flush()
+                self.write_buffer = None
+
+    def flush(self):
+        """Sends the buffered expander writes to the PCF8574 using I2C block transfers. Each block transfer latches all of its bytes on the expander outputs one by one, in the same order."""
+        if not self.write_buffer:
+            return
+        data = self.write_buffer
+        self.write_buffer = []
+        for i in range(0, len(data), self.block_size+1):
+            block = data[i:i+self.block_size+1]
+            if len(block) == 1: #Not worth a block transfer, sending it the same way unbuffered writes are sent
+                self.bus.write_byte_data(self.addr, 0, block[0])
+            else:
+                self.bus.write_i2c_block_data(self.addr, block[0], block[1:])
+
+    @locked
+    def clear(self):
+        """Clears the display. Buffered writes are sent to the display first, so that the delay after the clear command actually happens after the command is sent."""
+        self.write_byte(self.LCD_CLEARDISPLAY)
+        self.flush()
+        delayMicroseconds(3000)
        
     def write_byte(self, data, char_mode = False):
         """Takes a byte and sends the high nibble, then the low nibble (as per HD44780 doc). Passes ``char_mode`` to ``self.write4bits``."""
@@ -63,8 +108,11 @@ class Screen(HD44780):
         self.expanderWrite(value)        
 
     def expanderWrite(self, data):
-        """Sends data to PCF8574."""
-        self.bus.write_byte_data(self.addr, 0, data|self.data_mask)
+        """Sends data to PCF8574, or puts it in the write buffer if buffering is active."""
+        if self.write_buffer is not None:
+            self.write_buffer.append((data|self.data_mask) & 0xFF)
+        else:
+            self.bus.write_byte_data(self.addr, 0, data|self.data_mask)
        
 
 if __name__ == "__main__":
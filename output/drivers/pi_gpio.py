@@ -7,12 +7,18 @@
 # Adafruit - https://github.com/adafruit/Adafruit-Raspberry-Pi-Python-Code
 #
 
-from time import sleep
+from time import sleep, time
 
 def delayMicroseconds(microseconds):
     seconds = microseconds / float(1000000)  # divide microseconds by 1 million for seconds
     sleep(seconds)
 
+def busy_wait(microseconds):
+    """Waits for the given time without giving up the CPU. sleep() can't wait for less than 60-100 microseconds, this can. All the driver's busy-waiting goes through this function, so that it can be replaced (for example, by the output benchmark's model clock)."""
+    end = time() + microseconds / float(1000000)
+    while time() < end:
+        pass
+
 try:
     import RPi.GPIO as GPIO
 except:
@@ -24,7 +30,14 @@ from hd44780 import HD44780
 class Screen(HD44780):
     """Driver for using HD44780 displays connected to Raspberry Pi GPIO. Presumes the R/W line is tied to ground. Also, doesn't yet control backlight. """
 
-    def __init__(self, pins = [], rs_pin = None, en_pin = None, debug = False, **kwargs):
+    #Each byte takes 6 sleep() calls, each of them taking way longer than asked
+    command_cost = 500
+    char_cost = 500
+
+    enable_pulse_time = 1 #Microseconds, has to be > 450ns
+    execution_time = 50 #Microseconds, commands need > 37us to execute
+
+    def __init__(self, pins = [], rs_pin = None, en_pin = None, debug = False, fast_io = True, **kwargs):
         """ Initializes the GPIO-driven HD44780 display
 
         All GPIOs passed as arguments will be used with BCM mapping.        
@@ -34,10 +47,12 @@ class Screen(HD44780):
            * ``en_pin``: EN pin GPIO number. Please, make sure it's pulled down to GND (10K is OK). Otherwise, block might start filling up the screen unexpectedly.
            * ``rs_pin``: RS pin GPIO number,
            * ``debug``: enables printing out LCD commands.
+           * ``fast_io``: sets RS and data pins with a single ``GPIO.output()`` call using a precomputed table of pin states, and uses busy-waiting for delays instead of ``sleep()``. Needs RPi.GPIO 0.5.8 or newer, set to False to use the old (about 5 times slower) method.
            * ``**kwargs``: all the other arguments, get passed further to HD44780 constructor
 
         """
         self.debug = debug
+        self.fast_io = fast_io
         self.rs_pin = rs_pin
         self.en_pin = en_pin
         self.pins = pins
@@ -48,12 +63,23 @@ class Screen(HD44780):
         GPIO.setup(self.rs_pin, GPIO.OUT)
         for pin in self.pins:
             GPIO.setup(pin, GPIO.OUT)
+        if self.fast_io:
+            self.output_pins = [self.rs_pin] + list(self.pins)
+            #States of output_pins for every nibble, for both command and character mode
+            self.nibble_table = [[tuple([char_mode] + [(nibble >> bit) & 1 for bit in range(4)]) for nibble in range(16)] for char_mode in (0, 1)]
+            #Each byte takes 6 GPIO.output() calls and the command execution delay
+            self.command_cost = self.char_cost = 80
         HD44780.__init__(self, debug = self.debug, **kwargs)
         
     def write_byte(self, byte, char_mode=False):
         """Takes a byte and sends the high nibble, then the low nibble (as per HD44780 doc). Passes ``char_mode`` to ``self.write4bits``."""
         if self.debug and not char_mode:        
             print(hex(byte))                    
+        if self.fast_io:
+            self.write4bits_fast(byte >> 4, char_mode)
+            self.write4bits_fast(byte & 0x0F, char_mode)
+            busy_wait(self.execution_time)
+            return
         self.write4bits(byte >> 4, char_mode)   
         self.write4bits(byte & 0x0F, char_mode) 
 
@@ -70,6 +96,14 @@ class Screen(HD44780):
         GPIO.output(self.en_pin, False)
         delayMicroseconds(1)       # commands need > 37us to settle
 
+    def write4bits_fast(self, bits, char_mode=False):
+        """Writes a nibble to the display, setting RS and data pins at once using the pin state table. Doesn't wait for the command to execute, that's done by ``write_byte``."""
+        GPIO.output(self.output_pins, self.nibble_table[bool(char_mode)][bits & 0x0F])
+        GPIO.output(self.en_pin, True)
+        busy_wait(self.enable_pulse_time)
+        GPIO.output(self.en_pin, False)
+        busy_wait(self.enable_pulse_time) #Enable cycle has to be > 1000ns
+
 
 if __name__ == "__main__":
     screen = Screen(pins=[25, 24, 23, 18], rs_pin = 22, en_pin=27)
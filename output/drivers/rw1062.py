@@ -1,4 +1,4 @@
-import smbus
+from helpers.i2c_bus import get_client
 from time import sleep
 
 def delay(time):
@@ -17,6 +17,10 @@ class Screen(HD44780, BacklightManager):
        Tested on hardware compatible with Adafruit schematic and working with Adafruit libraries, but not on genuine Adafruit hardware. Thus, you may have issues with backlight, as that's the 'gray area'.
     """
 
+    #Commands take an I2C transaction each, while characters printed with println() are sent in one block transfer
+    command_cost = 300
+    char_cost = 90
+
     def __init__(self, bus=1, addr=0x20, debug=False, **kwargs):
         """Initialises the ``Screen`` object.  
                                                                                
@@ -29,13 +33,32 @@ class Screen(HD44780, BacklightManager):
 
         """
         self.bus_num = bus
-        self.bus = smbus.SMBus(self.bus_num)
+        self.bus = get_client(self.bus_num, "rw1062 output")
         if type(addr) in [str, unicode]:
             addr = int(addr, 16)
         self.addr = addr
         self.debug = debug
         BacklightManager.init_backlight(self, **kwargs)
         HD44780.__init__(self, debug=self.debug, **kwargs)
+
+    @activate_backlight_wrapper
+    def display_data(self, *args):
+        """Displays data on display, turning the backlight on. Holds the I2C bus while the frame is sent. Takes the same arguments as ``HD44780.display_data``."""
+        with self.bus.batch():
+            HD44780.display_data(self, *args)
+
+    @activate_backlight_wrapper
+    def setCursor(self, row, col):
+        """Moves the cursor, turning the backlight on - moving the cursor is display activity, too, even if no new frame is sent."""
+        HD44780.setCursor(self, row, col)
+
+    @activate_backlight_wrapper
+    def cursor(self):
+        HD44780.cursor(self)
+
+    @activate_backlight_wrapper
+    def noCursor(self):
+        HD44780.noCursor(self)
         
     def init_display(self, **kwargs):
         self.bus.write_byte_data(self.addr, 0x00, 0x30)
@@ -67,7 +90,6 @@ class Screen(HD44780, BacklightManager):
     def println(self, line):
         self.bus.write_i2c_block_data(self.addr, 0x40, [ord(char) for char in line])
 
-    @activate_backlight_wrapper
     def write_byte(self, data, char_mode=False):
 	if char_mode:
             self.bus.write_byte_data(self.addr, 0x40, data)
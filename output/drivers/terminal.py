@@ -0,0 +1,188 @@
+import os
+import sys
+import errno
+import fcntl
+import tty
+from hd44780 import HD44780, locked
+
+class Screen(HD44780):
+    """A driver that shows the display contents in a terminal (or a pseudo-terminal) instead of a real LCD, for running pyLCI without the hardware.
+
+    It emulates a HD44780 controller - bytes that other drivers would send to the display are interpreted and turned into ANSI escape sequences, so all the ``HD44780`` code (including only sending the changed characters) works the same way as with the real display.
+
+    Attributes:
+
+    * ``frames``: number of ``display_data`` calls
+    * ``bytes``: number of bytes "sent to the display controller", which is what the real drivers would have to send over the wire
+    * ``output_bytes``: number of bytes written to the terminal
+    * ``dropped_bytes``: number of bytes not written because nobody is reading from the pty
+    * ``grid``: list of rows with characters currently shown
+    * ``pty_name``: name of the pty slave device to read from, if ``pty`` is set
+    """
+
+    #Nothing to wait for, so everything is cheap
+    command_cost = 1
+    char_cost = 1
+    clear_cost = 1
+
+    custom_char = "#" #Custom characters can't be shown in a terminal, this is shown instead
+
+    def __init__(self, path=None, pty=False, **kwargs):
+        """Initialises the ``Screen`` object.
+
+        Kwargs:
+
+           * ``path``: a file to write the output to, such as ``/dev/pts/3`` (an open terminal window - run ``tty`` in it to get its name). If neither ``path`` nor ``pty`` are set, the output goes to stdout.
+           * ``pty``: if True, creates a pseudo-terminal and writes the output to it. Its name is printed and stored in ``pty_name`` - run ``cat`` on it in a terminal window to see the output. Output is dropped while nobody reads from it.
+           * ``**kwargs``: all the other arguments, get passed further to HD44780 constructor
+
+        """
+        self.pty_name = None
+        if pty:
+            self.fd, slave_fd = os.openpty()
+            self.pty_name = os.ttyname(slave_fd)
+            tty.setraw(slave_fd) #Otherwise, readers only get complete lines
+            flags = fcntl.fcntl(self.fd, fcntl.F_GETFL)
+            fcntl.fcntl(self.fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+            print("Terminal output: {}".format(self.pty_name))
+        elif path:
+            self.fd = os.open(path, os.O_WRONLY | os.O_NOCTTY)
+        else:
+            self.fd = sys.stdout.fileno()
+        self.reset_stats()
+        self.address = 0
+        self.cgram_mode = False
+        self.cgram = [0]*64
+        self.in_frame = False
+        self.output = []
+        self.terminal_position = None
+        self.grid = None
+        HD44780.__init__(self, **kwargs)
+        if self.grid is None: #Not cleared during initialisation
+            self.grid = [[" "]*self.cols for i in range(self.rows)]
+
+    @locked
+    def display_data(self, *args):
+        """Displays data on the terminal, sending it in one write. Takes the same arguments as ``HD44780.display_data``."""
+        self.frames += 1
+        self.in_frame = True
+        try:
+            HD44780.display_data(self, *args)
+        finally:
+            self.in_frame = False
+            self.flush()
+
+    @locked
+    def home(self):
+        """Returns cursor to home position. Unlike the real display, doesn't need a delay afterwards."""
+        self.write_byte(self.LCD_RETURNHOME)
+
+    @locked
+    def clear(self):
+        """Clears the display. Unlike the real display, doesn't need a delay afterwards."""
+        self.write_byte(self.LCD_CLEARDISPLAY)
+
+    def write_byte(self, byte, char_mode=False):
+        """Interprets a byte the way HD44780 controller would and writes the resulting escape sequences or characters to the terminal."""
+        self.bytes += 1
+        if char_mode:
+            self.write_char(byte)
+        elif byte & self.LCD_SETDDRAMADDR:
+            self.cgram_mode = False
+            self.move_to(byte & 0x7F)
+        elif byte & self.LCD_SETCGRAMADDR:
+            self.cgram_mode = True
+            self.address = byte & 0x3F
+        elif byte & (self.LCD_FUNCTIONSET | self.LCD_CURSORSHIFT):
+            pass #Not emulated, pyLCI doesn't change these after initialisation
+        elif byte & self.LCD_DISPLAYCONTROL:
+            if byte & self.LCD_DISPLAYON and byte & (self.LCD_CURSORON | self.LCD_BLINKON):
+                self.output.append("\x1b[?25h")
+            else:
+                self.output.append("\x1b[?25l")
+        elif byte & self.LCD_ENTRYMODESET:
+            pass #Not emulated either
+        elif byte & self.LCD_RETURNHOME:
+            self.cgram_mode = False
+            self.move_to(0)
+        elif byte & self.LCD_CLEARDISPLAY:
+            self.cgram_mode = False
+            self.grid = [[" "]*self.cols for i in range(self.rows)]
+            self.output.append("\x1b[2J")
+            self.terminal_position = None
+            self.move_to(0)
+        if not self.in_frame:
+            self.flush()
+
+    def write_char(self, byte):
+        """Writes a character to the emulated display memory and to the terminal, then increments the address counter like the controller does."""
+        if self.cgram_mode:
+            self.cgram[self.address] = byte
+            self.address = (self.address + 1) & 0x3F
+            return
+        position = self.get_position(self.address)
+        if position:
+            row, col = position
+            char = self.custom_char if byte < self.cgram_slots else chr(byte)
+            self.grid[row][col] = char
+            self.sync_cursor()
+            self.output.append(char)
+            self.terminal_position = (row, col+1) #Terminal cursor moves to the next cell by itself
+        self.move_to((self.address + 1) & 0x7F)
+
+    def move_to(self, address):
+        """Sets the address counter. The terminal cursor is moved to the corresponding cell only when it's needed, by ``sync_cursor``."""
+        self.address = address
+
+    def sync_cursor(self):
+        """Moves the terminal cursor to the cell the address counter points to, unless it's already there or the cell isn't on the screen."""
+        if self.cgram_mode:
+            return
+        position = self.get_position(self.address)
+        if position and position != self.terminal_position:
+            row, col = position
+            self.output.append("\x1b[{};{}H".format(row+1, col+1))
+            self.terminal_position = position
+
+    def get_position(self, address):
+        """Returns the ``(row, col)`` of the cell at a display memory address, or None if that address isn't shown on the screen."""
+        for row, offset in enumerate(self.row_offsets[:self.rows]):
+            if offset <= address < offset + self.cols:
+                return row, address - offset
+        return None
+
+    def flush(self):
+        """Writes the output accumulated so far to the terminal."""
+        self.sync_cursor()
+        data = "".join(self.output)
+        self.output = []
+        if not data:
+            return
+        try:
+            self.output_bytes += os.write(self.fd, data)
+        except OSError as e:
+            if e.errno != errno.EAGAIN:
+                raise
+            self.dropped_bytes += len(data)
+
+    def reset_stats(self):
+        """Resets frame and byte counters."""
+        self.frames = 0
+        self.bytes = 0
+        self.output_bytes = 0
+        self.dropped_bytes = 0
+
+    def get_stats(self):
+        """Returns a dictionary with frame and byte counters."""
+        return {"frames":self.frames,
+                "bytes":self.bytes,
+                "output_bytes":self.output_bytes,
+                "dropped_bytes":self.dropped_bytes}
+
+
+if __name__ == "__main__":
+    screen = Screen(cols=20, rows=4)
+    line = "01234567890123456789"
+    screen.display_data(line, line[::-1], "Hello", "world")
+    screen.display_data(line, line[::-1], "Hello", "pyLCI")
+    print("\n"*4+str(screen.get_stats()))
@@ -0,0 +1,76 @@
+from async_screen import AsyncScreen
+
+class MultiScreen():
+    """Drives several ``Screen`` objects at once, showing the same contents on all of them.
+
+    Every screen is wrapped in an ``AsyncScreen`` (unless it already is one), so each of them is written to from its own thread and keeps its own diff buffer - a slow display doesn't hold back the fast ones, or the caller.
+
+    ``display_data`` is sent to all screens. All the other methods are called on every screen that has them, and the first of these screens' return value is returned. Other attributes are taken from the first screen that has them.
+
+    ``load_glyph`` loads the glyph on every screen that supports custom characters. Screens can store the same glyph in different slots, so the character returned is the first screen's one, and ``display_data`` translates it for each of the other screens.
+
+    Attributes:
+
+    * ``screens``: list of wrapped ``Screen`` objects
+    * ``rows``, ``cols``: geometry reported to the UI, see ``geometry`` argument of the constructor
+    """
+
+    def __init__(self, screens, geometry="min"):
+        """Initialises the ``MultiScreen`` object.
+
+        Args:
+
+            * ``screens``: list of ``Screen`` objects
+
+        Kwargs:
+
+            * ``geometry``: ``"min"`` (default) to report the smallest row and column count of all screens, so that the UI fits on every screen, or ``"max"`` to report the biggest ones - then, each screen shows as much of the contents as it fits.
+
+        """
+        if not screens:
+            raise ValueError("MultiScreen needs at least one screen")
+        if geometry not in ["min", "max"]:
+            raise ValueError("Unknown geometry: {}".format(geometry))
+        self.screens = [screen if isinstance(screen, AsyncScreen) else AsyncScreen(screen) for screen in screens]
+        pick = min if geometry == "min" else max
+        self.rows = pick([screen.rows for screen in self.screens])
+        self.cols = pick([screen.cols for screen in self.screens])
+        self.glyph_maps = [{} for screen in self.screens] #{returned character:screen's character} for each screen, filled by load_glyph()
+
+    def display_data(self, *args):
+        """Sends data to all the screens, cutting it to fit each one of them. Takes the same arguments as ``Screen.display_data``."""
+        for screen, glyph_map in zip(self.screens, self.glyph_maps):
+            lines = [line[:screen.cols] for line in args[:screen.rows]]
+            if glyph_map:
+                lines = ["".join([glyph_map.get(char, char) for char in line]) for line in lines]
+            screen.display_data(*lines)
+
+    def load_glyph(self, bitmap):
+        """Loads a custom character on every screen that supports them and returns a character that can be used in strings passed to ``display_data`` to display it. Takes the same arguments as ``HD44780.load_glyph``. Screens that don't support custom characters get the returned character as-is."""
+        screens = [(screen, glyph_map) for screen, glyph_map in zip(self.screens, self.glyph_maps) if hasattr(screen, "load_glyph")]
+        if not screens:
+            raise AttributeError("None of the screens support custom characters")
+        results = [(screen.load_glyph(bitmap), glyph_map) for screen, glyph_map in screens]
+        char = results[0][0]
+        for screen_char, glyph_map in results:
+            if screen_char == char:
+                glyph_map.pop(char, None)
+            else:
+                glyph_map[char] = screen_char
+        return char
+
+    def get_stats(self):
+        """Returns a list of ``AsyncScreen`` frame counters, one for each screen."""
+        return [screen.get_stats() for screen in self.screens]
+
+    def __getattr__(self, name):
+        screens = [screen for screen in self.screens if hasattr(screen, name)]
+        if not screens:
+            raise AttributeError("None of the screens have a {} attribute".format(name))
+        attr = getattr(screens[0], name)
+        if not callable(attr):
+            return attr
+        def wrapper(*args, **kwargs):
+            results = [getattr(screen, name)(*args, **kwargs) for screen in screens]
+            return results[0]
+        return wrapper
@@ -1,4 +1,6 @@
 from helpers import read_config
+from async_screen import AsyncScreen
+from multi_screen import MultiScreen
 import importlib
 
 screen = None
@@ -6,12 +8,26 @@ screen = None
 def init():
     """ This function is called by main.py to read the output configuration, pick the corresponding drivers and initialize a Screen object.
 
+    If ``"async"`` is set in the output configuration, the ``Screen`` object is wrapped in an ``AsyncScreen``, which writes frames to the display from a separate thread. ``"max_fps"`` can be used to limit the rate at which frames are written.
+
+    If there's more than one entry in the output configuration, a ``Screen`` object is created for each of them and they're combined in a ``MultiScreen``, which shows the same contents on all of them. ``"output_geometry"`` config option (``"min"`` or ``"max"``) sets how the row and column counts reported to the UI are picked.
+
     It also sets ``screen`` global of ``output`` module with created ``Screen`` object."""
     global screen
     config = read_config("config.json")
-    output_config = config["output"][0]
+    screens = [init_screen(output_config) for output_config in config["output"]]
+    if len(screens) == 1:
+        screen = screens[0]
+    else:
+        screen = MultiScreen(screens, geometry=config.get("output_geometry", "min"))
+
+def init_screen(output_config):
+    """Creates a ``Screen`` object from an entry of the output configuration."""
     driver_name = output_config["driver"]
     driver_module = importlib.import_module("output.drivers."+driver_name)
     args = output_config["args"] if "args" in output_config else []
     kwargs = output_config["kwargs"] if "kwargs" in output_config else {}
     screen = driver_module.Screen(*args, **kwargs)
+    if output_config.get("async", False):
+        screen = AsyncScreen(screen, max_fps=output_config.get("max_fps", None))
+    return screen
@@ -0,0 +1,48 @@
+"""Tests for ``AsyncScreen``, using a fake screen that records what's written to it."""
+
+import unittest
+
+from output.async_screen import AsyncScreen
+
+class PlainScreen():
+    rows = 2
+    cols = 16
+
+    def __init__(self):
+        self.frames = []
+
+    def display_data(self, *args):
+        self.frames.append(args)
+
+
+class FakeScreen(PlainScreen):
+    activations = 0
+
+    def activate_backlight(self):
+        self.activations += 1
+
+
+class ActivityTest(unittest.TestCase):
+
+    def test_coalesced_frames_count_as_activity(self):
+        screen = FakeScreen()
+        async_screen = AsyncScreen(screen)
+        async_screen.display_data("a", "b")
+        async_screen.flush()
+        for _ in range(3):
+            async_screen.display_data("a", "b")
+        async_screen.flush()
+        self.assertEqual(async_screen.frames_coalesced, 3)
+        self.assertEqual(len(screen.frames), 1)
+        self.assertEqual(screen.activations, 4)
+
+    def test_screen_without_backlight(self):
+        screen = PlainScreen()
+        async_screen = AsyncScreen(screen)
+        async_screen.display_data("a", "b")
+        async_screen.flush()
+        self.assertEqual(screen.frames, [("a", "b")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Tests for ``BacklightManager`` activity tracking, using the ``rw1062`` driver on the fake ``smbus`` from ``mocks``."""
+
+import unittest
+
+import mocks
+mocks.install()
+
+from output.drivers import rw1062, hd44780
+from input.input import InputListener
+
+def no_sleep(seconds):
+    pass
+
+rw1062.sleep = hd44780.sleep = no_sleep
+
+class ActivityTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = rw1062.Screen(bus=1, addr=0x3c, backlight_interval=60)
+        self.screen._backlight_timer.cancel()
+        self.screen.disable_backlight()
+        self.screen._last_active = 0
+
+    def tearDown(self):
+        if self.screen._backlight_timer:
+            self.screen._backlight_timer.cancel()
+
+    def assertActive(self):
+        self.assertTrue(self.screen._backlight_enabled)
+        self.assertNotEqual(self.screen._last_active, 0)
+
+    def test_cursor_updates(self):
+        self.screen.setCursor(1, 3)
+        self.assertActive()
+        self.screen.disable_backlight()
+        self.screen.cursor()
+        self.assertTrue(self.screen._backlight_enabled)
+
+    def test_one_activation_per_frame(self):
+        activations = []
+        activate_backlight = self.screen.activate_backlight
+        def counting_activate_backlight():
+            activations.append(True)
+            activate_backlight()
+        self.screen.activate_backlight = counting_activate_backlight
+        self.screen.display_data("A"*16, "B"*16) #Full redraw, a "set cursor" command for each row
+        self.assertEqual(len(activations), 1)
+        self.screen.display_data("a"+"A"*14+"a", "B"*7+"b"+"B"*8) #Three separate runs
+        self.assertEqual(len(activations), 2)
+        self.screen.setCursor(0, 0)
+        self.assertEqual(len(activations), 3)
+
+    def test_keypresses(self):
+        listener = InputListener([])
+        listener.add_activity_callback(self.screen.activate_backlight)
+        listener.receive_key("KEY_DOWN")
+        self.assertActive()
+        self.assertEqual(listener.queue.qsize(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""Tests for ``ButtonStates``, feeding it synthetic bouncy waveforms read every millisecond."""
+
+import unittest
+
+from input.drivers.button_states import ButtonStates, get_set_bits
+
+def level_at(edges, timestamp):
+    """Returns the level of a waveform, given as a list of ``(time, level)`` edges, at ``timestamp``."""
+    return ([0] + [level for edge_time, level in edges if edge_time <= timestamp])[-1]
+
+def sample(states, edges, duration=0.3, bit=0):
+    """Reads a single-button waveform every millisecond, like a polling driver would. Returns a list of ``(ms, pressed)`` events."""
+    events = []
+    for ms in range(int(duration*1000)):
+        timestamp = ms/1000.0
+        events += [(ms, pressed) for _, pressed in states.update(level_at(edges, timestamp) << bit, timestamp)]
+    return events
+
+clean_press = [(0.01, 1), (0.2, 0)]
+bouncy_press = [(0.01, 1), (0.0115, 0), (0.0125, 1), (0.0135, 0), (0.0145, 1), (0.2, 0)]
+bouncy_release = [(0.01, 1), (0.2, 0), (0.2015, 1), (0.2025, 0), (0.2035, 1), (0.2045, 0)]
+noise_spike = [(0.1, 1), (0.1005, 0)]
+short_press = [(0.01, 1), (0.013, 0)]
+
+class SetBitsTest(unittest.TestCase):
+
+    def test_get_set_bits(self):
+        self.assertEqual(get_set_bits(0), [])
+        self.assertEqual(get_set_bits(0b10100001), [0, 5, 7])
+        self.assertEqual(get_set_bits(0x8001), [0, 15])
+        self.assertEqual(get_set_bits(1<<20 | 1<<3), [3, 20])
+
+
+class NoDebounceTest(unittest.TestCase):
+
+    def test_bounces_pass_through(self):
+        states = ButtonStates(width=1, debounce_time=0)
+        events = sample(states, bouncy_press)
+        self.assertEqual(events, [(10, True), (12, False), (13, True), (14, False), (15, True), (200, False)])
+
+
+class LockoutTest(unittest.TestCase):
+
+    def test_clean_press(self):
+        states = ButtonStates(width=1, debounce_time=0.01)
+        self.assertEqual(sample(states, clean_press), [(10, True), (200, False)])
+
+    def test_bouncy_press(self):
+        #First edge gets through at once, bounces during the lockout are ignored
+        states = ButtonStates(width=1, debounce_time=0.01)
+        self.assertEqual(sample(states, bouncy_press), [(10, True), (200, False)])
+
+    def test_bouncy_release(self):
+        states = ButtonStates(width=1, debounce_time=0.01)
+        self.assertEqual(sample(states, bouncy_release), [(10, True), (200, False)])
+
+    def test_press_shorter_than_lockout(self):
+        #Release happens during the lockout, and is accepted as soon as the lockout ends
+        states = ButtonStates(width=1, debounce_time=0.01)
+        self.assertEqual(sample(states, short_press), [(10, True), (20, False)])
+
+    def test_deadline(self):
+        states = ButtonStates(width=1, debounce_time=0.01)
+        self.assertEqual(states.update(1, 1.0), [(0, True)])
+        self.assertEqual(states.get_deadline(), None) #Nothing ignored, so nothing to wait for
+        self.assertEqual(states.update(0, 1.002), [])
+        self.assertEqual(states.get_deadline(), 1.01)
+        #An interrupt-driven driver gets no more edges, and calls update() at the deadline with the last read
+        self.assertEqual(states.update(states.data, 1.01), [(0, False)])
+        self.assertEqual(states.get_deadline(), None)
+
+    def test_deadline_cleared_by_bounce_back(self):
+        states = ButtonStates(width=1, debounce_time=0.01)
+        states.update(1, 1.0)
+        states.update(0, 1.002)
+        states.update(1, 1.003) #Bounced back to the accepted state, nothing's pending
+        self.assertEqual(states.get_deadline(), None)
+
+    def test_buttons_locked_out_separately(self):
+        states = ButtonStates(width=2, debounce_time=0.01)
+        self.assertEqual(states.update(0b01, 1.0), [(0, True)])
+        self.assertEqual(states.update(0b11, 1.001), [(1, True)])
+        self.assertEqual(states.update(0b10, 1.002), []) #Button 0 is still locked out
+        self.assertEqual(states.get_deadline(), 1.01)
+        self.assertEqual(states.update(0b10, 1.01), [(0, False)])
+
+
+class IntegratorTest(unittest.TestCase):
+
+    def test_clean_press_latency(self):
+        #A change is accepted on the third read in a row
+        states = ButtonStates(width=1, debounce_time=0, debounce_samples=3)
+        self.assertEqual(sample(states, clean_press), [(12, True), (202, False)])
+
+    def test_bouncy_press(self):
+        states = ButtonStates(width=1, debounce_time=0, debounce_samples=3)
+        self.assertEqual(sample(states, bouncy_press), [(17, True), (202, False)]) #Three reads after the last bounce
+
+    def test_noise_spike(self):
+        #A spike shorter than a read interval is seen once at most, and isn't accepted
+        states = ButtonStates(width=1, debounce_time=0, debounce_samples=3)
+        self.assertEqual(sample(states, noise_spike), [])
+        states = ButtonStates(width=1, debounce_time=0, debounce_samples=3)
+        self.assertEqual(sample(states, [(0.1, 1), (0.102, 0)]), [])
+
+    def test_counter_reset(self):
+        states = ButtonStates(width=1, debounce_time=0, debounce_samples=3)
+        self.assertEqual(states.update(1, 1.0), [])
+        self.assertEqual(states.update(1, 1.001), [])
+        self.assertEqual(states.update(0, 1.002), []) #Back to the debounced state, counter starts over
+        self.assertEqual(states.update(1, 1.003), [])
+        self.assertEqual(states.update(1, 1.004), [])
+        self.assertEqual(states.update(1, 1.005), [(0, True)])
+
+    def test_combined_with_lockout(self):
+        states = ButtonStates(width=1, debounce_time=0.01, debounce_samples=2)
+        self.assertEqual(sample(states, bouncy_release), [(11, True), (201, False)])
+
+
+class StateTest(unittest.TestCase):
+
+    def test_initial_state_and_width(self):
+        states = ButtonStates(width=4, debounce_time=0, state=0b0110)
+        self.assertEqual(states.update(0b0110), [])
+        self.assertEqual(sorted(states.update(0b11111001)), [(0, True), (1, False), (2, False), (3, True)]) #Bits over the width are ignored
+        self.assertEqual(states.state, 0b1001)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for the ``HD44780`` glyph manager, using the ``pcf8574`` driver on the fake ``smbus`` from ``mocks``."""
+
+import unittest
+
+import mocks
+mocks.install()
+
+from output.drivers import pcf8574, hd44780
+
+def no_sleep(seconds):
+    pass
+
+pcf8574.sleep = hd44780.sleep = no_sleep
+
+def glyph(number):
+    """Returns a distinct 8-byte bitmap for each ``number``."""
+    return [number & 0x1F]*8
+
+class GlyphManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = pcf8574.Screen(bus=1, addr=0x27)
+        self.screen.display_data("", "")
+        self.uploads = []
+        create_char = self.screen.createChar
+        def recording_create_char(slot, bitmap):
+            self.uploads.append(slot)
+            create_char(slot, bitmap)
+        self.screen.createChar = recording_create_char
+
+    def fill_slots(self):
+        return [self.screen.load_glyph(glyph(i)) for i in range(8)]
+
+    def test_resident_hit_not_uploaded(self):
+        char = self.screen.load_glyph(glyph(1))
+        self.assertEqual(self.uploads, [0])
+        self.screen.bus.reset_stats()
+        self.assertEqual(self.screen.load_glyph(glyph(1)), char)
+        self.assertEqual(self.uploads, [0])
+        self.assertEqual(self.screen.bus.transactions, 0)
+
+    def test_lru_eviction(self):
+        chars = self.fill_slots()
+        self.assertEqual(self.uploads, range(8))
+        self.screen.load_glyph(glyph(0)) #Slot 0 is now the most recently used, slot 1 the least
+        self.assertEqual(self.screen.load_glyph(glyph(8)), chars[1])
+        self.assertEqual(self.screen.load_glyph(glyph(9)), chars[2])
+        self.assertEqual(self.uploads, range(8)+[1, 2])
+        #The evicted glyph is uploaded again when it's needed
+        self.screen.load_glyph(glyph(1))
+        self.assertEqual(self.uploads[-1], 3)
+
+    def test_on_screen_glyphs_kept(self):
+        chars = self.fill_slots()
+        self.screen.display_data(chars[0]+chars[1], "")
+        self.assertEqual(self.screen.load_glyph(glyph(8)), chars[2])
+        self.assertEqual(self.screen.load_glyph(glyph(9)), chars[3])
+
+    def test_all_glyphs_on_screen(self):
+        #Nothing better to evict, so the least recently used glyph goes - and the cells showing it change with the slot contents
+        chars = self.fill_slots()
+        self.screen.display_data("".join(chars), "")
+        self.screen.bus.reset_stats()
+        self.assertEqual(self.screen.load_glyph(glyph(8)), chars[0])
+        transactions = self.screen.bus.transactions
+        self.screen.display_data("".join(chars), "")
+        self.assertEqual(self.screen.bus.transactions, transactions) #Cells aren't resent, they already show the new glyph
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests for the ``hid_multi`` input driver, plugging and unplugging devices of the fake ``evdev`` module from ``mocks``."""
+
+import unittest
+import Queue
+from time import time, sleep
+
+import mocks
+mocks.install()
+
+from mocks import evdev
+from input.drivers import hid_multi
+
+class HotplugTest(unittest.TestCase):
+
+    def setUp(self):
+        for path in evdev.list_devices():
+            evdev.remove_device(path)
+        self.keyboard = evdev.add_device("Keyboard")
+        self.keys = Queue.Queue()
+        self.driver = hid_multi.InputDevice(rescan_interval=0.02, forward_values=[1])
+        self.driver.send_key = self.keys.put
+
+    def tearDown(self):
+        self.driver.atexit()
+        self.driver.thread.join(2)
+        self.assertFalse(self.driver.thread.is_alive())
+
+    def wait_for(self, condition, timeout=2):
+        end = time() + timeout
+        while not condition():
+            if time() > end:
+                self.fail("Timed out")
+            sleep(0.005)
+
+    def get_key(self):
+        try:
+            return self.keys.get(timeout=2)
+        except Queue.Empty:
+            self.fail("No key received")
+
+    def driver_paths(self):
+        return sorted([device.fn for device in self.driver.devices.values()])
+
+    def test_plug_and_unplug(self):
+        self.keyboard.press("KEY_A")
+        self.assertEqual(self.get_key(), "KEY_A")
+        numpad = evdev.add_device("Numpad")
+        self.wait_for(lambda: numpad.path in self.driver_paths())
+        numpad.press("KEY_KP5")
+        self.assertEqual(self.get_key(), "KEY_KP5")
+        evdev.remove_device(numpad.path)
+        self.wait_for(lambda: numpad.path not in self.driver_paths())
+        self.wait_for(lambda: numpad.read_fd is None) #Closed once the driver closes the device
+        self.assertRaises(OSError, numpad.press, "KEY_KP6")
+        self.keyboard.press("KEY_B")
+        self.assertEqual(self.get_key(), "KEY_B")
+        self.assertTrue(self.keys.empty())
+
+    def test_rejected_devices_not_reopened(self):
+        mouse = evdev.add_device("Mouse", capabilities={evdev.ecodes.EV_REL:[0, 1]})
+        self.wait_for(lambda: mouse.times_opened == 1)
+        sleep(0.1) #A few rescans
+        self.assertEqual(mouse.times_opened, 1)
+        self.assertEqual(mouse.open_count, 0)
+        self.assertEqual(self.driver_paths(), [self.keyboard.path])
+        #Another device that gets the same path once the mouse is unplugged is checked again
+        evdev.remove_device(mouse.path)
+        self.wait_for(lambda: mouse.path not in self.driver.rejected_paths)
+        numpad = evdev.add_device("Numpad", path=mouse.path)
+        self.wait_for(lambda: numpad.path in self.driver_paths())
+
+    def test_grab_default(self):
+        self.assertFalse(self.keyboard.grabbed)
+        self.driver.atexit()
+        self.driver.thread.join(2)
+        self.driver = hid_multi.InputDevice(names=["Keyboard"], hotplug=False)
+        self.assertTrue(self.keyboard.grabbed)
+
+    def test_devices_closed_on_exit(self):
+        self.assertEqual(self.keyboard.open_count, 1)
+        self.driver.atexit()
+        self.driver.thread.join(2)
+        self.assertEqual(self.keyboard.open_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
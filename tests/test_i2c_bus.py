@@ -0,0 +1,92 @@
+"""Tests for ``SharedBus`` arbitration, with clients on separate threads using the fake ``smbus`` from ``mocks``."""
+
+import unittest
+from threading import Thread, Event
+from time import time, sleep
+
+import mocks
+mocks.install()
+
+from helpers.i2c_bus import SharedBus
+
+screen_addr = 0x27
+buttons_addr = 0x20
+
+class PriorityTest(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = SharedBus(1)
+        self.bus.bus.logging = True
+        self.screen = self.bus.add_client("screen")
+        self.buttons = self.bus.add_client("buttons", priority=True)
+        self.other = self.bus.add_client("other")
+        self.threads = []
+
+    def tearDown(self):
+        self.join_threads()
+
+    def join_threads(self):
+        for thread in self.threads:
+            thread.join(2)
+            self.assertFalse(thread.is_alive())
+
+    def start(self, target):
+        thread = Thread(target=target)
+        thread.daemon = True
+        self.threads.append(thread)
+        thread.start()
+
+    def wait_for(self, condition, timeout=2):
+        end = time() + timeout
+        while not condition():
+            if time() > end:
+                self.fail("Timed out")
+            sleep(0.005)
+
+    def get_log(self):
+        return [(method, data[-1]) for method, addr, data in self.bus.bus.log]
+
+    def write_frame(self, started):
+        """Writes a "frame" of three bytes in a batch, waiting for a priority client to queue up after the first one."""
+        with self.screen.batch():
+            self.screen.write_byte_data(screen_addr, 0, 1)
+            started.set()
+            self.wait_for(lambda: self.bus.priority_waiting)
+            self.screen.write_byte_data(screen_addr, 0, 2)
+            self.screen.write_byte_data(screen_addr, 0, 3)
+
+    def test_priority_read_in_batch(self):
+        started = Event()
+        self.start(lambda: self.write_frame(started))
+        self.assertTrue(started.wait(2))
+        self.buttons.read_byte_data(buttons_addr, 0x13)
+        self.join_threads()
+        self.assertEqual(self.get_log(), [("write_byte_data", 1), ("read_byte_data", 0), ("write_byte_data", 2), ("write_byte_data", 3)])
+        self.assertEqual(self.buttons.transactions, 1)
+        self.assertEqual(self.screen.transactions, 3)
+
+    def test_batch_resumed_before_other_clients(self):
+        started = Event()
+        reading = Event()
+        finish_read = Event()
+        def read_buttons():
+            with self.buttons.batch(): #Holds the bus while the batch is yielded
+                self.buttons.read_byte_data(buttons_addr, 0x13)
+                reading.set()
+                finish_read.wait(2)
+        self.start(lambda: self.write_frame(started))
+        self.assertTrue(started.wait(2))
+        self.start(read_buttons)
+        self.assertTrue(reading.wait(2))
+        self.assertTrue(self.bus.yielded is not None)
+        self.start(lambda: self.other.write_byte(0x40, 4))
+        sleep(0.05)
+        self.assertEqual(self.get_log(), [("write_byte_data", 1), ("read_byte_data", 0)]) #The other client waits while the batch is yielded, and the batch gets the bus back first
+        finish_read.set()
+        self.join_threads()
+        self.assertEqual(self.get_log(), [("write_byte_data", 1), ("read_byte_data", 0), ("write_byte_data", 2), ("write_byte_data", 3), ("write_byte", 4)])
+        self.assertEqual(self.bus.yielded, None)
+
+
+if __name__ == "__main__":
+    unittest.main()
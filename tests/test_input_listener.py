@@ -0,0 +1,122 @@
+"""Tests for ``InputListener`` key dispatching."""
+
+import unittest
+from threading import Event
+from time import time, sleep
+
+from input.input import InputListener
+from ui.funcs import accepts_count
+
+class CoalescingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.listener = InputListener([])
+        self.calls = []
+        self.done = Event()
+        self.listener.keymap = {"KEY_DOWN":accepts_count(lambda count=1: self.calls.append(("KEY_DOWN", count))),
+                                "KEY_UP":accepts_count(lambda count=1: self.calls.append(("KEY_UP", count))),
+                                "KEY_ENTER":lambda: self.done.set()} #Not started yet, keys pile up in the queue
+
+    def tearDown(self):
+        self.listener.atexit()
+
+    def test_take_repeats(self):
+        for key in ["KEY_DOWN"]*3 + ["KEY_UP", "KEY_DOWN"]:
+            self.listener.queue.put((key, 0, self.listener.keymap_version))
+        self.assertEqual(self.listener.take_repeats("KEY_DOWN"), 3)
+        self.assertEqual(self.listener.lookahead[0], "KEY_UP")
+        self.assertEqual(self.listener.get_callback_stats()["queue_depth"], 2)
+        self.assertEqual(self.listener.get_key()[0], "KEY_UP")
+        self.assertEqual(self.listener.lookahead, None)
+        self.assertEqual(self.listener.take_repeats("KEY_UP"), 0)
+        self.assertEqual(self.listener.get_key()[0], "KEY_DOWN") #Looked ahead at, but not lost
+
+    def test_dispatch_order(self):
+        for key in ["KEY_DOWN"]*4 + ["KEY_UP"]*2 + ["KEY_DOWN", "KEY_ENTER"]:
+            self.listener.receive_key(key)
+        self.listener.listen()
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(self.calls, [("KEY_DOWN", 4), ("KEY_UP", 2), ("KEY_DOWN", 1)])
+        self.assertEqual(self.listener.coalesced_keys, 4)
+
+
+class CallbackPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.listener = InputListener([], callback_workers=2)
+        self.listener.nonmaskable_keymap = {} #Class attribute, shouldn't leak between tests
+        self.calls = []
+        self.release = Event()
+        self.done = Event()
+        self.listener.keymap = {"KEY_F1":self.slow_callback, "KEY_ENTER":self.done.set}
+        self.listener.listen()
+
+    def tearDown(self):
+        self.release.set()
+        self.listener.atexit()
+
+    def slow_callback(self):
+        self.calls.append("KEY_F1")
+        self.release.wait(2)
+
+    def wait_for(self, condition, timeout=2):
+        end = time() + timeout
+        while not condition():
+            if time() > end:
+                self.fail("Timed out")
+            sleep(0.005)
+
+    def send_repeats(self, policy, count=4):
+        """Sends ``count`` slow keys with a policy, then waits until the dispatcher has handed all of them out and the first callback is running."""
+        self.listener.set_key_policy("KEY_F1", policy)
+        for _ in range(count):
+            self.listener.receive_key("KEY_F1")
+        self.listener.receive_key("KEY_ENTER") #Inline, so it's called once the keys before it are dispatched
+        self.assertTrue(self.done.wait(2))
+        self.wait_for(lambda: self.calls)
+
+    def finish(self, expected_calls):
+        self.release.set()
+        self.wait_for(lambda: len(self.calls) >= expected_calls and not self.listener.get_callback_stats()["busy_callback_workers"])
+        sleep(0.05) #No more calls should follow
+        self.assertEqual(len(self.calls), expected_calls)
+
+    def test_serialise(self):
+        self.send_repeats("serialise")
+        stats = self.listener.get_callback_stats()
+        self.assertEqual(stats["busy_callback_workers"], 1)
+        self.assertEqual(len(self.calls), 1) #One at a time
+        self.finish(4)
+        self.assertEqual(self.listener.get_callback_stats()["dropped_callbacks"], 0)
+
+    def test_drop(self):
+        self.send_repeats("drop")
+        self.assertEqual(self.listener.get_callback_stats()["dropped_callbacks"], 3)
+        self.finish(1)
+
+    def test_latest(self):
+        self.send_repeats("latest")
+        self.assertEqual(self.listener.get_callback_stats()["dropped_callbacks"], 2)
+        self.finish(2)
+
+    def test_unknown_policy(self):
+        self.assertRaises(ValueError, self.listener.set_key_policy, "KEY_F1", "sometimes")
+
+    def test_slow_nonmaskable_callback(self):
+        fast_done = Event()
+        self.listener.set_nonmaskable_callback("KEY_F1", self.slow_callback)
+        self.listener.set_nonmaskable_callback("KEY_F2", fast_done.set)
+        self.listener.receive_key("KEY_F1")
+        self.wait_for(lambda: self.calls)
+        self.listener.receive_key("KEY_F1")
+        self.listener.receive_key("KEY_F2")
+        #The priority thread isn't blocked by the first callback, and the second one waits for it
+        self.assertTrue(fast_done.wait(2))
+        self.assertEqual(len(self.calls), 1)
+        self.wait_for(lambda: self.listener.get_callback_stats()["priority_queue_depth"] == 0)
+        self.finish(2)
+        self.assertEqual(self.listener.get_callback_stats()["callback_queue_depth"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
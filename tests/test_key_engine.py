@@ -0,0 +1,132 @@
+"""Tests for ``KeyEventEngine``, driven by a fake clock - the hold timer thread isn't started, hold events are sent by calling ``send_holds`` at the times they're due."""
+
+import unittest
+
+from input.key_engine import KeyEventEngine
+
+class EngineTest(unittest.TestCase):
+
+    def get_engine(self, **kwargs):
+        self.now = 100.0
+        self.events = [] #(time, key)
+        engine = KeyEventEngine(threaded=False, **kwargs)
+        engine.send_key = lambda key: self.events.append((self.now, key))
+        self.engine = engine
+        return engine
+
+    def press(self, key):
+        self.engine.key_state_changed(key, True, self.now)
+
+    def release(self, key):
+        self.engine.key_state_changed(key, False, self.now)
+
+    def advance(self, seconds):
+        """Moves the clock ``seconds`` forward, sending hold events at the times they're due on the way."""
+        end = self.now + seconds
+        while True:
+            deadline = self.engine.send_holds(self.now)
+            if deadline is None or deadline > end:
+                break
+            self.now = deadline
+        self.now = end
+
+    def keys(self):
+        return [key for _, key in self.events]
+
+
+class TapTest(EngineTest):
+
+    def test_tap_on_press(self):
+        self.get_engine(keys={})
+        self.press("KEY_ENTER")
+        self.assertEqual(self.events, [(100.0, "KEY_ENTER")])
+        self.advance(0.1)
+        self.release("KEY_ENTER")
+        self.assertEqual(self.keys(), ["KEY_ENTER"])
+
+    def test_defer_tap(self):
+        self.get_engine(keys={"KEY_ENTER":{"defer_tap":True}})
+        self.press("KEY_ENTER")
+        self.assertEqual(self.events, [])
+        self.advance(0.1)
+        self.release("KEY_ENTER")
+        self.assertEqual(self.events, [(100.1, "KEY_ENTER")])
+
+    def test_defer_tap_not_sent_after_hold(self):
+        self.get_engine(keys={"KEY_ENTER":{"defer_tap":True, "hold":True, "hold_key":"KEY_ENTER_LONG"}})
+        self.press("KEY_ENTER")
+        self.advance(0.6)
+        self.release("KEY_ENTER")
+        self.assertEqual(self.events, [(100.5, "KEY_ENTER_LONG")])
+
+    def test_press_release(self):
+        self.get_engine(keys={"KEY_LEFT":{"press_release":True}})
+        self.press("KEY_LEFT")
+        self.release("KEY_LEFT")
+        self.assertEqual(self.keys(), ["KEY_LEFT_PRESS", "KEY_LEFT", "KEY_LEFT_RELEASE"])
+
+
+class HoldTest(EngineTest):
+
+    def test_repeat_acceleration(self):
+        self.get_engine(hold_time=0.5, repeat_interval=0.2, min_repeat_interval=0.05, acceleration=0.8)
+        self.press("KEY_DOWN")
+        self.advance(1.5)
+        self.release("KEY_DOWN")
+        self.assertEqual(self.keys(), ["KEY_DOWN"]+["KEY_DOWN_HOLD"]*(len(self.events)-1))
+        times = [timestamp for timestamp, _ in self.events[1:]]
+        self.assertAlmostEqual(times[0], 100.5)
+        intervals = [next_time - timestamp for timestamp, next_time in zip(times, times[1:])]
+        expected = [max(0.05, 0.2*0.8**i) for i in range(len(intervals))]
+        for interval, expected_interval in zip(intervals, expected):
+            self.assertAlmostEqual(interval, expected_interval)
+        self.assertAlmostEqual(expected[-1], 0.05) #Got to the minimum interval
+        self.assertTrue(times[-1] > 101.45)
+
+    def test_no_holds_after_release(self):
+        self.get_engine()
+        self.press("KEY_UP")
+        self.advance(0.4)
+        self.release("KEY_UP")
+        self.assertEqual(self.engine.send_holds(self.now + 10), None)
+        self.assertEqual(self.keys(), ["KEY_UP"])
+
+    def test_keys_without_hold(self):
+        self.get_engine()
+        self.press("KEY_ENTER")
+        self.assertEqual(self.engine.send_holds(self.now), None)
+        self.advance(2)
+        self.assertEqual(self.keys(), ["KEY_ENTER"])
+
+
+class ChordTest(EngineTest):
+
+    def test_chord_consumes_keys(self):
+        self.get_engine(keys={}, chords=[["KEY_LEFT", "KEY_ENTER"]])
+        self.press("KEY_LEFT")
+        self.assertEqual(self.events, []) #Chord keys are sent on release
+        self.press("KEY_ENTER")
+        self.release("KEY_ENTER")
+        self.release("KEY_LEFT")
+        self.assertEqual(self.keys(), ["KEY_LEFT+KEY_ENTER"])
+
+    def test_chord_key_alone(self):
+        self.get_engine(keys={}, chords=[["KEY_LEFT", "KEY_ENTER"]])
+        self.press("KEY_LEFT")
+        self.advance(0.1)
+        self.release("KEY_LEFT")
+        self.assertEqual(self.events, [(100.1, "KEY_LEFT")])
+
+    def test_chord_cancels_hold(self):
+        self.get_engine(keys={"KEY_DOWN":{"hold":True}}, chords=[["KEY_DOWN", "KEY_ENTER"]])
+        self.press("KEY_DOWN")
+        self.advance(0.2)
+        self.press("KEY_ENTER")
+        self.advance(1)
+        self.release("KEY_DOWN")
+        self.release("KEY_ENTER")
+        self.assertEqual(self.keys(), ["KEY_DOWN+KEY_ENTER"])
+
+
+if __name__ == "__main__":
+    unittest.main()
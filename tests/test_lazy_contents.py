@@ -0,0 +1,126 @@
+"""Tests for lazy contents and UI elements using them, checking which entries get fetched."""
+
+import unittest
+
+from ui import Menu, Listbox, Checkbox
+from ui.lazy_contents import LazyContents, FunctionContents, ContentsWindow
+from tests.test_menu import FakeOutput, FakeInput
+
+class CountingContents(LazyContents):
+    """Lazy contents that remember the indices of the entries fetched."""
+
+    def __init__(self, length, make_entry=lambda index: ["Entry {}".format(index)]):
+        self.length = length
+        self.make_entry = make_entry
+        self.fetched = []
+
+    def __len__(self):
+        return self.length
+
+    def get_entry(self, index):
+        self.fetched.append(index)
+        return self.make_entry(index)
+
+
+class LazyContentsTest(unittest.TestCase):
+
+    def test_indexing(self):
+        contents = FunctionContents(lambda: 5, lambda index: index*2)
+        self.assertEqual(len(contents), 5)
+        self.assertEqual(contents[-1], 8)
+        self.assertEqual(contents[1:4], [2, 4, 6])
+        self.assertEqual(list(contents), [0, 2, 4, 6, 8])
+        self.assertRaises(IndexError, contents.__getitem__, 5)
+
+    def test_abstract_methods(self):
+        contents = LazyContents()
+        self.assertRaises(NotImplementedError, len, contents)
+        self.assertRaises(NotImplementedError, contents.get_entry, 0)
+
+
+class ContentsWindowTest(unittest.TestCase):
+
+    def setUp(self):
+        self.contents = CountingContents(100)
+        self.window = ContentsWindow(self.contents, extra_entries=[["Exit"]], window_size=8)
+
+    def test_window_around_entry(self):
+        self.assertEqual(self.window[50], ["Entry 50"])
+        self.assertEqual(self.contents.fetched, range(46, 54))
+        self.window[46]
+        self.window[53]
+        self.assertEqual(len(self.contents.fetched), 8) #Inside the window, nothing fetched
+        self.window[54]
+        self.assertEqual(self.contents.fetched[8:], range(50, 58))
+
+    def test_refill_at_edges(self):
+        self.window[1]
+        self.assertEqual(self.contents.fetched, range(0, 8)) #Window doesn't start before the first entry
+        del self.contents.fetched[:]
+        self.window[98]
+        self.assertEqual(self.contents.fetched, range(92, 100)) #or end after the last one
+        del self.contents.fetched[:]
+        self.assertEqual(self.window[100], ["Exit"])
+        self.assertEqual(len(self.window), 101)
+        self.assertEqual(self.contents.fetched, [])
+
+    def test_short_contents(self):
+        self.contents.length = 3
+        self.window.invalidate()
+        self.assertEqual(self.window[2], ["Entry 2"])
+        self.assertEqual(self.contents.fetched, [0, 1, 2])
+
+    def test_invalidate(self):
+        self.window.process_entry = lambda entry: entry[0]
+        self.assertEqual(self.window[10], "Entry 10")
+        self.contents.make_entry = lambda index: ["Changed {}".format(index)]
+        self.assertEqual(self.window[10], "Entry 10") #Still in the window
+        self.window.invalidate()
+        self.assertEqual(self.window[10], "Changed 10")
+
+
+class UIElementFetchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.o = FakeOutput()
+        self.i = FakeInput()
+        self.contents = CountingContents(1000, lambda index: ["Entry {}".format(index), index])
+
+    def check_fetches(self, element):
+        element.to_foreground()
+        self.assertTrue(set(range(self.o.rows)).issubset(self.contents.fetched))
+        self.assertTrue(len(set(self.contents.fetched)) <= 16) #One window
+        self.assertEqual(self.o.frames[-1][0].strip()[-7:], "Entry 0")
+        fetch_count = len(self.contents.fetched)
+        for _ in range(5):
+            self.i.keymap["KEY_DOWN"]()
+        self.assertEqual(len(self.contents.fetched), fetch_count)
+        self.assertTrue(max(self.contents.fetched) < 16)
+
+    def test_menu(self):
+        self.check_fetches(Menu(self.contents, self.i, self.o))
+
+    def test_listbox(self):
+        self.check_fetches(Listbox(self.contents, self.i, self.o))
+
+    def test_checkbox(self):
+        self.check_fetches(Checkbox(self.contents, self.i, self.o))
+
+    def test_menu_contents_changed(self):
+        menu = Menu(self.contents, self.i, self.o)
+        menu.to_foreground()
+        for _ in range(3):
+            self.i.keymap["KEY_DOWN"]()
+        self.contents.make_entry = lambda index: ["Changed {}".format(index)]
+        self.contents.length = 500
+        del self.contents.fetched[:]
+        menu.contents_changed()
+        self.assertEqual(self.o.frames[-1][0].strip(), "Changed 0")
+        self.assertEqual(menu.pointer, 3)
+        self.assertTrue(set(range(self.o.rows)).issubset(self.contents.fetched))
+        self.assertTrue(len(self.contents.fetched) <= 16)
+        self.assertEqual(menu._contents[500][0], "Exit")
+
+
+if __name__ == "__main__":
+    unittest.main()
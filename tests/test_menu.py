@@ -0,0 +1,227 @@
+"""Tests for ``Menu`` - changing its contents while it's displayed, rendering and jumping to elements - using fake input and output objects."""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from ui import Menu, PathPicker, FunctionContents
+from ui.menu import PrefixIndex
+
+class FakeOutput():
+    rows = 4
+    cols = 16
+
+    def __init__(self):
+        self.frames = []
+
+    def display_data(self, *args):
+        self.frames.append(args)
+
+
+class FakeInput():
+    keymap = None
+
+    def set_keymap(self, keymap):
+        self.keymap = keymap
+
+
+class MutationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.o = FakeOutput()
+        self.i = FakeInput()
+        self.menu = Menu([["Entry {}".format(n)] for n in range(10)], self.i, self.o)
+        self.menu.to_foreground()
+
+    def names(self):
+        return [entry[0] for entry in self.menu._contents]
+
+    def scroll_to(self, pointer):
+        for _ in range(pointer):
+            self.i.keymap["KEY_DOWN"]()
+
+    def test_exit_element_not_removable(self):
+        self.assertRaises(IndexError, self.menu.remove_entry, 10)
+        self.assertRaises(IndexError, self.menu.update_entry, 10, ["Not exit"])
+        self.assertRaises(IndexError, self.menu.move_entry, 10, 0)
+        self.assertEqual(self.menu.get_entry_count(), 10)
+        self.assertEqual(self.names()[-1], "Exit")
+
+    def test_remove_all(self):
+        for _ in range(10):
+            self.menu.remove_entry(-1) #Last element before "Exit"
+        self.assertEqual(self.names(), ["Exit"])
+        self.assertEqual(self.menu.get_entry_count(), 0)
+        self.assertRaises(IndexError, self.menu.remove_entry, 0)
+        self.menu.append_entry(["New"])
+        self.assertEqual(self.names(), ["New", "Exit"])
+
+    def test_remove_without_exit(self):
+        menu = Menu([["A"], ["B"]], self.i, self.o, append_exit=False)
+        menu.remove_entry(1)
+        self.assertEqual(menu.get_entry_count(), 1)
+        self.assertRaises(IndexError, menu.remove_entry, 1)
+
+    def test_remove_first_displayed(self):
+        self.scroll_to(6) #Entries 3-6 are displayed
+        self.assertEqual(self.menu.first_displayed_entry, 3)
+        self.menu.remove_entry(3)
+        #Next element takes the removed one's place, the viewport doesn't move up
+        self.assertEqual(self.menu.first_displayed_entry, 3)
+        self.assertEqual(self.o.frames[-1][0].strip(), "Entry 4")
+        self.assertEqual(self.menu._contents[self.menu.pointer][0], "Entry 6")
+
+    def test_remove_above_viewport(self):
+        self.scroll_to(6)
+        self.menu.remove_entry(0)
+        self.assertEqual(self.menu.first_displayed_entry, 2)
+        self.assertEqual(self.o.frames[-1][0].strip(), "Entry 3")
+
+    def test_insert_at_first_displayed(self):
+        self.scroll_to(6)
+        self.menu.insert_entry(3, ["Inserted"])
+        self.assertEqual(self.menu.first_displayed_entry, 4)
+        self.assertEqual(self.o.frames[-1][0].strip(), "Entry 3")
+
+
+class RenderCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.o = FakeOutput()
+        self.i = FakeInput()
+        self.menu = Menu([["Entry {}".format(n)] for n in range(100)], self.i, self.o)
+        self.rendered = []
+        render_displayed_entry = self.menu.render_displayed_entry
+        def counting_render_displayed_entry(entry_num, active=False):
+            self.rendered.append(entry_num)
+            return render_displayed_entry(entry_num, active=active)
+        self.menu.render_displayed_entry = counting_render_displayed_entry
+        self.menu.to_foreground()
+
+    def test_pointer_move(self):
+        self.assertEqual(sorted(self.rendered), range(4))
+        for pointer in range(1, 10):
+            del self.rendered[:]
+            self.i.keymap["KEY_DOWN"]()
+            #The previously selected element and the newly selected one - and, once the menu scrolls, the element that came into view is one of them
+            self.assertTrue(len(self.rendered) <= 2)
+            self.assertTrue(pointer in self.rendered)
+        self.assertEqual(self.o.frames[-1][-1].strip(), "*Entry 9")
+
+    def test_refresh_without_changes(self):
+        del self.rendered[:]
+        self.menu.refresh()
+        self.assertEqual(self.rendered, [])
+
+    def test_update_in_place(self):
+        entry = self.menu._contents[2]
+        entry[0] = "Changed"
+        self.menu.refresh()
+        self.assertEqual(self.o.frames[-1][2].strip(), "Entry 2") #Not re-rendered without being told about the change
+        del self.rendered[:]
+        self.menu.update_entry(2, entry)
+        self.assertEqual(self.rendered, [2])
+        self.assertEqual(self.o.frames[-1][2].strip(), "Changed")
+
+    def test_cache_pruned(self):
+        pruned = 0
+        size = len(self.menu.render_cache)
+        for _ in range(60):
+            self.i.keymap["KEY_DOWN"]()
+            self.assertTrue(len(self.menu.render_cache) <= self.menu.render_cache_size)
+            if len(self.menu.render_cache) < size:
+                #Only the displayed elements are left
+                pruned += 1
+                displayed = range(self.menu.first_displayed_entry, self.menu.last_displayed_entry+1)
+                self.assertEqual(sorted([id(entry) for entry, _ in self.menu.render_cache.values()]),
+                                 sorted([id(self.menu._contents[index]) for index in displayed]))
+            size = len(self.menu.render_cache)
+        self.assertTrue(pruned)
+
+
+class PrefixIndexTest(unittest.TestCase):
+
+    def test_first_in_menu_order(self):
+        index = PrefixIndex(["Zebra", "apple", "Banana", "avocado", "Apricot", "b"])
+        self.assertEqual(index.find("a"), 1)
+        self.assertEqual(index.find("ap"), 1)
+        self.assertEqual(index.find("apr"), 4)
+        self.assertEqual(index.find("b"), 2)
+        self.assertEqual(index.find("ba"), 2)
+        self.assertEqual(index.find("z"), 0)
+        self.assertEqual(index.find("c"), None)
+        self.assertEqual(index.find("bananas"), None)
+        self.assertEqual(index.find(""), 0)
+
+    def test_against_linear_search(self):
+        rng = random.Random(1)
+        labels = ["".join([rng.choice("abc") for _ in range(rng.randint(0, 5))]) for _ in range(300)]
+        index = PrefixIndex(labels)
+        for prefix in ["", "a", "b", "c", "ab", "ca", "bbb", "abca", "cccc", "abcabc"]:
+            expected = ([n for n, label in enumerate(labels) if label.startswith(prefix)] + [None])[0]
+            self.assertEqual(index.find(prefix), expected)
+
+    def test_empty(self):
+        self.assertEqual(PrefixIndex([]).find("a"), None)
+
+
+class PathPickerJumpTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp(prefix="pylci_test_")
+        os.mkdir(os.path.join(self.path, "zdir"))
+        for n in range(200):
+            open(os.path.join(self.path, "file{:03d}".format(n)), "w").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_jump_doesnt_fetch_all_entries(self):
+        picker = PathPicker(self.path, FakeInput(), FakeOutput())
+        fetched = []
+        get_entry = picker.contents.get_entry
+        picker.contents.get_entry = lambda index: fetched.append(index) or get_entry(index)
+        picker.to_foreground()
+        self.assertTrue(fetched) #Entries that are displayed are fetched
+        picker.jump_to_prefix("file150")
+        self.assertEqual(picker._contents[picker.pointer][0], "file150")
+        picker.jump_to_prefix("z")
+        self.assertEqual(picker._contents[picker.pointer][0], "zdir")
+        self.assertTrue(len(fetched) < 100)
+
+
+class LazyJumpTest(unittest.TestCase):
+
+    def setUp(self):
+        self.names = ["Entry {:03d}".format(n) for n in range(300)]
+        self.fetched = []
+
+    def get_entry(self, index):
+        self.fetched.append(index)
+        return [self.names[index]]
+
+    def test_without_labels(self):
+        menu = Menu(FunctionContents(len(self.names), self.get_entry), FakeInput(), FakeOutput())
+        menu.to_foreground()
+        self.assertFalse(menu.can_jump())
+        self.assertFalse("KEY_E" in menu.i.keymap)
+        self.assertFalse(menu.jump_to_prefix("entry 2"))
+        menu.type_char("e")
+        self.assertEqual(menu.pointer, 0)
+        self.assertTrue(len(self.fetched) <= 16) #Only the displayed elements' window
+
+    def test_with_labels(self):
+        menu = Menu(FunctionContents(len(self.names), self.get_entry, get_labels=lambda: self.names), FakeInput(), FakeOutput())
+        menu.to_foreground()
+        self.assertTrue("KEY_E" in menu.i.keymap)
+        self.assertTrue(menu.jump_to_prefix("entry 25"))
+        self.assertEqual(menu.pointer, 250)
+        self.assertTrue(menu.jump_to_prefix("exit"))
+        self.assertEqual(menu.pointer, 300)
+        self.assertTrue(len(self.fetched) < 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Tests for ``MultiScreen``, combining fake screens that record what's written to them."""
+
+import unittest
+
+from output.multi_screen import MultiScreen
+
+class PlainScreen():
+    rows = 2
+    cols = 16
+
+    def __init__(self):
+        self.frames = []
+
+    def display_data(self, *args):
+        self.frames.append(args)
+
+
+class GlyphScreen(PlainScreen):
+
+    def __init__(self, first_slot=0):
+        PlainScreen.__init__(self)
+        self.glyphs = {}
+        self.next_slot = first_slot
+        self.cursor_moves = []
+
+    def load_glyph(self, bitmap):
+        bitmap = tuple(bitmap)
+        if bitmap not in self.glyphs:
+            self.glyphs[bitmap] = self.next_slot
+            self.next_slot += 1
+        return chr(self.glyphs[bitmap])
+
+    def setCursor(self, row, col):
+        self.cursor_moves.append((row, col))
+
+
+class MultiScreenTest(unittest.TestCase):
+
+    def get_frames(self, multi_screen):
+        for screen in multi_screen.screens:
+            screen.flush()
+        return [screen.screen.frames for screen in multi_screen.screens]
+
+    def test_method_missing_on_some_screens(self):
+        plain, glyph = PlainScreen(), GlyphScreen()
+        multi_screen = MultiScreen([plain, glyph])
+        multi_screen.setCursor(1, 2)
+        self.assertEqual(glyph.cursor_moves, [(1, 2)])
+        self.assertRaises(AttributeError, getattr, multi_screen, "noDisplay")
+
+    def test_geometry(self):
+        small, big = PlainScreen(), PlainScreen()
+        big.rows, big.cols = 4, 20
+        self.assertEqual((MultiScreen([small, big]).rows, MultiScreen([small, big]).cols), (2, 16))
+        multi_screen = MultiScreen([small, big], geometry="max")
+        self.assertEqual((multi_screen.rows, multi_screen.cols), (4, 20))
+        multi_screen.display_data("A"*20, "B"*20, "C"*20)
+        self.assertEqual(self.get_frames(multi_screen), [[("A"*16, "B"*16)], [("A"*20, "B"*20, "C"*20)]])
+
+    def test_glyph_slots_mapped_per_screen(self):
+        first, second, plain = GlyphScreen(), GlyphScreen(first_slot=3), PlainScreen()
+        multi_screen = MultiScreen([first, second, plain])
+        arrow = multi_screen.load_glyph([1]*8)
+        box = multi_screen.load_glyph([2]*8)
+        self.assertEqual((arrow, box), ("\x00", "\x01"))
+        self.assertEqual(multi_screen.load_glyph([1]*8), arrow)
+        multi_screen.display_data(arrow+"A"+box, "B")
+        self.assertEqual(self.get_frames(multi_screen), [[("\x00A\x01", "B")], [("\x03A\x04", "B")], [("\x00A\x01", "B")]])
+
+    def test_no_glyph_support(self):
+        multi_screen = MultiScreen([PlainScreen(), PlainScreen()])
+        self.assertRaises(AttributeError, multi_screen.load_glyph, [1]*8)
+
+
+if __name__ == "__main__":
+    unittest.main()
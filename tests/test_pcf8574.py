@@ -0,0 +1,67 @@
+"""Tests for the ``pcf8574`` output driver, counting I2C transactions on the fake ``smbus`` from ``mocks``."""
+
+import unittest
+
+import mocks
+mocks.install()
+
+from output.drivers import pcf8574, hd44780
+
+def no_sleep(seconds):
+    pass
+
+pcf8574.sleep = hd44780.sleep = no_sleep
+
+first = ["ABCDEFGHIJKLMNOP", "QRSTUVWXYZABCDEF"]
+second = [row.lower() for row in first]
+
+class BlockWritesTest(unittest.TestCase):
+
+    def get_screen(self, block_writes):
+        screen = pcf8574.Screen(bus=1, addr=0x27, block_writes=block_writes)
+        screen.display_data(*first)
+        screen.bus.reset_stats()
+        return screen
+
+    def test_full_redraw_transactions(self):
+        single = self.get_screen(False)
+        single.display_data(*second)
+        #Every expander write is a transaction: 2 "set cursor" commands and 32 characters, 2 nibbles each, 3 writes per nibble
+        expander_writes = (2+32)*2*3
+        self.assertEqual(single.bus.transactions, expander_writes)
+        block = self.get_screen(True)
+        block.display_data(*second)
+        #One block transfer carries 33 expander writes - 32 data bytes and the "register" byte
+        self.assertEqual(block.bus.transactions, -(-expander_writes//33))
+        self.assertTrue(block.bus.transactions*20 < single.bus.transactions)
+
+    def test_same_screen_contents(self):
+        #Expander states written, in order, as the PCF8574 would latch them (the "register" byte of a block transfer included)
+        states = []
+        for block_writes in False, True:
+            screen = self.get_screen(block_writes)
+            fake_bus = screen.bus.shared_bus.bus #All the screens on bus 1 share it
+            fake_bus.logging = True
+            fake_bus.reset_stats()
+            screen.display_data(*second)
+            fake_bus.logging = False
+            written = []
+            for method, addr, data in fake_bus.log:
+                written += data[1:] if method == "write_byte_data" else data
+            states.append([state & 0xFF for state in written]) #smbus only sends the low byte of unbuffered writes' values
+        self.assertEqual(len(states[0]), (2+32)*2*3)
+        self.assertEqual(states[0], states[1])
+
+    def test_flush_single_byte(self):
+        screen = self.get_screen(True)
+        fake_bus = screen.bus.shared_bus.bus
+        fake_bus.logging = True
+        fake_bus.reset_stats()
+        screen.write_buffer = range(34)
+        screen.flush()
+        self.assertEqual([(method, data) for method, addr, data in fake_bus.log],
+                         [("write_i2c_block_data", range(33)), ("write_byte_data", [0, 33])])
+
+
+if __name__ == "__main__":
+    unittest.main()
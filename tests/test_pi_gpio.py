@@ -0,0 +1,65 @@
+"""Tests for the ``pi_gpio`` output driver, checking HD44780 timing requirements against the fake ``RPi.GPIO`` pin trace. Delays go through the output benchmark's model clock, so the trace shows the timing the driver asks for."""
+
+import unittest
+
+import mocks
+mocks.install()
+
+from benchmarks import output_drivers
+from mocks import gpio
+
+data_pins = [25, 24, 23, 18]
+rs_pin = 22
+en_pin = 27
+
+#HD44780 datasheet timings, in seconds
+min_enable_pulse = 0.00000045
+min_enable_cycle = 0.000001
+min_execution_time = 0.000037
+
+class TimingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen, self.clock = output_drivers.load_driver("pi_gpio", {"pins":data_pins, "rs_pin":rs_pin, "en_pin":en_pin}, 16, 2)
+        gpio.clock = self.clock.get_time
+        gpio.tracing = True
+        gpio.reset_stats()
+
+    def tearDown(self):
+        gpio.tracing = False
+        gpio.clock = output_drivers.time
+        gpio.reset_stats()
+
+    def test_delays_are_modelled(self):
+        self.screen.display_data("ABCDEFGHIJKLMNOP", "QRSTUVWXYZABCDEF")
+        #2 "set cursor" commands and 32 characters, each needs the execution time
+        self.assertTrue(self.clock.time >= 34*min_execution_time)
+
+    def test_enable_pulses(self):
+        self.screen.display_data("ABCDEFGHIJKLMNOP", "QRSTUVWXYZABCDEF")
+        pulses = gpio.pulses(en_pin)
+        self.assertEqual(len(pulses), 34*2)
+        for rise, fall in pulses:
+            self.assertTrue(fall - rise >= min_enable_pulse)
+        for (rise, _), (next_rise, _) in zip(pulses, pulses[1:]):
+            self.assertTrue(next_rise - rise >= min_enable_cycle)
+
+    def test_execution_time(self):
+        self.screen.display_data("ABCDEFGHIJKLMNOP", "QRSTUVWXYZABCDEF")
+        pulses = gpio.pulses(en_pin)
+        #Every byte is two nibbles - after the second one, the command has to execute before the next byte starts
+        for (_, fall), (next_rise, _) in zip(pulses[1::2], pulses[2::2]):
+            self.assertTrue(next_rise - fall >= min_execution_time)
+
+    def test_data_stable_while_enabled(self):
+        self.screen.display_data("ABCDEFGHIJKLMNOP", "QRSTUVWXYZABCDEF")
+        enabled = False
+        for _, pin, level in gpio.trace:
+            if pin == en_pin:
+                enabled = bool(level)
+            else:
+                self.assertFalse(enabled, "pin {} changed while EN was high".format(pin))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for the ``pi_gpio`` input driver waiting for edges on the fake GPIO chip from ``mocks``."""
+
+import unittest
+import Queue
+from time import time
+
+from mocks.gpiochip import FakeGPIOChip
+from input.drivers import pi_gpio
+
+debounce_time = 0.05
+
+class EdgeEventsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.chip = FakeGPIOChip()
+        self.events = Queue.Queue()
+        self.driver = pi_gpio.InputDevice(button_pins=[17, 27], gpio_chip=self.chip, debounce_time=debounce_time, threaded=False)
+        self.driver.key_state_changed = lambda key, pressed: self.events.put((key, pressed, time()))
+        self.driver.start_thread()
+
+    def tearDown(self):
+        self.driver.atexit()
+        self.driver.thread.join(2)
+        self.assertFalse(self.driver.thread.is_alive())
+        self.driver.edge_events.close()
+
+    def get_event(self, timeout=1):
+        try:
+            return self.events.get(timeout=timeout)
+        except Queue.Empty:
+            self.fail("No key event received")
+
+    def assertNoEvent(self, timeout):
+        self.assertRaises(Queue.Empty, self.events.get, True, timeout)
+
+    def test_press_and_release(self):
+        self.chip.set_value(17, 0)
+        self.assertEqual(self.get_event()[:2], ("KEY_UP", True))
+        self.assertNoEvent(debounce_time*2)
+        self.chip.set_value(17, 1)
+        self.assertEqual(self.get_event()[:2], ("KEY_UP", False))
+
+    def test_tap_shorter_than_debounce_time(self):
+        start = time()
+        self.chip.set_value(27, 0)
+        self.chip.set_value(27, 1)
+        self.assertEqual(self.get_event()[:2], ("KEY_DOWN", True))
+        key, pressed, timestamp = self.get_event()
+        self.assertEqual((key, pressed), ("KEY_DOWN", False))
+        #Release is accepted once the lockout ends
+        self.assertTrue(timestamp - start >= debounce_time)
+        self.assertNoEvent(debounce_time*2)
+
+    def test_bouncy_press(self):
+        for level in [0, 1, 0, 1, 0]:
+            self.chip.set_value(17, level)
+        self.assertEqual(self.get_event()[:2], ("KEY_UP", True))
+        self.assertNoEvent(debounce_time*2) #Line settled low, so the button stays pressed
+        for level in [1, 0, 1]:
+            self.chip.set_value(17, level)
+        self.assertEqual(self.get_event()[:2], ("KEY_UP", False))
+        self.assertNoEvent(debounce_time*2)
+
+    def test_buttons_debounced_separately(self):
+        self.chip.set_value(17, 0)
+        self.chip.set_value(27, 0)
+        self.assertEqual(sorted([self.get_event()[:2] for _ in range(2)]), [("KEY_DOWN", True), ("KEY_UP", True)])
+
+
+if __name__ == "__main__":
+    unittest.main()
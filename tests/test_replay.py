@@ -0,0 +1,42 @@
+"""Tests for the ``replay`` input driver."""
+
+import os
+import unittest
+import tempfile
+from threading import Thread
+from time import time, sleep
+
+from input.drivers import replay
+
+class ReplaySpeedTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(prefix="pylci_test_session_")
+        with os.fdopen(fd, "w") as f:
+            f.write("0 KEY_ENTER\n1000 KEY_DOWN\n0 KEY_DOWN\n")
+        self.driver = replay.InputDevice(self.path, speed=0, threaded=False)
+        self.keys = []
+        self.driver.send_key = self.keys.append
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_waits_for_keymap_after_pause(self):
+        thread = Thread(target=self.driver.replay)
+        thread.start()
+        sleep(0.05)
+        self.assertEqual(self.keys, ["KEY_ENTER"]) #Waiting, since ENTER might have opened a new UI element
+        self.driver.start() #What InputListener does when a UI element sets its keymap
+        thread.join(1)
+        self.assertEqual(self.keys, ["KEY_ENTER", "KEY_DOWN", "KEY_DOWN"])
+
+    def test_pause_limits_the_wait(self):
+        self.driver.events = [(timestamp/20, event) for timestamp, event in self.driver.events]
+        start = time()
+        self.driver.replay()
+        self.assertEqual(self.keys, ["KEY_ENTER", "KEY_DOWN", "KEY_DOWN"])
+        self.assertTrue(0.04 < time() - start < 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
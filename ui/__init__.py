@@ -9,4 +9,6 @@ IntegerInDecrementInput = IntegerAdjustInput #Compatibility with old ugly name
 from char_input import CharArrowKeysInput
 from dialog import DialogBox
 
-from funcs import ellipsize, format_for_screen
+from base_ui import BaseUIElement
+from lazy_contents import LazyContents, FunctionContents
+from funcs import ellipsize, format_for_screen, accepts_count
@@ -0,0 +1,104 @@
+"""Common base for UI elements which block in ``activate()`` while all their work is done in input callbacks.
+
+While such an element is active, the thread that called ``activate()`` just waits until the element exits - and, for some elements, does periodic work (such as scrolling a long menu entry). Instead of waking up every 100ms to check whether anything needs to be done, the thread sleeps until it's woken up by ``deactivate()`` or until the next scheduled tick."""
+
+import os
+import select
+from threading import Lock, local
+from time import time
+
+waiters = local() #Every thread that waits for a UI element gets its own Waiter
+
+def get_waiter():
+    """Returns the ``Waiter`` of the current thread, creating it if it doesn't exist yet."""
+    waiter = getattr(waiters, "waiter", None)
+    if waiter is None:
+        waiter = Waiter()
+        waiters.waiter = waiter
+    return waiter
+
+
+class Waiter():
+    """Lets a thread sleep until it's woken up or a timeout passes.
+
+    A pipe is used instead of an ``Event``, since, in Python 2, ``Event.wait()`` can't be interrupted by Ctrl+C if there's no timeout, and wakes up every 50ms to check the ``Event`` if there is one. ``select()`` on a pipe does neither."""
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+        self.lock = Lock()
+        self.pending = False #Set if there's a byte in the pipe, so that several wakeups don't fill the pipe up
+
+    def wake(self):
+        with self.lock:
+            if self.pending:
+                return
+            self.pending = True
+            os.write(self.write_fd, "w")
+
+    def wait(self, timeout=None):
+        """Blocks until ``wake()`` is called or ``timeout`` (in seconds) passes. Returns True if woken up, False on timeout. A wakeup that happened before ``wait()`` was called isn't lost - ``wait()`` returns at once."""
+        readable, _, _ = select.select([self.read_fd], [], [], timeout)
+        if not readable:
+            return False
+        with self.lock:
+            os.read(self.read_fd, 1)
+            self.pending = False
+        return True
+
+
+class BaseUIElement():
+    """A base class for UI elements. Subclasses call ``wait_for_exit()`` from ``activate()``, and ``wake_up()`` once ``is_running()`` starts returning False (typically, in ``deactivate()``).
+
+    Subclasses that need to do something periodically while they're active set ``tick_interval`` and override ``tick()``. Ticks aren't periodic by default - call ``schedule_tick()`` whenever the next tick is needed.
+
+    Attributes:
+
+    * ``tick_interval``: default time (in seconds) between ``schedule_tick()`` and the tick
+    * ``next_tick``: time at which ``tick()`` is going to be called, None if no tick is scheduled
+    """
+    tick_interval = 1
+    next_tick = None
+    waiter = None
+
+    def is_running(self):
+        """Returns False once the UI element has exited. By default, checks ``in_foreground``."""
+        return self.in_foreground
+
+    def tick(self):
+        """Is called from the ``activate()`` thread at the time set by ``schedule_tick()``."""
+        pass
+
+    def wait_for_exit(self):
+        """Blocks until ``is_running()`` returns False, calling ``tick()`` when it's scheduled."""
+        waiter = get_waiter()
+        self.waiter = waiter
+        try:
+            while self.is_running():
+                next_tick = self.next_tick
+                timeout = None if next_tick is None else max(next_tick - time(), 0)
+                waiter.wait(timeout)
+                next_tick = self.next_tick
+                if next_tick is not None and next_tick <= time() and self.is_running():
+                    self.next_tick = None
+                    self.tick()
+        finally:
+            self.waiter = None
+
+    def wake_up(self):
+        """Wakes up the ``activate()`` thread, so that it checks ``is_running()`` and ``next_tick`` again."""
+        waiter = self.waiter
+        if waiter is not None:
+            waiter.wake()
+
+    def schedule_tick(self, delay=None):
+        """Schedules ``tick()`` to be called in ``delay`` seconds (``tick_interval`` by default), replacing the tick that's already scheduled, if any."""
+        if delay is None:
+            delay = self.tick_interval
+        previous_tick = self.next_tick
+        self.next_tick = time() + delay
+        if previous_tick is None or previous_tick > self.next_tick:
+            #Otherwise, the thread wakes up for the previous tick and just goes back to sleep until this one
+            self.wake_up()
+
+    def cancel_tick(self):
+        self.next_tick = None
@@ -1,8 +1,9 @@
-from time import sleep
 import logging
 
 import string
 
+from base_ui import BaseUIElement
+
 def to_be_foreground(func): #A safety check wrapper so that certain checks don't get called if menu is not the one active
     def wrapper(self, *args, **kwargs):
         if self.in_foreground:
@@ -11,7 +12,7 @@ def to_be_foreground(func): #A safety check wrapper so that certain checks don't
             return False
     return wrapper
 
-class CharArrowKeysInput():
+class CharArrowKeysInput(BaseUIElement):
     """Implements a character input dialog which allows to input a character string using arrow keys to scroll through characters
 
     Attributes:
@@ -105,8 +106,7 @@ class CharArrowKeysInput():
         logging.info("{0} activated".format(self.name))    
         self.to_foreground() 
         self.o.cursor()
-        while self.in_foreground: #All the work is done in input callbacks
-            sleep(0.1)
+        self.wait_for_exit() #All the work is done in input callbacks
         self.o.noCursor()
         logging.debug(self.name+" exited")
         if self.cancel_flag:
@@ -117,6 +117,7 @@ class CharArrowKeysInput():
     def deactivate(self):
         """ Deactivates the UI element, exiting it and thus making activate() return."""
         self.in_foreground = False
+        self.wake_up()
         logging.info("{0} deactivated".format(self.name))    
 
     def print_value(self):
@@ -214,10 +215,7 @@ class CharArrowKeysInput():
 
     @to_be_foreground
     def set_keymap(self):
-        self.i.stop_listen()
-        self.i.clear_keymap()
-        self.i.keymap = self.keymap
-        self.i.listen()
+        self.i.set_keymap(self.keymap)
 
     def check_for_backspace(self):
         for i, char_value in enumerate(self.value):
@@ -1,7 +1,9 @@
-from time import sleep
 from copy import copy
 import logging
 
+from base_ui import BaseUIElement
+from lazy_contents import LazyContents, ContentsWindow
+
 def to_be_foreground(func): #A safety check wrapper so that certain checks don't get called if menu is not the one active
     def wrapper(self, *args, **kwargs):
         if self.in_foreground:
@@ -10,12 +12,12 @@ def to_be_foreground(func): #A safety check wrapper so that certain checks don't
             return False
     return wrapper
 
-class Checkbox():
+class Checkbox(BaseUIElement):
     """Implements a checkbox which can be used to enable or disable some functions in your application. 
 
     Attributes:
 
-    * ``contents``: list of checkbox elements which was passed either to ``Checkbox`` constructor or to ``checkbox.set_contents()``.
+    * ``contents``: list of checkbox elements which was passed either to ``Checkbox`` constructor or to ``checkbox.set_contents()``. Can also be a ``LazyContents`` object.
        
       Checkbox element structure is a list, where:
          * ``element[0]`` (element's representation) is either a string, which simply has the element's value as it'll be displayed, such as "Menu element 1", or, in case of entry_height > 1, can be a list of strings, each of which represents a corresponding display row occupied by the element.
@@ -60,6 +62,7 @@ class Checkbox():
         self.entry_height = entry_height
         self.append_exit = append_exit
         self.name = name
+        self.default_state = default_state
         self.set_contents(contents)
         self.set_display_callback(o.display_data)
         self.generate_keymap()
@@ -75,15 +78,15 @@ class Checkbox():
         """ A method which is called when checkbox needs to start operating. Is blocking, sets up input&output devices, renders the checkbox and waits until self.in_background is False, while checkbox callbacks are executed from the input device thread."""
         logging.info("checkbox {0} activated".format(self.name))    
         self.to_foreground()
-        while self.in_foreground: #All the work is done in input callbacks
-            sleep(0.1)
+        self.wait_for_exit() #All the work is done in input callbacks
         logging.debug(self.name+" exited")
-        return {self._contents[index][1]:self.states[index] for index, element in enumerate(self._contents)}
+        return {element[1]:self.get_state(index) for index, element in enumerate(self._contents)}
 
     @to_be_foreground
     def deactivate(self):
         """ Deactivates the menu completely, exiting it. As for now, pointer state is preserved through checkbox activations/deactivations """
         self.in_foreground = False
+        self.wake_up()
         logging.info("checkbox {0} deactivated".format(self.name))    
 
     def print_contents(self):
@@ -131,7 +134,7 @@ class Checkbox():
             if self._contents[self.pointer][2] == 'exit':
                 self.deactivate()
                 return
-            self.states[self.pointer] = not self.states[self.pointer] #Just inverting.
+            self.states[self.pointer] = not self.get_state(self.pointer) #Just inverting.
             self.refresh()
                 
     def generate_keymap(self):
@@ -173,6 +176,12 @@ class Checkbox():
 
         If ``self.append_exit`` is set, it goes through the menu and removes every callback which either is ``self.deactivate`` or is just a string 'exit'. 
         |Then, it appends a single ["Exit", '', 'exit'] element at the end of checkbox contents. It makes dynamically appending elements to checkbox easier and makes sure there's only one "Exit" callback, at the bottom of the checkbox."""
+        if isinstance(contents, LazyContents):
+            extra_entries = [["Exit", '', 'exit']] if self.append_exit else []
+            self._contents = ContentsWindow(contents, extra_entries)
+            self.states = {} #Only the states of the elements that were changed or displayed
+            logging.debug("{}: lazy checkbox contents set".format(self.name))
+            return
         self._contents = contents
         self.states = [element[2] if len(element)>1 else self.default_state for element in copy(self._contents)]
         if self.append_exit: 
@@ -180,14 +189,21 @@ class Checkbox():
             self.states.append(False)
         logging.debug("{}: menu contents processed".format(self.name))
 
+    def get_state(self, index):
+        """Returns the state of the element with the given index. For lazy contents, the state is taken from the element when it's needed for the first time."""
+        if isinstance(self.states, dict) and index not in self.states:
+            element = self._contents[index]
+            if len(element) > 2:
+                self.states[index] = False if element[2] == 'exit' else element[2]
+            else:
+                self.states[index] = self.default_state
+        return self.states[index]
+
     @to_be_foreground
     def set_keymap(self):
-        """Generate and sets the input device's keycode-to-callback mapping. Re-starts the input device because ofpassing-variables-between-threads issues."""
+        """Generate and sets the input device's keycode-to-callback mapping. The keymap is replaced at once, without restarting the input listener."""
         self.generate_keymap()
-        self.i.stop_listen()
-        self.i.clear_keymap()
-        self.i.keymap = self.keymap
-        self.i.listen()
+        self.i.set_keymap(self.keymap)
 
     def get_displayed_data(self):
         """Generates the displayed data in a way that the output device accepts. The output of this function can be fed in the o.display_data function.
@@ -211,7 +227,7 @@ class Checkbox():
         disp_entry_positions = range(self.first_displayed_entry, self.last_displayed_entry+1)
         #print("Displayed entries: {}".format(disp_entry_positions))
         for entry_num in disp_entry_positions:
-            displayed_entry = self.render_displayed_entry(entry_num, checked = self.states[entry_num])
+            displayed_entry = self.render_displayed_entry(entry_num, checked = self.get_state(entry_num))
             displayed_data += displayed_entry
         #print("Displayed data: {}".format(displayed_data))
         return displayed_data
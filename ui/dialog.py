@@ -1,7 +1,8 @@
-from time import sleep
 import logging
 
-class DialogBox():
+from base_ui import BaseUIElement
+
+class DialogBox(BaseUIElement):
     """Implements a dialog box with given values (or some default ones if chosen)."""
 
     value_selected = False
@@ -54,8 +55,7 @@ class DialogBox():
         self.value_selected = False
         self.pointer = 0
         self.o.cursor()
-        while self.in_foreground: #All the work is done in input callbacks
-            sleep(0.1)
+        self.wait_for_exit() #All the work is done in input callbacks
         self.o.noCursor()
         logging.debug(self.name+" exited")
         if self.value_selected:
@@ -65,6 +65,7 @@ class DialogBox():
 
     def deactivate(self):
         self.in_foreground = False
+        self.wake_up()
         logging.info("{0} deactivated".format(self.name))    
 
     def generate_keymap(self):
@@ -76,10 +77,7 @@ class DialogBox():
         }
 
     def set_keymap(self):
-        self.i.stop_listen()
-        self.i.clear_keymap()
-        self.i.keymap = self.keymap
-        self.i.listen()
+        self.i.set_keymap(self.keymap)
 
     def move_left(self):
         if self.pointer == 0:
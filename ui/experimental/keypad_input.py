@@ -98,11 +98,8 @@ class NumberKeypadInputLayer():
 
     @to_be_foreground
     def set_keymap(self):
-        self.i.stop_listen()
-        self.i.clear_keymap()
-        self.i.keymap = self.keymap
         self.i.set_streaming(self.process_keycode)
-        self.i.listen()
+        self.i.set_keymap(self.keymap)
 
     def get_displayed_data(self):
         """Experimental: not meant for 2x16 displays
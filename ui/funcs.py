@@ -1,3 +1,8 @@
+def accepts_count(callback):
+    """Marks a keymap callback as accepting a ``count`` argument - the number of times its key was pressed. If the key is pressed several times before the callback gets called (for example, when it's held down on a keyboard), ``InputListener`` calls the callback once, passing the count to it, instead of calling it again and again. Returns the callback, so it can be used as a decorator."""
+    callback.accepts_count = True
+    return callback
+
 def ellipsize(string, length, ellipsis="..."):
     if len(string) <= length:
         return string
@@ -0,0 +1,123 @@
+"""Contents for ``Menu``, ``Listbox`` and ``Checkbox`` which aren't stored as a list, but are fetched when they're needed.
+
+A menu only shows a couple of entries at a time, so, for lists with hundreds or thousands of entries (directory listings, package lists, systemd units), making a list with all of them (and a callback for each one) is mostly wasted work. Instead, you can pass an object that tells the number of entries and returns an entry by its index - UI elements will only fetch the entries they display, along with a few neighbours, so that moving through the list doesn't need a fetch for every keypress.
+
+Entries are in the same format as the list elements would be (for example, ``["Entry name", callback]`` for a ``Menu``)."""
+
+class LazyContents():
+    """A base class for lazy contents. Subclasses implement ``__len__`` and ``get_entry(index)``. If fetching several entries at once is cheaper than fetching them one by one (for example, they come from a database query), ``get_entries(start, stop)`` can be implemented, too. If the entries' labels are known without making the entries (for example, they're file names), ``get_labels()`` can be implemented, so that menus can jump to entries by their labels.
+
+    Supports indexing (including negative indices and slices), iteration and ``len()``, so it can be used in most places where a list can be used."""
+
+    def __len__(self):
+        """Returns the number of entries. Has to be implemented by subclasses."""
+        raise NotImplementedError
+
+    def get_entry(self, index):
+        """Returns an entry by its index, which is always in ``range(len(self))``. Has to be implemented by subclasses."""
+        raise NotImplementedError
+
+    def get_entries(self, start, stop):
+        """Returns a list of entries from ``start`` to ``stop`` (not including ``stop``), both always being in ``range(len(self)+1)``."""
+        return [self.get_entry(index) for index in range(start, stop)]
+
+    def get_labels(self):
+        """Returns a list of labels (first elements) of all the entries, or None if they can't be listed without making the entries - then, menus don't support jumping to entries, since that'd fetch all of them. Is called every time a menu using the contents is activated, so it should return quickly."""
+        return None
+
+    def __getitem__(self, index):
+        length = len(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(length)
+            return self.get_entries(start, max(start, stop))[::step]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("lazy contents index out of range")
+        return self.get_entry(index)
+
+    def __iter__(self, chunk_size=32):
+        length = len(self)
+        for start in range(0, length, chunk_size):
+            for entry in self.get_entries(start, min(start+chunk_size, length)):
+                yield entry
+
+
+class FunctionContents(LazyContents):
+    """Lazy contents made from a length and a function returning an entry by its index, such as:
+
+    ``FunctionContents(len(units), lambda index: [units[index]["name"], lambda: show_unit(units[index])])``
+    """
+
+    def __init__(self, length, get_entry, get_labels=None):
+        """Args:
+
+            * ``length``: number of entries, or a function returning it
+            * ``get_entry``: function that takes an index and returns an entry
+
+        Kwargs:
+
+            * ``get_labels``: function that returns the labels of all the entries, see ``LazyContents.get_labels``
+
+        """
+        self.length = length
+        self.get_entry = get_entry
+        if get_labels is not None:
+            self.get_labels = get_labels
+
+    def __len__(self):
+        return self.length() if callable(self.length) else self.length
+
+
+class ContentsWindow(LazyContents):
+    """Is used by UI elements to access lazy contents. Keeps a window of entries around the last fetched one, so that moving the pointer and re-rendering the display mostly doesn't fetch anything, adds entries after the lazy contents' ones (such as "Exit") and passes fetched entries through ``process_entry``.
+
+    Call ``invalidate()`` after the lazy contents change."""
+
+    def __init__(self, contents, extra_entries=[], process_entry=None, window_size=16):
+        """Args:
+
+            * ``contents``: a ``LazyContents`` object
+
+        Kwargs:
+
+            * ``extra_entries``: list of entries to add after the lazy contents' ones
+            * ``process_entry``: function called for every fetched entry, returning the entry the UI element is going to use
+            * ``window_size``: number of entries fetched at once
+
+        """
+        self.contents = contents
+        self.extra_entries = extra_entries
+        self.process_entry = process_entry
+        self.window_size = window_size
+        self.invalidate()
+
+    def invalidate(self):
+        self.window = (0, [])
+
+    def __len__(self):
+        return len(self.contents) + len(self.extra_entries)
+
+    def get_entry(self, index):
+        start, entries = self.window
+        if start <= index < start+len(entries):
+            return entries[index-start]
+        content_length = len(self.contents)
+        if index >= content_length:
+            return self.extra_entries[index-content_length]
+        #Fetching a window with the entry in the middle, so that moving in both directions is covered
+        start = max(0, min(index - self.window_size/2, content_length - self.window_size))
+        entries = self.contents.get_entries(start, min(start+self.window_size, content_length))
+        if self.process_entry is not None:
+            entries = [self.process_entry(entry) for entry in entries]
+        self.window = (start, entries)
+        return entries[index-start]
+
+    def get_entries(self, start, stop):
+        return [self.get_entry(index) for index in range(start, stop)]
+
+    def get_labels(self):
+        labels = self.contents.get_labels()
+        if labels is None:
+            return None
+        return list(labels) + [entry[0] for entry in self.extra_entries]
@@ -1,16 +1,16 @@
-from time import sleep
 from copy import copy
 import logging
 
 from printer import Printer
 from menu import Menu, to_be_foreground
+from lazy_contents import LazyContents, ContentsWindow
 
 class Listbox(Menu):
     """Implements a listbox to choose one thing from many.
 
     Attributes:
 
-    * ``contents``: list of listbox elements
+    * ``contents``: list of listbox elements, or a ``LazyContents`` object
        
       Listbox element is a list, where:
          * ``element[0]`` (element's representation) is either a string, which simply has the element's value as it'll be displayed, such as "Menu element 1", or, in case of entry_height > 1, can be a list of strings, each of which represents a corresponding display row occupied by the element.
@@ -55,13 +55,12 @@ class Listbox(Menu):
         self.scrolling={"enabled":scrolling,       
                         "current_finished":False,  
                         "current_scrollable":False,
-                        "counter":0,               
                         "pointer":0}               
 
     def to_foreground(self):
         """ Is called when listbox ``activate()`` method is used, sets flags and performs all the actions so that menu can display its contents and receive keypresses. Also, updates the output device with rendered currently displayed menu elements."""
         logging.info("{0} enabled".format(self.name))    
-        self.scrolling["counter"] = 0
+        self.cancel_tick()
         self.in_foreground = True
         self.refresh()
         self.set_keymap()
@@ -73,19 +72,21 @@ class Listbox(Menu):
         if len(self.contents) == 0:
             Printer(["Nothing to", "choose from"], i, o)
             return None
-        while self.in_foreground: #All the work is done in input callbacks
-            sleep(0.1)
-            self.scroll()
+        self.wait_for_exit() #All the work is done in input callbacks
         logging.debug(self.name+" exited")
         if self.selected_element is None:
             return None
-        return self.contents[self.selected_element][1]
+        return self._contents[self.selected_element][1]
 
     def deactivate(self):
         """ Deactivates the listbox completely, exiting it. As for now, pointer state is preserved through menu activations/deactivations """
         self.in_foreground = False
+        self.wake_up()
         logging.info("{0} deactivated".format(self.name))    
 
+    def is_running(self):
+        return self.in_foreground
+
     @to_be_foreground
     def select_element(self):
         """ Gets the currently specified element's index and sets it as selected_element attribute.
@@ -99,7 +100,16 @@ class Listbox(Menu):
 
         If ``self.append_exit`` is set, it goes through the menu and removes every callback which either is ``self.deactivate`` or is just a string 'exit'. 
         |Then, it appends a single ["Exit", 'exit'] element at the end of menu contents. It makes dynamically appending elements to menu easier and makes sure there's only one "Exit" callback, at the bottom of the menu."""
+        if isinstance(self.contents, LazyContents):
+            extra_entries = [["Exit", None]] if self.append_exit else []
+            self._contents = ContentsWindow(self.contents, extra_entries)
+            logging.debug("{}: lazy listbox contents set".format(self.name))
+            return
         if self.append_exit: 
             self.contents.append(["Exit", None])
         self._contents = self.contents 
         logging.debug("{}: listbox contents processed".format(self.name))
+
+    def process_entry(self, entry):
+        """Listbox elements have values instead of callbacks, so they don't need processing."""
+        return entry
@@ -1,8 +1,15 @@
-from time import sleep
 from copy import copy
+from time import time
+from bisect import bisect_left
 import logging
+import string
 from threading import Event
 
+from base_ui import BaseUIElement
+from funcs import accepts_count
+from lazy_contents import LazyContents, ContentsWindow
+from char_input import CharArrowKeysInput
+
 def to_be_foreground(func): #A safety check wrapper so that certain checks don't get called if menu is not the one active
     def wrapper(self, *args, **kwargs):
         if self.in_foreground:
@@ -16,12 +23,58 @@ class MenuExitException(Exception):
     pass
 
 
-class Menu():
+class PrefixIndex():
+    """Finds menu elements by the beginning of their labels, ignoring case.
+
+    Labels are kept sorted, so the ones starting with a given prefix are next to each other and are found with a binary search. Which of them comes first in the menu is found with a tree of minimum menu positions over the sorted labels, so a lookup takes O(log n) no matter how many labels match."""
+
+    def __init__(self, labels):
+        """Args:
+
+            * ``labels``: labels of the menu elements, in menu order
+
+        """
+        entries = sorted([(label.lower(), index) for index, label in enumerate(labels)])
+        self.labels = [label for label, _ in entries]
+        self.size = len(entries)
+        #Node n has nodes 2n and 2n+1 as children and holds the minimum of their positions, leaves are the positions of the sorted labels
+        self.tree = [None]*self.size + [index for _, index in entries]
+        for node in range(self.size-1, 0, -1):
+            self.tree[node] = min(self.tree[2*node], self.tree[2*node+1])
+
+    def find(self, prefix):
+        """Returns the index of the first element (in menu order) whose label starts with ``prefix``, which has to be lowercase. Returns None if there's no such element."""
+        start = bisect_left(self.labels, prefix)
+        #Finding where the labels starting with the prefix end
+        low, high = start, self.size
+        length = len(prefix)
+        while low < high:
+            middle = (low+high)/2
+            if self.labels[middle][:length] == prefix:
+                low = middle+1
+            else:
+                high = middle
+        #Minimum position in the [start, low) range of leaves
+        positions = []
+        low, high = start+self.size, low+self.size
+        while low < high:
+            if low & 1:
+                positions.append(self.tree[low])
+                low += 1
+            if high & 1:
+                high -= 1
+                positions.append(self.tree[high])
+            low /= 2
+            high /= 2
+        return min(positions) if positions else None
+
+
+class Menu(BaseUIElement):
     """Implements a menu which can be used to navigate through your application, output a list of values or select actions to perform. Is one of the most used elements, used both in system core and in most of the applications.
 
     Attributes:
 
-    * ``contents``: list of menu elements which was passed either to ``Menu`` constructor or to ``menu.set_contents()``.
+    * ``contents``: list of menu elements which was passed either to ``Menu`` constructor or to ``menu.set_contents()``. Can also be a ``LazyContents`` object, for menus with a lot of elements - then, elements are only fetched when they're displayed.
        
       Menu element structure is a list, where:
          * ``element[0]`` (element's representation) is either a string, which simply has the element's value as it'll be displayed, such as "Menu element 1", or, in case of entry_height > 1, can be a list of strings, each of which represents a corresponding display row occupied by the element.
@@ -37,6 +90,10 @@ class Menu():
     * ``first_displayed_entry`` : Internal pointer which points to the number of ``self._contents`` element which is at the topmost position of the menu as it's currently displayed on the screen
     * ``last_displayed_entry`` : Internal pointer which points to the number of ``self._contents`` element which is at the lowest position of the menu as it's currently displayed on the screen
     * ``no_entry_message`` : The entry displayed in case menu has no elements
+    * ``render_cache`` : Rendered menu elements, see ``get_rendered_entry``
+    * ``jump_prefix`` : Beginning of an element's label being typed to jump to that element, see ``type_char``
+    * ``prefix_index`` : ``PrefixIndex`` of menu elements, built on the first jump after menu contents are set or changed
+    * ``tick_interval`` : Time (in seconds) between scrolling steps of an entry that doesn't fit on the display
 
     """
     contents = []
@@ -49,6 +106,14 @@ class Menu():
     last_displayed_entry = None
     exit_exception = False
     no_entry_message = "No menu entries"
+    render_cache = {}
+    render_cache_size = 32
+    jump_prefix = ""
+    jump_timeout = 1
+    last_typed = 0
+    prefix_index = None
+    jump_keymap = None
+    jump_chars = {"KEY_SPACE":" ", "KEY_MINUS":"-", "KEY_DOT":"."}
 
     def __init__(self, contents, i, o, name="Menu", entry_height=1, append_exit=True, catch_exit=True, exitable=True, contents_hook=None, scrolling=True):
         """Initialises the Menu object.
@@ -76,7 +141,6 @@ class Menu():
         self.scrolling={"enabled":scrolling,
                         "current_finished":False,
                         "current_scrollable":False,
-                        "counter":0,
                         "pointer":0}
         self.set_contents(contents)
         self.catch_exit = catch_exit
@@ -102,7 +166,7 @@ class Menu():
             new_contents = self.contents_hook()
             old_contents = self._contents
             self.set_contents(new_contents)
-        self.scrolling["counter"] = 0
+        self.cancel_tick()
         self.in_background = True
         self.in_foreground = True
         self.refresh()
@@ -120,9 +184,7 @@ class Menu():
         logging.info("menu {0} activated".format(self.name))    
         self.exit_exception = False
         self.to_foreground() 
-        while self.in_background: #All the work is done in input callbacks
-            sleep(0.1)
-            self.scroll()
+        self.wait_for_exit() #All the work is done in input callbacks
         if self.exit_exception:
             if self.catch_exit == False:
                 raise MenuExitException
@@ -133,21 +195,31 @@ class Menu():
         """ Deactivates the menu completely, exiting it. As for now, pointer state is preserved through menu activations/deactivations """
         self.in_foreground = False
         self.in_background = False
+        self.wake_up()
         logging.info("menu {0} deactivated".format(self.name))    
 
+    def is_running(self):
+        return self.in_background
+
+    def tick(self):
+        self.scroll()
+
+    def scrolling_needed(self):
+        """Tells if the currently selected entry doesn't fit on the display and hasn't been scrolled through to the end yet."""
+        return self.scrolling["enabled"] and self.scrolling["current_scrollable"] and not self.scrolling["current_finished"]
+
     @to_be_foreground
     def scroll(self):
-        if self.scrolling["enabled"] and not self.scrolling["current_finished"] and self.scrolling["current_scrollable"]:
-            self.scrolling["counter"] += 1
-            if self.scrolling["counter"] == 10:
-                self.scrolling["pointer"] += 1
-                self.scrolling["counter"] = 0
-                self.refresh()
+        """Scrolls the currently selected entry by one character. Is called every ``tick_interval`` seconds while scrolling is needed - ``refresh`` schedules the next call."""
+        if self.scrolling_needed():
+            self.scrolling["pointer"] += 1
+            self.refresh()
             
     def reset_scrolling(self):
         self.scrolling["current_finished"] = False
         self.scrolling["pointer"] = 0
-        self.scrolling["counter"] = 0
+        if self.next_tick is not None: #Starting to wait for the first scrolling step again
+            self.schedule_tick()
 
     def print_contents(self):
         """ A debug method. Useful for hooking up to an input event so that you can see the representation of menu's contents. """
@@ -158,13 +230,13 @@ class Menu():
         logging.info("Active menu is {0}".format(self.name))    
 
     @to_be_foreground
-    def move_down(self):
-        """ Moves the pointer one element down, if possible. 
+    def move_down(self, count=1):
+        """ Moves the pointer ``count`` elements down, or as far as possible. 
         |Is typically used as a callback from input event processing thread.
         |TODO: support going from bottom to top when pressing "down" with last menu element selected."""
         if self.pointer < (len(self._contents)-1):
             logging.debug("moved down")
-            self.pointer += 1  
+            self.pointer = min(self.pointer + count, len(self._contents)-1)
             self.reset_scrolling()
             self.refresh()    
             return True
@@ -184,13 +256,13 @@ class Menu():
         return True
 
     @to_be_foreground
-    def move_up(self):
-        """ Moves the pointer one element up, if possible. 
+    def move_up(self, count=1):
+        """ Moves the pointer ``count`` elements up, or as far as possible. 
         |Is typically used as a callback from input event processing thread.
         |TODO: support going from top to bottom when pressing "up" with first menu element selected."""
         if self.pointer != 0:
             logging.debug("moved up")
-            self.pointer -= 1
+            self.pointer = max(self.pointer - count, 0)
             self.refresh()
             self.reset_scrolling()
             return True
@@ -234,17 +306,105 @@ class Menu():
         else:
             self.to_foreground()
 
+    def can_jump(self):
+        """Returns whether elements can be jumped to. Lazy contents only support it if they can list the labels without making the elements (see ``LazyContents.get_labels``), since otherwise, building the index would fetch all of them."""
+        return not isinstance(self._contents, ContentsWindow) or self._contents.get_labels() is not None
+
+    def get_entry_labels(self):
+        """Returns the labels of the menu elements (for multi-row elements, their first rows), in menu order, to build the index for jumping to elements. Returns None if jumping isn't supported (see ``can_jump``)."""
+        if isinstance(self._contents, ContentsWindow):
+            labels = self._contents.get_labels()
+            if labels is None:
+                return None
+        else:
+            labels = [entry[0] for entry in self._contents]
+        return [(label[0] if label else "") if type(label) == list else label for label in labels]
+
+    def get_prefix_index(self):
+        """Returns the ``PrefixIndex`` of menu elements, building it if the contents changed since it was built. Returns None if jumping isn't supported."""
+        if self.prefix_index is None:
+            labels = self.get_entry_labels()
+            if labels is None:
+                return None
+            self.prefix_index = PrefixIndex(labels)
+        return self.prefix_index
+
+    @to_be_foreground
+    def jump_to_prefix(self, prefix):
+        """Moves the pointer to the first element whose label starts with ``prefix``, ignoring case. Returns False if there's no such element, or if jumping isn't supported.
+
+        The index is built from ``get_entry_labels()`` the first time this method is called after the contents change."""
+        prefix_index = self.get_prefix_index()
+        if prefix_index is None:
+            return False
+        index = prefix_index.find(prefix.lower())
+        if index is None:
+            return False
+        if index != self.pointer:
+            self.pointer = index
+            self.reset_scrolling()
+            self.refresh()
+        return True
+
+    @to_be_foreground
+    def type_char(self, char):
+        """Adds a character to ``jump_prefix`` and jumps to the first element starting with it. If more than ``jump_timeout`` seconds passed since the previous character, the prefix is started over. If no element starts with the prefix, it's started over with this character.
+        |Is typically used as a callback for letter and number keys."""
+        now = time()
+        if now - self.last_typed > self.jump_timeout:
+            self.jump_prefix = ""
+        self.last_typed = now
+        if char == "\b":
+            self.jump_prefix = self.jump_prefix[:-1]
+            if self.jump_prefix:
+                self.jump_to_prefix(self.jump_prefix)
+            return
+        self.jump_prefix += char
+        if not self.jump_to_prefix(self.jump_prefix) and len(self.jump_prefix) > 1:
+            self.jump_prefix = char
+            self.jump_to_prefix(char)
+
+    @to_be_foreground
+    def jump_prompt(self):
+        """Asks for the beginning of an element's label with ``CharArrowKeysInput`` and jumps to the first element starting with it. For devices without letter keys."""
+        self.to_background()
+        prefix = CharArrowKeysInput(self.i, self.o, message="Jump to:", allowed_chars=["][c", "][n", "][S", "][s"], name=self.name+" jump prompt").activate()
+        if self.in_background:
+            self.to_foreground()
+            if prefix:
+                self.jump_to_prefix(prefix)
+
+    def get_jump_keymap(self):
+        """Returns keymap entries for jumping to elements: letter, number and some punctuation keys call ``type_char``, ``KEY_BACKSPACE`` removes the last typed character and ``KEY_RIGHT_HOLD`` calls ``jump_prompt``. The entries are only made once, since the keymap is generated every time the menu goes to foreground. Returns an empty keymap if jumping isn't supported (see ``can_jump``)."""
+        if not self.can_jump():
+            return {}
+        if self.jump_keymap is not None:
+            return dict(self.jump_keymap)
+        keymap = {"KEY_RIGHT_HOLD":lambda: self.jump_prompt(),
+                  "KEY_BACKSPACE":lambda: self.type_char("\b")}
+        for char in string.ascii_lowercase + string.digits:
+            keymap["KEY_"+char.upper()] = lambda char=char: self.type_char(char)
+        for char in string.digits:
+            keymap["KEY_KP"+char] = lambda char=char: self.type_char(char)
+        for key, char in self.jump_chars.items():
+            keymap[key] = lambda char=char: self.type_char(char)
+        self.jump_keymap = keymap
+        return dict(keymap)
+
     def generate_keymap(self):
         """Sets the keymap. In future, will allow per-system keycode-to-callback tweaking using a config file. """
-        keymap = {
+        keymap = self.get_jump_keymap()
+        keymap.update({
             "KEY_RIGHT":lambda: self.print_name(),
-            "KEY_UP":lambda: self.move_up(),
-            "KEY_DOWN":lambda: self.move_down(),
+            "KEY_UP":accepts_count(lambda count=1: self.move_up(count)),
+            "KEY_DOWN":accepts_count(lambda count=1: self.move_down(count)),
             "KEY_PAGEUP":lambda: self.page_up(),
             "KEY_PAGEDOWN":lambda: self.page_down(),
+            "KEY_UP_HOLD":lambda: self.page_up(),
+            "KEY_DOWN_HOLD":lambda: self.page_down(),
             "KEY_KPENTER":lambda: self.select_element(),
             "KEY_ENTER":lambda: self.select_element()
-            }
+            })
         if self.exitable:
             keymap["KEY_LEFT"] = lambda: self.deactivate()
         self.keymap = keymap
@@ -253,6 +413,8 @@ class Menu():
         """Sets the menu contents, as well as additionally re-sets ``last`` & ``first_displayed_entry`` pointers and calculates the value for ``last_displayed_entry`` pointer."""
         self.contents = contents
         self.process_contents()
+        self.render_cache = {}
+        self.prefix_index = None
         #Calculating the pointer to last element displayed
         if len(self._contents) == 0:
             self.last_displayed_entry = 0
@@ -270,19 +432,125 @@ class Menu():
         #print("First displayed entry is {}".format(self.first_displayed_entry))
         #print("Last displayed entry is {}".format(self.last_displayed_entry))
 
+    def contents_changed(self):
+        """Is to be called after lazy contents have changed. Drops all the fetched and rendered elements and refreshes the menu, keeping the pointer and the displayed part of the menu in place where possible."""
+        if isinstance(self._contents, ContentsWindow):
+            self._contents.invalidate()
+        self.render_cache = {}
+        self.prefix_index = None
+        self.fix_viewport()
+        self.refresh()
+
+    def check_mutable(self):
+        if isinstance(self._contents, ContentsWindow):
+            raise TypeError("{}: lazy contents can't be changed through the menu - change them and call contents_changed()".format(self.name))
+
+    def get_entry_count(self):
+        """Returns the number of menu elements, not counting the "Exit" element added by ``append_exit``."""
+        return len(self._contents) - 1 if self.append_exit and self._contents else len(self._contents)
+
+    def check_index(self, index):
+        """Checks the index of an element that's going to be changed or removed, returns it as a non-negative index. Negative indices count from the last element before the "Exit" element added by ``append_exit`` - the "Exit" element itself can't be changed or removed, raises ``IndexError`` then."""
+        entry_count = self.get_entry_count()
+        if index < 0:
+            index += entry_count
+        if not 0 <= index < entry_count:
+            if self.append_exit and index == entry_count:
+                raise IndexError("{}: the \"Exit\" element can't be changed or removed, set append_exit to False to manage it yourself".format(self.name))
+            raise IndexError("{}: element index out of range".format(self.name))
+        return index
+
+    def insert_entry(self, index, entry, refresh=True):
+        """Inserts an element before the element with the given index - or, if the index is past the last element, appends the element (before the "Exit" element if ``append_exit`` is set). The selected element stays selected, and the displayed elements stay on the screen, unless the new element is inserted among them.
+
+        Set ``refresh`` to False when changing several elements at once, and call ``refresh()`` afterwards."""
+        self.check_mutable()
+        index = min(index, self.get_entry_count())
+        self._contents.insert(index, self.process_entry(entry))
+        self.shift_entries(index, 1)
+        if refresh:
+            self.refresh()
+
+    def append_entry(self, entry, refresh=True):
+        self.insert_entry(self.get_entry_count(), entry, refresh=refresh)
+
+    def remove_entry(self, index, refresh=True):
+        """Removes an element and returns it. If the removed element was selected, the next one gets selected. The displayed elements stay on the screen where possible. The "Exit" element added by ``append_exit`` can't be removed."""
+        self.check_mutable()
+        index = self.check_index(index)
+        entry = self._contents.pop(index)
+        self.shift_entries(index, -1)
+        if refresh:
+            self.refresh()
+        return entry
+
+    def update_entry(self, index, entry, refresh=True):
+        """Replaces an element. Only this element is rendered again on the next refresh."""
+        self.check_mutable()
+        index = self.check_index(index)
+        self.invalidate_entry(self._contents[index]) #In case it's the same element object, changed in place
+        self._contents[index] = self.process_entry(entry)
+        self.prefix_index = None
+        if index == self.pointer:
+            self.reset_scrolling()
+        if refresh:
+            self.refresh()
+
+    def move_entry(self, index, new_index, refresh=True):
+        """Moves an element to a new position. If the element was selected, it stays selected."""
+        index = self.check_index(index)
+        selected = index == self.pointer
+        entry = self.remove_entry(index, refresh=False)
+        self.insert_entry(new_index, entry, refresh=False)
+        if selected:
+            self.pointer = min(new_index, self.get_entry_count()-1)
+        if refresh:
+            self.refresh()
+
+    def shift_entries(self, index, delta):
+        """Is called after an element is inserted at ``index`` (``delta`` is 1) or removed from it (``delta`` is -1). Moves the pointer and the displayed part of the menu along with the elements that were moved."""
+        def shift(entry_num):
+            if entry_num > index or (entry_num == index and delta > 0):
+                return entry_num + delta
+            return entry_num
+        self.prefix_index = None
+        removed_pointer = delta < 0 and self.pointer == index
+        self.pointer = shift(self.pointer)
+        if removed_pointer:
+            self.reset_scrolling()
+        self.first_displayed_entry = shift(self.first_displayed_entry) #If the first displayed element is removed, the next one takes its place
+        self.fix_viewport()
+
+    def fix_viewport(self):
+        """Makes the displayed part of the menu start at ``first_displayed_entry`` and fill the screen, unless there aren't enough elements after it, and keeps the pointer in range."""
+        entry_count = len(self._contents)
+        full_entries_shown = self.o.rows/self.entry_height
+        self.pointer = max(0, min(self.pointer, entry_count-1))
+        self.first_displayed_entry = max(0, min(self.first_displayed_entry, entry_count-full_entries_shown))
+        self.last_displayed_entry = max(0, min(self.first_displayed_entry+full_entries_shown, entry_count)-1)
+
     def process_contents(self):
         """Processes contents for custom callbacks. Currently, only 'exit' calbacks are supported.
 
         If ``self.append_exit`` is set, it goes through the menu and removes every callback which either is ``self.deactivate`` or is just a string 'exit'. 
-        |Then, it appends a single ["Exit", 'exit'] element at the end of menu contents. It makes dynamically appending elements to menu easier and makes sure there's only one "Exit" callback, at the bottom of the menu."""
+        |Then, it appends a single ["Exit", 'exit'] element at the end of menu contents. It makes dynamically appending elements to menu easier and makes sure there's only one "Exit" callback, at the bottom of the menu.
+
+        If contents are ``LazyContents``, they aren't gone through - 'exit' callbacks are replaced as the entries are fetched, and the "Exit" element is appended without looking for other ones."""
         #Let's fix the pointer if it needs to be fixed
         old_contents = self._contents
-        self._contents = self.contents
+        if isinstance(self.contents, LazyContents):
+            extra_entries = [["Exit", self.deactivate]] if self.append_exit else []
+            self._contents = ContentsWindow(self.contents, extra_entries, process_entry=self.process_entry)
+        else:
+            self._contents = self.contents
         if len(self._contents) < len(old_contents) and self.pointer > len(self._contents)-1:
             if len(self._contents) > 0:
                 self.pointer = len(self._contents) - 1 #Pointer went too far, setting it to last entry available
             else:
                 self.pointer = 0 #No elements, pointer should be 0
+        if isinstance(self._contents, ContentsWindow):
+            logging.debug("{}: lazy menu contents set".format(self.name))
+            return
         if self.append_exit: 
             element_callbacks = [element[1] if len(element)>1 else None for element in copy(self._contents)]
             for index, callback in enumerate(element_callbacks):
@@ -295,14 +563,17 @@ class Menu():
                     entry[1] = self.deactivate
         logging.debug("{}: menu contents processed".format(self.name))
 
+    def process_entry(self, entry):
+        """Processes an entry fetched from lazy contents, replacing an 'exit' callback with ``self.deactivate``."""
+        if len(entry) > 1 and entry[1] == "exit":
+            return [entry[0], self.deactivate] + list(entry[2:])
+        return entry
+
     @to_be_foreground
     def set_keymap(self):
-        """Generate and sets the input device's keycode-to-callback mapping. Re-starts the input device because ofpassing-variables-between-threads issues."""
+        """Generate and sets the input device's keycode-to-callback mapping. The keymap is replaced at once, without restarting the input listener."""
         self.generate_keymap()
-        self.i.stop_listen()
-        self.i.clear_keymap()
-        self.i.keymap = self.keymap
-        self.i.listen()
+        self.i.set_keymap(self.keymap)
 
     def get_displayed_data(self):
         """Generates the displayed data in a way that the output device accepts. The output of this function can be fed in the o.display_data function.
@@ -325,13 +596,49 @@ class Menu():
             #print("Last displayed entry is {}".format(self.last_displayed_entry))
         disp_entry_positions = range(self.first_displayed_entry, self.last_displayed_entry+1)
         #print("Displayed entries: {}".format(disp_entry_positions))
+        used_keys = []
         for entry_num in disp_entry_positions:
             is_active = entry_num == self.pointer
-            displayed_entry = self.render_displayed_entry(entry_num, active=is_active)
-            displayed_data += displayed_entry
+            key, rendered_entry = self.get_rendered_entry(entry_num, active=is_active)
+            used_keys.append(key)
+            displayed_data += rendered_entry
+        if len(self.render_cache) > self.render_cache_size: #Keeping only the elements that are displayed
+            self.render_cache = {key:self.render_cache[key] for key in used_keys if key in self.render_cache}
         #print("Displayed data: {}".format(displayed_data))
         return displayed_data
 
+    def get_rendered_entry(self, entry_num, active=False):
+        """Returns a ``(key, rendered_entry)`` tuple for a menu element, taking the rendered element from ``self.render_cache`` if it's there, and rendering it (and putting it in the cache) if it's not.
+
+        The cache key is the element's identity, whether the element is selected, how far it's scrolled and the display geometry, so moving the pointer or scrolling an element only renders the elements that look different. Elements that are changed through ``update_entry`` are removed from the cache."""
+        entry = self._contents[entry_num]
+        scroll_offset = 0
+        if active:
+            self.update_scrolling(entry[0])
+            if self.scrolling["current_scrollable"] and not self.scrolling["current_finished"]:
+                scroll_offset = self.scrolling["pointer"]
+        key = (id(entry), active, scroll_offset, self.o.cols, self.entry_height)
+        cached = self.render_cache.get(key, None)
+        if cached is not None and cached[0] is entry:
+            return key, cached[1]
+        rendered_entry = self.render_displayed_entry(entry_num, active=active)
+        self.render_cache[key] = (entry, rendered_entry) #Keeping the element referenced, so that its id isn't reused while it's in the cache
+        return key, rendered_entry
+
+    def invalidate_entry(self, entry):
+        """Removes a menu element from the render cache."""
+        entry_id = id(entry)
+        self.render_cache = {key:value for key, value in self.render_cache.items() if key[0] != entry_id}
+
+    def update_scrolling(self, entry_content):
+        """Checks whether the selected element doesn't fit on the display and whether it's been scrolled to the end."""
+        if type(entry_content) in [str, unicode]:
+            avail_display_chars = (self.o.cols*self.entry_height)-1 #1 char for "*"/" "
+            self.scrolling["current_scrollable"] = len(entry_content) > avail_display_chars
+            self.scrolling["current_finished"] = len(entry_content)-self.scrolling["pointer"] < avail_display_chars
+        else: #Scrolling only works with strings for now
+            self.scrolling["current_scrollable"] = False
+
     def render_displayed_entry(self, entry_num, active=False):
         """Renders a menu element by its position number in self._contents, determined also by display width, self.entry_height and element's representation type.
         If element's representation is a string, splits it into parts as long as the display's width in characters.
@@ -344,10 +651,7 @@ class Menu():
         display_columns = self.o.cols
         if type(entry_content) in [str, unicode]: 
             if active:
-                #Scrolling only works with strings for now
-                avail_display_chars = (self.o.cols*self.entry_height)-1 #1 char for "*"/" "
-                self.scrolling["current_scrollable"] = len(entry_content) > avail_display_chars
-                self.scrolling["current_finished"] = len(entry_content)-self.scrolling["pointer"] < avail_display_chars
+                self.update_scrolling(entry_content)
                 if self.scrolling["current_scrollable"] and not self.scrolling["current_finished"]:
                     entry_content = entry_content[self.scrolling["pointer"]:]
                 rendered_entry.append("*"+entry_content[:display_columns-1]) #First part of string displayed
@@ -372,3 +676,5 @@ class Menu():
     def refresh(self):
         logging.debug("{0}: refreshed data on display".format(self.name))
         self.o.display_data(*self.get_displayed_data())
+        if self.scrolling_needed() and self.next_tick is None:
+            self.schedule_tick()
@@ -1,7 +1,9 @@
-from time import sleep
 from copy import copy
 import logging
 
+from base_ui import BaseUIElement
+from funcs import accepts_count
+
 def to_be_foreground(func): #A safety check wrapper so that certain checks don't get called if menu is not the one active
     def wrapper(self, *args, **kwargs):
         if self.in_foreground:
@@ -10,7 +12,7 @@ def to_be_foreground(func): #A safety check wrapper so that certain checks don't
             return False
     return wrapper
 
-class IntegerAdjustInput():
+class IntegerAdjustInput(BaseUIElement):
     """Implements a simple number input dialog which allows you to increment/decrement a number using  which can be used to navigate through your application, output a list of values or select actions to perform. Is one of the most used elements, used both in system core and in most of the applications.
 
     Attributes:
@@ -69,14 +71,14 @@ class IntegerAdjustInput():
         This method returns None when the UI element was exited by KEY_LEFT and thus it's assumed changes to the number were not accepted."""
         logging.info("{0} activated".format(self.name))    
         self.to_foreground() 
-        while self.in_foreground: #All the work is done in input callbacks
-            sleep(0.1)
+        self.wait_for_exit() #All the work is done in input callbacks
         logging.debug(self.name+" exited")
         return self.selected_number
 
     def deactivate(self):
         """ Deactivates the UI element, exiting it and thus making activate() return."""
         self.in_foreground = False
+        self.wake_up()
         logging.info("{0} deactivated".format(self.name))    
 
     def print_number(self):
@@ -88,15 +90,15 @@ class IntegerAdjustInput():
         logging.info("{0} active".format(self.name))    
 
     @to_be_foreground
-    def decrement(self):
-        """Decrements the number by selected ``interval``"""
-        self.number -= self.interval
+    def decrement(self, count=1):
+        """Decrements the number by selected ``interval``, ``count`` times"""
+        self.number -= self.interval*count
         self.refresh()    
 
     @to_be_foreground
-    def increment(self):
-        """Increments the number by selected ``interval``"""
-        self.number += self.interval
+    def increment(self, count=1):
+        """Increments the number by selected ``interval``, ``count`` times"""
+        self.number += self.interval*count
         self.refresh()    
 
     @to_be_foreground
@@ -122,8 +124,8 @@ class IntegerAdjustInput():
     def generate_keymap(self):
         self.keymap = {
         "KEY_RIGHT":lambda: self.reset(),
-        "KEY_UP":lambda: self.increment(),
-        "KEY_DOWN":lambda: self.decrement(),
+        "KEY_UP":accepts_count(lambda count=1: self.increment(count)),
+        "KEY_DOWN":accepts_count(lambda count=1: self.decrement(count)),
         "KEY_KPENTER":lambda: self.select_number(),
         "KEY_ENTER":lambda: self.select_number(),
         "KEY_LEFT":lambda: self.exit()
@@ -132,10 +134,7 @@ class IntegerAdjustInput():
     @to_be_foreground
     def set_keymap(self):
         self.generate_keymap()
-        self.i.stop_listen()
-        self.i.clear_keymap()
-        self.i.keymap = self.keymap
-        self.i.listen()
+        self.i.set_keymap(self.keymap)
 
     def get_displayed_data(self):
         return [self.message, str(self.number).rjust(self.o.cols)]
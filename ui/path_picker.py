@@ -1,10 +1,10 @@
 import os
 import logging
-from time import sleep
 from threading import Event
 
 from menu import Menu, MenuExitException, to_be_foreground
 from printer import Printer
+from lazy_contents import FunctionContents, ContentsWindow
 
 class PathPicker(Menu):
     """#Short description
@@ -50,16 +50,13 @@ class PathPicker(Menu):
         self.scrolling={"enabled":scrolling,       
                         "current_finished":False,  
                         "current_scrollable":False,
-                        "counter":0,               
                         "pointer":0}               
 
     def activate(self):
         """ A method which is called when menu needs to start operating. Is blocking, sets up input&output devices, renders the menu and waits until self.in_background is False, while menu callbacks are executed from the input device thread."""
         logging.info("{0} activated".format(self.name))    
         self.to_foreground() 
-        while self.in_background: #All the work is done in input callbacks
-            sleep(0.1)
-            self.scroll()
+        self.wait_for_exit() #All the work is done in input callbacks
         logging.debug(self.name+" exited")
         return self.path_chosen
 
@@ -92,6 +89,7 @@ class PathPicker(Menu):
             "KEY_ENTER":lambda: self.select_element(),
             "KEY_LEFT": lambda: self.go_back()
             }
+        keymap.update(self.get_jump_keymap())
         self.keymap = keymap
 
     def go_back(self):
@@ -102,13 +100,12 @@ class PathPicker(Menu):
         self.goto_dir(parent_path)
 
     def process_contents(self):
-        self._contents = []
+        """Lists the current directory. Entries (and their callbacks) are only made for the files that are displayed, since there can be thousands of files in a directory."""
         self.pointer = 0
+        dots = []
         if self.path != '/':
-            if self.current_dot or self.prev_dot:
-                dot_path = os.path.join(self.path, '.')
-                if self.current_dot: self._contents.append(['.', lambda: self.goto_dir(dot_path)])
-                if self.prev_dot: self._contents.append(['..', lambda: self.goto_dir(dot_path+'.')])
+            if self.current_dot: dots.append('.')
+            if self.prev_dot: dots.append('..')
         path_contents = os.listdir(self.path)
         files = []
         dirs = []
@@ -122,12 +119,18 @@ class PathPicker(Menu):
                     files.append(item)
         dirs.sort()
         files.sort()
-        for dir in dirs:
-            full_path = os.path.join(self.path, dir)
-            self._contents.append([dir, lambda x=full_path: self.goto_dir(x)])
-        for file in files:
-            full_path = os.path.join(self.path, file)
-            self._contents.append([file, lambda x=full_path: self.select_path(x)])
+        self.entry_names = dots + dirs + files
+        self.dir_count = len(dots) + len(dirs)
+        #Labels are the file names, so that jumping to a file doesn't make an entry for every file in the directory
+        self.contents = FunctionContents(len(self.entry_names), self.get_path_entry, get_labels=lambda: self.entry_names)
+        self._contents = ContentsWindow(self.contents)
+
+    def get_path_entry(self, index):
+        name = self.entry_names[index]
+        full_path = os.path.join(self.path, name)
+        if index < self.dir_count:
+            return [name, lambda: self.goto_dir(full_path)]
+        return [name, lambda: self.select_path(full_path)]
 
     @to_be_foreground
     def options_menu(self):
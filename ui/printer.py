@@ -26,13 +26,11 @@ def Printer(message, i, o, sleep_time=1, skippable=False):
 
     #If skippable option is enabled, etting input callbacks on keys we use for skipping screens
     if i is not None: #Can be on boot or whenever
-        i.stop_listen()
-        i.clear_keymap()
+        keymap = {"KEY_LEFT":exit_printer}
         if skippable:
-            i.set_callback("KEY_KPENTER", skip_screen)
-            i.set_callback("KEY_ENTER", skip_screen)
-        i.set_callback("KEY_LEFT", exit_printer)
-        i.listen()
+            keymap["KEY_KPENTER"] = skip_screen
+            keymap["KEY_ENTER"] = skip_screen
+        i.set_keymap(keymap)
 
     #Now onto rendering the message
     rendered_message = []
@@ -114,15 +114,12 @@ class Refresher():
         return keymap
 
     def set_keymap(self, keymap):
-        """Generate and sets the input device's keycode-to-callback mapping. Re-starts the input device because of passing-variables-between-threads issues."""
+        """Generate and sets the input device's keycode-to-callback mapping. The keymap is replaced at once, without restarting the input listener."""
         self.keymap = self.process_keymap(keymap)
 
     @to_be_foreground
     def activate_keymap(self):
-        self.i.stop_listen()
-        self.i.clear_keymap()
-        self.i.keymap = self.keymap
-        self.i.listen()
+        self.i.set_keymap(self.keymap)
 
     @to_be_foreground
     def refresh(self):